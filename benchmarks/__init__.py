@@ -0,0 +1 @@
+"""MAGI Gemini Orchestrator ベンチマーク"""
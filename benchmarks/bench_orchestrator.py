@@ -0,0 +1,244 @@
+"""オーケストレーターのベンチマーク
+
+FakeBackend を使ってネットワークなしで以下を計測する。
+
+    - phase_latency: フェーズごとのレイテンシ（p50/p95/p99）
+    - throughput: 同時実行数ごとの合議スループット（consults/sec）
+    - debate_context: 大きな出力に対する議論コンテキストの構築コスト
+      （毎ラウンドの全文再構築とトランスクリプトへの追記の比較）
+    - memory: 実行中の合議1件あたりのメモリ使用量
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from magi.models import DebateOutput, DebateRound, ThinkingOutput
+
+from magi_orchestrator.agents import ALL_AGENTS
+from magi_orchestrator.client import GeminiNativeClient
+from magi_orchestrator.fake import FakeBackend, LogNormalLatency
+from magi_orchestrator.orchestrator import MagiOrchestrator
+from magi_orchestrator.transcript import DebateTranscript
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """サンプルの p50/p95/p99・平均・最大を算出（ミリ秒）"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+class _TimedOrchestrator(MagiOrchestrator):
+    """フェーズごとの所要時間を記録するオーケストレーター"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.timings: Dict[str, List[float]] = {
+            "thinking": [],
+            "debate_round": [],
+            "voting": [],
+        }
+
+    async def _timed(self, name: str, coro: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.timings[name].append(time.perf_counter() - started)
+
+    async def _run_thinking_phase(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._timed(
+            "thinking", super()._run_thinking_phase(*args, **kwargs)
+        )
+
+    async def _run_debate_round(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._timed(
+            "debate_round", super()._run_debate_round(*args, **kwargs)
+        )
+
+    async def _run_voting_phase(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._timed("voting", super()._run_voting_phase(*args, **kwargs))
+
+
+def _make_client(median: float, sigma: float, seed: int) -> GeminiNativeClient:
+    backend = FakeBackend(
+        latency=LogNormalLatency(median=median, sigma=sigma), seed=seed
+    )
+    return GeminiNativeClient(api_key="fake", backend=backend)
+
+
+async def bench_phase_latency(
+    consults: int = 50,
+    median: float = 0.02,
+    sigma: float = 0.5,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """フェーズごとのレイテンシ分布を計測"""
+    orchestrator = _TimedOrchestrator(_make_client(median, sigma, seed))
+    totals: List[float] = []
+    for i in range(consults):
+        started = time.perf_counter()
+        await orchestrator.consult(f"phase latency query {i}")
+        totals.append(time.perf_counter() - started)
+
+    return {
+        "backend_median_ms": median * 1000,
+        "phases": {
+            name: percentiles(samples) for name, samples in orchestrator.timings.items()
+        },
+        "consult": percentiles(totals),
+    }
+
+
+async def bench_throughput(
+    concurrency_levels: Sequence[int] = (1, 4, 16, 64),
+    consults_per_level: int = 64,
+    median: float = 0.02,
+    sigma: float = 0.5,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """同時実行数ごとのスループットを計測"""
+    levels = {}
+    for concurrency in concurrency_levels:
+        orchestrator = MagiOrchestrator(_make_client(median, sigma, seed))
+        queries = [f"throughput query {i}" for i in range(consults_per_level)]
+        run = orchestrator.consult_many(queries, max_concurrency=concurrency)
+        async for _ in run:
+            pass
+        levels[str(concurrency)] = {
+            **run.stats.to_dict(),
+            "latency": percentiles(run.stats.latencies),
+        }
+    return {"backend_median_ms": median * 1000, "levels": levels}
+
+
+def bench_debate_context(
+    output_chars: Sequence[int] = (1_000, 16_000, 64_000),
+    rounds: int = 3,
+    iterations: int = 50,
+) -> Dict[str, Any]:
+    """大きな出力に対する議論コンテキスト構築のコストを計測"""
+    orchestrator = MagiOrchestrator(client=None)  # type: ignore[arg-type]
+    now = datetime.now()
+    sizes = {}
+    for chars in output_chars:
+        text = "議" * chars
+        thinking = {
+            agent.persona_type: ThinkingOutput(
+                persona_type=agent.persona_type, content=text, timestamp=now
+            )
+            for agent in ALL_AGENTS
+        }
+        debate = [
+            DebateRound(
+                round_number=n,
+                outputs={
+                    agent.persona_type: DebateOutput(
+                        persona_type=agent.persona_type,
+                        round_number=n,
+                        responses={
+                            other.persona_type: text
+                            for other in ALL_AGENTS
+                            if other is not agent
+                        },
+                        timestamp=now,
+                    )
+                    for agent in ALL_AGENTS
+                },
+                timestamp=now,
+            )
+            for n in range(1, rounds + 1)
+        ]
+
+        # 1回の合議で必要な全ラウンド分（議論の各ラウンド + 投票）のコンテキスト構築
+        samples = []
+        incremental = []
+        context = ""
+        for _ in range(iterations):
+            started = time.perf_counter()
+            for n in range(rounds + 1):
+                context = orchestrator._build_debate_context(thinking, debate[:n])
+            samples.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            transcript = DebateTranscript()
+            transcript.set_thinking(thinking)
+            transcript.render()
+            for round_data in debate:
+                transcript.add_round(round_data)
+                transcript.render()
+            incremental.append(time.perf_counter() - started)
+        sizes[str(chars)] = {
+            **percentiles(samples),
+            "incremental": percentiles(incremental),
+            "context_chars": len(context),
+        }
+    return {"rounds": rounds, "sizes": sizes}
+
+
+async def bench_memory(
+    in_flight: int = 32,
+    median: float = 0.05,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """実行中の合議1件あたりのメモリ使用量を計測"""
+    orchestrator = MagiOrchestrator(_make_client(median, 0.0, seed))
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tasks = [
+            asyncio.create_task(orchestrator.consult(f"memory query {i}"))
+            for i in range(in_flight)
+        ]
+        # Thinking Phase の途中（全合議が実行中）でスナップショットを取る
+        await asyncio.sleep(median / 2)
+        during, _ = tracemalloc.get_traced_memory()
+        await asyncio.gather(*tasks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "in_flight": in_flight,
+        "bytes_per_consult_in_flight": (during - baseline) / in_flight,
+        "peak_bytes_per_consult": (peak - baseline) / in_flight,
+    }
+
+
+def bench_import_time(runs: int = 5) -> Dict[str, Any]:
+    """CLI のコールドスタート時間を計測（毎回新しいインタプリタを起動）"""
+    commands = {
+        "python_startup": [sys.executable, "-c", "pass"],
+        "import_cli": [sys.executable, "-c", "import magi_orchestrator.cli"],
+        "cli_help": [sys.executable, "-m", "magi_orchestrator.cli", "--help"],
+    }
+    results: Dict[str, Any] = {}
+    for name, command in commands.items():
+        samples: List[float] = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            samples.append(time.perf_counter() - start)
+        results[name] = percentiles(samples)
+    return results
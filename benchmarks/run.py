@@ -0,0 +1,144 @@
+"""ベンチマークの実行エントリーポイント
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --only throughput
+    python -m benchmarks.run --compare baseline.json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks import bench_orchestrator as bench
+
+BENCHMARKS = (
+    "phase_latency",
+    "throughput",
+    "debate_context",
+    "memory",
+    "import_time",
+)
+
+
+async def run_benchmarks(names: List[str], quick: bool) -> Dict[str, Any]:
+    """指定したベンチマークを実行して結果を返す"""
+    results: Dict[str, Any] = {}
+    if "phase_latency" in names:
+        results["phase_latency"] = await bench.bench_phase_latency(
+            consults=10 if quick else 50
+        )
+    if "throughput" in names:
+        results["throughput"] = await bench.bench_throughput(
+            concurrency_levels=(1, 8) if quick else (1, 4, 16, 64),
+            consults_per_level=16 if quick else 64,
+        )
+    if "debate_context" in names:
+        results["debate_context"] = bench.bench_debate_context(
+            output_chars=(1_000, 16_000) if quick else (1_000, 16_000, 64_000),
+            iterations=10 if quick else 50,
+        )
+    if "memory" in names:
+        results["memory"] = await bench.bench_memory(in_flight=8 if quick else 32)
+    if "import_time" in names:
+        results["import_time"] = bench.bench_import_time(runs=3 if quick else 10)
+    return results
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    """ネストした結果を "a.b.c" -> 数値 の dict に平坦化"""
+    flat: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix.rstrip(".")] = float(data)
+    return flat
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """2つの結果ファイルを比較し、閾値を超えた悪化を報告する
+
+    名前が _ms / _bytes / bytes_ で終わる（始まる）指標は小さいほど良く、
+    throughput を含む指標は大きいほど良いものとして扱う。
+
+    Returns:
+        悪化があれば 1、なければ 0
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = _flatten(json.load(f)["results"])
+    with open(current_path, encoding="utf-8") as f:
+        current = _flatten(json.load(f)["results"])
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        if before == 0:
+            continue
+        change = (after - before) / before
+        if "throughput" in key:
+            worse = change < -threshold
+        elif key.endswith("_ms") or "bytes" in key:
+            worse = change > threshold
+        else:
+            continue
+        marker = "REGRESSION" if worse else "ok"
+        regressions += worse
+        print(f"{marker:>10}  {key}: {before:.3f} -> {after:.3f} ({change:+.1%})")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MAGI Gemini Orchestrator benchmarks")
+    parser.add_argument("--output", "-o", help="結果を書き出す JSON ファイル")
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=BENCHMARKS,
+        help="実行するベンチマーク（複数指定可、省略時は全て）",
+    )
+    parser.add_argument("--quick", action="store_true", help="小さな設定で素早く実行")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="2つの結果ファイルを比較する",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="悪化とみなす変化率（--compare 用、既定 0.10）",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, threshold=args.threshold))
+
+    from magi_orchestrator import __version__
+
+    names = args.only or list(BENCHMARKS)
+    report = {
+        "version": __version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": asyncio.run(run_benchmarks(names, args.quick)),
+    }
+    encoded = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main()
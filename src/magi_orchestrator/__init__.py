@@ -2,12 +2,21 @@
 
 google-genai SDK ネイティブの MAGI システム実装。
 3賢者（MELCHIOR, BALTHASAR, CASPER）による合議プロセスを提供する。
+
+公開クラスは最初の参照時に読み込む（google.genai・pydantic の読み込みを
+必要になるまで遅らせ、CLI の起動を速くするため）。
 """
 
-from magi_orchestrator.config import OrchestratorSettings
-from magi_orchestrator.client import GeminiNativeClient
-from magi_orchestrator.orchestrator import MagiOrchestrator
-from magi_orchestrator.cache import CacheManager
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from magi_orchestrator.cache import CacheManager
+    from magi_orchestrator.client import GeminiNativeClient
+    from magi_orchestrator.config import OrchestratorSettings
+    from magi_orchestrator.orchestrator import MagiOrchestrator
 
 __version__ = "0.1.0"
 __all__ = [
@@ -17,6 +26,28 @@ __all__ = [
     "CacheManager",
 ]
 
+# 公開名 -> 定義しているモジュール
+_LAZY_EXPORTS: Dict[str, str] = {
+    "OrchestratorSettings": "magi_orchestrator.config",
+    "GeminiNativeClient": "magi_orchestrator.client",
+    "MagiOrchestrator": "magi_orchestrator.orchestrator",
+    "CacheManager": "magi_orchestrator.cache",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # 2回目以降は通常の属性として参照される
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 def main() -> None:
     """CLI エントリーポイント（将来実装予定）"""
@@ -3,11 +3,14 @@
 AgentConfig: エージェントの設定を保持するデータクラス。
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
 from magi.models import PersonaType
 
+from magi_orchestrator.generation import GenerationProfile
+from magi_orchestrator.phases import Phase
+
 
 @dataclass
 class AgentConfig:
@@ -19,6 +22,8 @@ class AgentConfig:
         temperature: 温度パラメータ（0.0〜1.0）
         system_instruction: システム命令（ペルソナ定義）
         cached_content: コンテキストキャッシュ名（オプション）
+        generation: フェーズ -> 生成プロファイル（オーケストレーターの
+            フェーズ別プロファイルより優先される）
     """
 
     persona_type: PersonaType
@@ -26,6 +31,7 @@ class AgentConfig:
     temperature: float
     system_instruction: str
     cached_content: Optional[str] = None
+    generation: Dict[Phase, GenerationProfile] = field(default_factory=dict)
 
     @property
     def name(self) -> str:
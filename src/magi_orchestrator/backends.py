@@ -0,0 +1,87 @@
+"""生成バックエンド
+
+GeminiNativeClient が API 呼び出しに使うバックエンドのインターフェースを定義する。
+リトライ・アドミッション制御・メモ化はクライアント側で行い、
+バックエンドは1リクエストの送信のみを担当する。
+
+    GenerationBackend: バックエンドの基底クラス
+    GenaiBackend: google-genai SDK の非同期クライアントを使う既定のバックエンド
+    magi_orchestrator.fake.FakeBackend: ネットワーク不要の負荷試験用バックエンド
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from google.genai import types
+
+
+class GenerationBackend:
+    """生成バックエンドの基底クラス
+
+    レスポンスは google.genai.types.GenerateContentResponse 互換
+    （text と usage_metadata 属性を持つ）のオブジェクトを返す。
+    """
+
+    async def generate_content(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        """コンテンツを生成"""
+        raise NotImplementedError
+
+    async def generate_content_stream(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        """コンテンツをストリーミング生成（チャンクごとにレスポンスを返す）"""
+        raise NotImplementedError
+        yield  # pragma: no cover - async generator として扱わせるため
+
+    async def aclose(self) -> None:
+        """リソースをクリーンアップ"""
+
+
+class GenaiBackend(GenerationBackend):
+    """google-genai SDK の非同期クライアントを使うバックエンド"""
+
+    def __init__(self, aio_client: Any) -> None:
+        """バックエンドを初期化
+
+        Args:
+            aio_client: google.genai.Client の aio 属性（AsyncClient）
+        """
+        self._aio_client = aio_client
+
+    async def generate_content(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        return await self._aio_client.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+
+    async def generate_content_stream(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        stream = await self._aio_client.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+        async for chunk in stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._aio_client.aclose()
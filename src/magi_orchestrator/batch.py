@@ -0,0 +1,316 @@
+"""バッチ合議
+
+多数の質問を1つのオーケストレーター（= 共有クライアントとアドミッション制御）で
+並行処理する。同時に進行する合議の数を制限しつつ、ある質問の Voting Phase と
+別の質問の Thinking Phase が重なるようにフェーズをパイプライン化し、
+完了した順に結果を返す。
+
+run_jsonl は JSONL の質問ファイルを処理し、完了した順に結果を JSONL に追記する
+（出力済みの ID は再実行時にスキップする）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from magi.models import ConsensusResult
+
+from magi_orchestrator.serialization import consensus_result_to_dict
+
+if TYPE_CHECKING:
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+
+
+@dataclass
+class BatchItem:
+    """バッチ内の1件の合議結果
+
+    Attributes:
+        index: 入力順のインデックス
+        query: 質問/議題
+        result: 合議結果（失敗した場合は None）
+        error: 発生した例外（成功した場合は None）
+        elapsed: 合議に要した時間（秒）
+    """
+
+    index: int
+    query: str
+    result: Optional[ConsensusResult] = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """合議が成功したか"""
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    """バッチ全体の集計
+
+    Attributes:
+        completed: 成功した合議数
+        failed: 失敗した合議数
+        started_at: 開始時刻（time.monotonic）
+        finished_at: 終了時刻（time.monotonic、実行中は None）
+        latencies: 各合議の所要時間（秒）
+    """
+
+    completed: int = 0
+    failed: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """処理済みの合議数"""
+        return self.completed + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """経過時間（秒）"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """スループット（合議数/秒）"""
+        elapsed = self.elapsed
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """平均所要時間（秒）"""
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def to_dict(self) -> dict:
+        """JSON 互換の dict に変換"""
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_seconds": self.elapsed,
+            "throughput_per_second": self.throughput,
+            "mean_latency_seconds": self.mean_latency,
+        }
+
+
+class BatchRun:
+    """バッチ合議の実行
+
+    async for で完了順に BatchItem を受け取り、stats で集計を参照する。
+    反復を途中で打ち切ると、実行中の合議はキャンセルされる。
+
+    Example:
+        >>> run = orchestrator.consult_many(queries, max_concurrency=8)
+        >>> async for item in run:
+        ...     print(item.index, item.result.final_decision if item.ok else item.error)
+        >>> print(run.stats.throughput)
+    """
+
+    def __init__(
+        self,
+        orchestrator: "MagiOrchestrator",
+        queries: Iterable[str],
+        max_concurrency: int = 4,
+    ) -> None:
+        """バッチ合議を初期化
+
+        Args:
+            orchestrator: 合議を実行するオーケストレーター
+            queries: 質問/議題の列（遅延評価される）
+            max_concurrency: 同時に進行する合議数の上限
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._orchestrator = orchestrator
+        self._queries = queries
+        self._max_concurrency = max_concurrency
+        self.stats = BatchStats()
+
+    def __aiter__(self) -> AsyncIterator[BatchItem]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[BatchItem]:
+        pending: Iterator[Tuple[int, str]] = iter(enumerate(self._queries))
+        results: asyncio.Queue[Optional[BatchItem]] = asyncio.Queue()
+        self.stats.started_at = time.monotonic()
+
+        async def worker() -> None:
+            try:
+                for index, query in pending:
+                    started = time.monotonic()
+                    item = BatchItem(index=index, query=query)
+                    try:
+                        item.result = await self._orchestrator.consult(query)
+                    except Exception as e:
+                        item.error = e
+                    item.elapsed = time.monotonic() - started
+                    await results.put(item)
+            finally:
+                # None は1ワーカーの終了を表す
+                await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self._max_concurrency)]
+        remaining = len(workers)
+        try:
+            while remaining:
+                item = await results.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                if item.ok:
+                    self.stats.completed += 1
+                else:
+                    self.stats.failed += 1
+                self.stats.latencies.append(item.elapsed)
+                yield item
+        finally:
+            self.stats.finished_at = time.monotonic()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+def read_queries(path: Union[str, os.PathLike]) -> Iterator[Tuple[str, str]]:
+    """JSONL の質問ファイルを (ID, 質問) の列として読み込む
+
+    各行は {"id": ..., "query": ...} のオブジェクト（id は省略可）または
+    質問の文字列。id を省略した場合は行番号（1 始まり）を ID とする。空行は無視する。
+
+    Raises:
+        ValueError: 行が JSON として不正、または質問がない場合
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data: Any = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from None
+            if isinstance(data, str):
+                data = {"query": data}
+            query = data.get("query") if isinstance(data, dict) else None
+            if not isinstance(query, str):
+                raise ValueError(f'{path}:{line_number}: "query" is required')
+            yield str(data.get("id", line_number)), query
+
+
+def completed_ids(path: Union[str, os.PathLike]) -> Set[str]:
+    """結果ファイルのうち成功した合議の ID（ファイルがない場合は空）
+
+    中断時に書きかけだった末尾の行（改行で終わらない行）は、JSON として
+    完結していても無視する（run_jsonl が切り詰めて再実行するため）。
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "result" in record:
+                done.add(str(record.get("id")))
+    return done
+
+
+def _truncate_partial_line(path: Union[str, os.PathLike]) -> None:
+    """中断時に書きかけだった末尾の行（改行で終わらない部分）を切り詰める
+
+    追記する行が書きかけの行に連結されて不正な JSON にならないようにする。
+    書きかけの行の ID は completed_ids に含まれないため再実行される。
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+async def run_jsonl(
+    orchestrator: "MagiOrchestrator",
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    max_concurrency: int = 4,
+) -> BatchStats:
+    """JSONL の質問を並行して合議し、完了順に結果を JSONL に追記
+
+    出力の各行は {"id", "query", "elapsed_seconds"} に、成功時は "result"
+    （ConsensusResult の dict）、失敗時は "error" を加えたもの。
+    出力ファイルに成功した結果がある ID はスキップするため、中断後に同じ
+    コマンドを再実行すると残りの質問だけを処理する（失敗した質問は再実行する）。
+
+    Args:
+        orchestrator: 全ての合議で共有するオーケストレーター
+        input_path: 質問の JSONL ファイル（read_queries の形式）
+        output_path: 結果を追記する JSONL ファイル
+        max_concurrency: 同時に進行する合議数の上限
+
+    Returns:
+        今回の実行分の BatchStats
+
+    Raises:
+        ValueError: 質問ファイルに不正な行がある場合（合議の開始前に送出）
+    """
+    _truncate_partial_line(output_path)
+    done = completed_ids(output_path)
+    # 不正な行は合議を始める前にエラーにするため、先に全て読み込む
+    pending = [
+        (query_id, query)
+        for query_id, query in read_queries(input_path)
+        if query_id not in done
+    ]
+    ids = [query_id for query_id, _ in pending]
+
+    run = BatchRun(
+        orchestrator, [query for _, query in pending], max_concurrency=max_concurrency
+    )
+    with open(output_path, "a", encoding="utf-8") as out:
+        async for item in run:
+            record: Dict[str, Any] = {
+                "id": ids[item.index],
+                "query": item.query,
+                "elapsed_seconds": item.elapsed,
+            }
+            if item.result is not None:
+                record["result"] = consensus_result_to_dict(item.result)
+            else:
+                record["error"] = f"{type(item.error).__name__}: {item.error}"
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    return run.stats
@@ -3,46 +3,176 @@
 コンテキストキャッシュを管理する。
 ペルソナ定義（システム命令）をキャッシュして、
 推論コストとレイテンシを削減する。
+
+キャッシュごとに有効期限を追跡し、期限切れ前の TTL 延長
+（バックグラウンドの自動更新）と、サーバー側で失効したキャッシュの
+再作成を行う。
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import hashlib
 import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
+from magi_orchestrator.cache_registry import CacheRegistry, RegisteredCache
+from magi_orchestrator.rate_limit import estimate_tokens
+
+if TYPE_CHECKING:
+    from magi_orchestrator.agents.base import AgentConfig
+
 logger = logging.getLogger(__name__)
 
 
+def is_cache_not_found_error(error: BaseException) -> bool:
+    """キャッシュが存在しない（失効・削除済み）ことを示すエラーか判定
+
+    Gemini API は失効したキャッシュの参照に 404、または
+    "CachedContent not found" を含む 400/403 を返す。
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        キャッシュが存在しないことを示すエラーの場合 True
+    """
+    if not isinstance(error, genai_errors.APIError):
+        return False
+    if error.code == 404:
+        return True
+    message = str(error).lower()
+    return error.code in (400, 403) and "cachedcontent not found" in message
+
+
+@dataclass
+class CacheEntry:
+    """管理下のキャッシュ
+
+    Attributes:
+        name: キャッシュ名（例: "caches/12345"）
+        persona_name: ペルソナ名
+        model: モデル名
+        system_instruction: キャッシュしたシステム命令（再作成に使う）
+        ttl_seconds: 作成・延長時に設定する TTL（秒）
+        expires_at: 有効期限（UNIX 時刻）
+    """
+
+    name: str
+    persona_name: str
+    model: str
+    system_instruction: str
+    ttl_seconds: int
+    expires_at: float
+
+
+@dataclass
+class WarmupReport:
+    """キャッシュ事前作成の結果
+
+    Attributes:
+        created: (ペルソナ名, モデル名) -> キャッシュ名
+        failed: (ペルソナ名, モデル名) -> エラー内容
+    """
+
+    created: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    failed: Dict[Tuple[str, str], str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """全キャッシュの作成に成功したか"""
+        return not self.failed
+
+
+# (ペルソナ名, モデル名)
+_CacheKey = Tuple[str, str]
+
+
 class CacheManager:
     """ペルソナ定義のコンテキストキャッシュを管理
 
     Gemini API のコンテキストキャッシュ機能を使用して、
     長大なシステム命令をキャッシュし、APIコストを削減する。
+    キャッシュはモデルごとに作成されるため、(ペルソナ名, モデル名) 単位で管理する。
+
+    registry を指定すると、複数のワーカーでキャッシュを共有する。
+    他のワーカーが登録したキャッシュを再利用し、非同期の作成
+    （create_persona_cache_async / warmup / 再作成）はレジストリのロックで
+    1ワーカーだけが行う。使用中のキャッシュにはリースを登録し、
+    clear_cache は他のワーカーのリースが残っていない場合だけキャッシュを削除する。
+    非同期のメソッドはレジストリ（ファイル・SQLite・Redis の I/O）を
+    スレッドで呼び出し、イベントループをブロックしない。
 
     Example:
         >>> from google import genai
         >>> client = genai.Client(api_key="your-api-key")
         >>> cache_manager = CacheManager(client)
-        >>> cache_name = await cache_manager.create_persona_cache(
-        ...     persona_name="melchior",
-        ...     model="gemini-1.5-flash",
-        ...     system_instruction="You are MELCHIOR-1...",
-        ... )
-        >>> print(cache_name)
-        caches/12345
+        >>> report = await cache_manager.warmup()
+        >>> print(report.created)
+        {('melchior', 'gemini-3-flash-preview'): 'caches/12345', ...}
     """
 
-    def __init__(self, client: genai.Client) -> None:
+    def __init__(
+        self,
+        client: genai.Client,
+        refresh_margin_seconds: float = 300,
+        clock: Callable[[], float] = time.time,
+        registry: Optional[CacheRegistry] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 900,
+        creation_timeout: float = 60,
+        poll_interval: float = 0.5,
+    ) -> None:
         """CacheManager を初期化
 
         Args:
             client: google.genai.Client インスタンス
+            refresh_margin_seconds: 残り有効期間がこの秒数を下回ったキャッシュを
+                refresh_expiring / 自動更新で延長する
+            clock: 現在時刻（UNIX 時刻）を返す関数（テスト用）
+            registry: ワーカー間でキャッシュを共有するレジストリ（オプション）
+            worker_id: レジストリ上のワーカー ID（省略時はホスト名・PID から生成）
+            lease_seconds: キャッシュのリースの有効期間（秒）。自動更新のたびに延長する
+            creation_timeout: 他のワーカーの作成完了を待つ上限（秒）。
+                作成ロックの有効期間も兼ねる
+            poll_interval: 他のワーカーの作成完了を確認する間隔（秒）
         """
         self._client = client
-        self._caches: Dict[str, str] = {}  # persona_name -> cache_name
+        self._refresh_margin = refresh_margin_seconds
+        self._clock = clock
+        self._registry = registry
+        self._worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._lease_seconds = lease_seconds
+        self._creation_timeout = creation_timeout
+        self._poll_interval = poll_interval
+        self._entries: Dict[_CacheKey, CacheEntry] = {}
+        # 過去に作成したものを含むキャッシュ名 -> キー（再作成済みの判定に使う）
+        self._keys: Dict[str, _CacheKey] = {}
+        self._locks: Dict[_CacheKey, asyncio.Lock] = {}
+        self._refresh_task: Optional[asyncio.Task[None]] = None
 
     def create_persona_cache(
         self,
@@ -62,57 +192,171 @@ class CacheManager:
         Returns:
             キャッシュ名（例: "caches/12345"）
         """
+        if self._registry is not None:
+            registered = self._registry.get(
+                self._registry_key(persona_name, model, system_instruction)
+            )
+            if registered is not None:
+                return self._adopt(
+                    persona_name, model, system_instruction, ttl_seconds, registered
+                )
+
         cache = self._client.caches.create(
             model=model,
-            config=types.CreateCachedContentConfig(
-                system_instruction=system_instruction,
-                display_name=f"magi-{persona_name}",
-                ttl=f"{ttl_seconds}s",
-            ),
+            config=self._create_config(persona_name, system_instruction, ttl_seconds),
         )
-        cache_name = cache.name
-        self._caches[persona_name] = cache_name
-        return cache_name
+        name = self._track(persona_name, cache, model, system_instruction, ttl_seconds)
+        self._publish(self._entries[(persona_name, model)])
+        return name
+
+    async def create_persona_cache_async(
+        self,
+        persona_name: str,
+        model: str,
+        system_instruction: str,
+        ttl_seconds: int = 3600,
+    ) -> str:
+        """ペルソナのシステム命令を非同期にキャッシュ
 
-    def get_cache_name(self, persona_name: str) -> Optional[str]:
+        引数と戻り値は create_persona_cache と同じ。レジストリがある場合は
+        登録済みのキャッシュを再利用し、なければ作成ロックを取得したワーカーだけが
+        作成する（他のワーカーは作成完了を待って再利用する）。
+        """
+        if self._registry is None:
+            return await self._create_async(
+                persona_name, model, system_instruction, ttl_seconds
+            )
+
+        registry = self._registry
+        key = self._registry_key(persona_name, model, system_instruction)
+        deadline = time.monotonic() + self._creation_timeout
+        while True:
+            registered = await asyncio.to_thread(registry.get, key)
+            if registered is not None:
+                return await self._adopt_async(
+                    persona_name, model, system_instruction, ttl_seconds, registered
+                )
+            if await asyncio.to_thread(
+                registry.acquire_lock, key, self._worker_id, self._creation_timeout
+            ):
+                try:
+                    # ロック取得までの間に他のワーカーが登録した場合は再利用
+                    registered = await asyncio.to_thread(registry.get, key)
+                    if registered is not None:
+                        return await self._adopt_async(
+                            persona_name,
+                            model,
+                            system_instruction,
+                            ttl_seconds,
+                            registered,
+                        )
+                    return await self._create_async(
+                        persona_name, model, system_instruction, ttl_seconds
+                    )
+                finally:
+                    await asyncio.to_thread(registry.release_lock, key, self._worker_id)
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "Timed out waiting for cache creation of %s (%s), creating locally",
+                    persona_name,
+                    model,
+                )
+                return await self._create_async(
+                    persona_name, model, system_instruction, ttl_seconds
+                )
+            await asyncio.sleep(self._poll_interval)
+
+    def get_cache_name(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[str]:
         """キャッシュ名を取得
 
+        有効期限を過ぎたキャッシュは参照するとエラーになるため返さない。
+
+        Args:
+            persona_name: ペルソナ名
+            model: モデル名（省略時はペルソナの最後に作成したキャッシュ）
+
+        Returns:
+            キャッシュ名（存在しない・期限切れの場合は None）
+        """
+        entry = self._find(persona_name, model)
+        if entry is None or entry.expires_at <= self._clock():
+            return None
+        return entry.name
+
+    def remaining_lifetime(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[float]:
+        """キャッシュの残り有効期間を取得
+
         Args:
             persona_name: ペルソナ名
+            model: モデル名（省略時はペルソナの最後に作成したキャッシュ）
 
         Returns:
-            キャッシュ名（存在しない場合は None）
+            残り有効期間（秒、期限切れは 0 以下）。管理下にない場合は None
         """
-        return self._caches.get(persona_name)
+        entry = self._find(persona_name, model)
+        if entry is None:
+            return None
+        return entry.expires_at - self._clock()
 
     def list_caches(self) -> Dict[str, str]:
         """全キャッシュを取得
 
         Returns:
             ペルソナ名 -> キャッシュ名 のマッピング
+            （複数モデルのキャッシュがあるペルソナは最後に作成したもの）
+        """
+        return {persona: entry.name for (persona, _), entry in self._entries.items()}
+
+    def list_entries(self) -> List[CacheEntry]:
+        """管理下の全キャッシュを取得
+
+        Returns:
+            CacheEntry のリスト
         """
-        return dict(self._caches)
+        return list(self._entries.values())
 
-    def clear_cache(self, persona_name: str) -> bool:
+    def clear_cache(self, persona_name: str, model: Optional[str] = None) -> bool:
         """キャッシュを削除
 
         Args:
             persona_name: ペルソナ名
+            model: モデル名（省略時はペルソナの全モデルのキャッシュ）
 
         Returns:
             削除に成功した場合 True
         """
-        if persona_name in self._caches:
-            cache_name = self._caches.pop(persona_name)
+        keys = [
+            key
+            for key in self._entries
+            if key[0] == persona_name and (model is None or key[1] == model)
+        ]
+        if not keys:
+            return False
+        success = True
+        for key in keys:
+            entry = self._entries.pop(key)
+            cache_name = entry.name
+            self._keys = {name: k for name, k in self._keys.items() if k != key}
+            if self._registry is not None:
+                registry_key = self._registry_key(
+                    entry.persona_name, entry.model, entry.system_instruction
+                )
+                if self._registry.release_lease(registry_key, self._worker_id):
+                    # 他のワーカーが使用中のため削除しない
+                    continue
+                self._registry.remove(registry_key, cache_name)
             try:
                 self._client.caches.delete(name=cache_name)
-                return True
             except Exception as e:
                 logger.error(
                     f"Failed to delete cache for {persona_name} ({cache_name}): {e}"
                 )
-                return False
-        return False
+                success = False
+        return success
 
     def warmup_all_personas(
         self,
@@ -121,6 +365,8 @@ class CacheManager:
     ) -> Dict[str, str]:
         """全ペルソナのキャッシュを事前作成
 
+        1ペルソナずつ同期的に作成する。イベントループ内では warmup を使う。
+
         Args:
             model: 使用するモデル名
             ttl_seconds: キャッシュの有効期限（秒）
@@ -138,7 +384,446 @@ class CacheManager:
                 ttl_seconds=ttl_seconds,
             )
 
-        return dict(self._caches)
+        return self.list_caches()
+
+    async def warmup(
+        self,
+        agents: Optional[Iterable[AgentConfig]] = None,
+        ttl_seconds: int = 3600,
+    ) -> WarmupReport:
+        """エージェントが使う全 (ペルソナ, モデル) のキャッシュを並列に事前作成
+
+        一部の作成に失敗しても残りは作成し、失敗は WarmupReport.failed に記録する。
+        キャッシュのないエージェントは通常どおりシステム命令を送信して動作する。
+
+        Args:
+            agents: エージェント設定のリスト（デフォルトは3賢者）
+            ttl_seconds: キャッシュの有効期限（秒）
+
+        Returns:
+            WarmupReport
+        """
+        if agents is None:
+            from magi_orchestrator.agents import ALL_AGENTS
+
+            agents = ALL_AGENTS
+
+        targets: Dict[_CacheKey, str] = {}
+        for agent in agents:
+            targets.setdefault(
+                (agent.persona_type.value, agent.model), agent.system_instruction
+            )
+
+        results = await asyncio.gather(
+            *(
+                self.create_persona_cache_async(
+                    persona, model, system_instruction, ttl_seconds
+                )
+                for (persona, model), system_instruction in targets.items()
+            ),
+            return_exceptions=True,
+        )
+
+        report = WarmupReport()
+        for key, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Failed to create cache for {key[0]} ({key[1]}): {result}"
+                )
+                report.failed[key] = f"{type(result).__name__}: {result}"
+            else:
+                report.created[key] = result
+        return report
+
+    async def refresh(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[str]:
+        """キャッシュの TTL を延長
+
+        サーバー側で既に失効していた場合は同じ内容で再作成する。
+
+        Args:
+            persona_name: ペルソナ名
+            model: モデル名（省略時はペルソナの最後に作成したキャッシュ）
+
+        Returns:
+            キャッシュ名（管理下にない場合・延長と再作成に失敗した場合は None）
+        """
+        entry = self._find(persona_name, model)
+        if entry is None:
+            return None
+        return await self._refresh_entry(entry)
+
+    async def refresh_expiring(self) -> Dict[str, str]:
+        """残り有効期間が refresh_margin_seconds を下回るキャッシュを延長
+
+        Returns:
+            延長（または再作成）した元のキャッシュ名 -> 現在のキャッシュ名
+        """
+        now = self._clock()
+        entries = [
+            entry
+            for entry in list(self._entries.values())
+            if entry.expires_at - now < self._refresh_margin
+        ]
+        names = await asyncio.gather(*(self._refresh_entry(e) for e in entries))
+        if self._registry is not None:
+            keys = [
+                self._registry_key(
+                    entry.persona_name, entry.model, entry.system_instruction
+                )
+                for entry in self._entries.values()
+            ]
+            await asyncio.to_thread(self._add_leases, keys)
+        return {
+            entry.name: name for entry, name in zip(entries, names) if name is not None
+        }
+
+    async def recover(self, cache_name: str) -> Optional[str]:
+        """参照に失敗したキャッシュを再作成
+
+        GeminiNativeClient.set_cache_recovery に渡すと、キャッシュが
+        見つからないエラーの発生時に呼び出される。同じキャッシュの
+        回復が並行して要求された場合、再作成は1回だけ行う。
+
+        Args:
+            cache_name: 参照に失敗したキャッシュ名
+
+        Returns:
+            新しいキャッシュ名（管理下にない・再作成に失敗した場合は None）
+        """
+        key = self._keys.get(cache_name)
+        if key is None:
+            return None
+
+        async with self._lock(key):
+            current = self._entries.get(key)
+            if current is None:
+                return None
+            if current.name != cache_name:
+                # 他のリクエストが再作成済み
+                return current.name
+            return await self._recreate(current)
+
+    def start_auto_refresh(self, interval_seconds: float = 60) -> None:
+        """期限切れ前の自動更新をバックグラウンドで開始
+
+        interval_seconds ごとに refresh_expiring を実行する。
+        実行中のイベントループ内で呼び出す必要がある。
+
+        Args:
+            interval_seconds: 確認間隔（秒）
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_loop(interval_seconds)
+        )
+
+    async def stop_auto_refresh(self) -> None:
+        """自動更新を停止"""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _refresh_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                refreshed = await self.refresh_expiring()
+                if refreshed:
+                    logger.debug("Refreshed caches: %s", sorted(refreshed))
+            except Exception:
+                logger.exception("Cache auto-refresh failed")
+            await asyncio.sleep(interval_seconds)
+
+    async def _refresh_entry(self, entry: CacheEntry) -> Optional[str]:
+        """キャッシュの TTL を延長（失効済みの場合は再作成）"""
+        key = (entry.persona_name, entry.model)
+        async with self._lock(key):
+            if self._entries.get(key) is not entry:
+                # 待機中に再作成・削除された
+                current = self._entries.get(key)
+                return current.name if current is not None else None
+            try:
+                cache = await self._client.aio.caches.update(
+                    name=entry.name,
+                    config=types.UpdateCachedContentConfig(ttl=f"{entry.ttl_seconds}s"),
+                )
+            except Exception as e:
+                if not is_cache_not_found_error(e):
+                    logger.warning(
+                        "Failed to refresh cache for %s (%s): %s",
+                        entry.persona_name,
+                        entry.name,
+                        e,
+                    )
+                    return None
+                logger.info("Cache for %s expired, recreating", entry.persona_name)
+                return await self._recreate(entry)
+            entry.expires_at = self._expires_at(cache, entry.ttl_seconds)
+            await asyncio.to_thread(self._publish, entry)
+            return entry.name
+
+    async def _recreate(self, entry: CacheEntry) -> Optional[str]:
+        """同じ内容でキャッシュを再作成（ロック取得済みで呼び出す）
+
+        レジストリがある場合は失効したキャッシュの登録を取り消してから、
+        他のワーカーが再作成済みのキャッシュを再利用するか、シングルフライトで作成する。
+        """
+        if self._registry is not None:
+            await asyncio.to_thread(
+                self._registry.remove,
+                self._registry_key(
+                    entry.persona_name, entry.model, entry.system_instruction
+                ),
+                entry.name,
+            )
+        try:
+            return await self.create_persona_cache_async(
+                entry.persona_name,
+                entry.model,
+                entry.system_instruction,
+                entry.ttl_seconds,
+            )
+        except Exception as e:
+            logger.error(f"Failed to recreate cache for {entry.persona_name}: {e}")
+            return None
+
+    async def _create_async(
+        self,
+        persona_name: str,
+        model: str,
+        system_instruction: str,
+        ttl_seconds: int,
+    ) -> str:
+        """API でキャッシュを作成し、レジストリに登録"""
+        cache = await self._client.aio.caches.create(
+            model=model,
+            config=self._create_config(persona_name, system_instruction, ttl_seconds),
+        )
+        name = self._track(persona_name, cache, model, system_instruction, ttl_seconds)
+        await asyncio.to_thread(self._publish, self._entries[(persona_name, model)])
+        return name
+
+    def _adopt(
+        self,
+        persona_name: str,
+        model: str,
+        system_instruction: str,
+        ttl_seconds: int,
+        registered: RegisteredCache,
+    ) -> str:
+        """他のワーカーが登録したキャッシュを管理下に加え、リースを登録"""
+        self._track(
+            persona_name,
+            registered,
+            model,
+            system_instruction,
+            ttl_seconds,
+            expires_at=registered.expires_at,
+        )
+        if self._registry is not None:
+            self._add_leases(
+                [self._registry_key(persona_name, model, system_instruction)]
+            )
+        return registered.name
+
+    async def _adopt_async(
+        self,
+        persona_name: str,
+        model: str,
+        system_instruction: str,
+        ttl_seconds: int,
+        registered: RegisteredCache,
+    ) -> str:
+        """_adopt の非同期版（リースの登録をスレッドで行う）"""
+        self._track(
+            persona_name,
+            registered,
+            model,
+            system_instruction,
+            ttl_seconds,
+            expires_at=registered.expires_at,
+        )
+        if self._registry is not None:
+            await asyncio.to_thread(
+                self._add_leases,
+                [self._registry_key(persona_name, model, system_instruction)],
+            )
+        return registered.name
+
+    def _add_leases(self, keys: List[str]) -> None:
+        """このワーカーのリースを追加・延長（レジストリ設定時のみ呼び出す）"""
+        for key in keys:
+            self._registry.add_lease(key, self._worker_id, self._lease_seconds)
+
+    def _publish(self, entry: CacheEntry) -> None:
+        """キャッシュをレジストリに登録し、リースを登録（レジストリ未設定時は何もしない）"""
+        if self._registry is None:
+            return
+        key = self._registry_key(
+            entry.persona_name, entry.model, entry.system_instruction
+        )
+        self._registry.put(key, RegisteredCache(entry.name, entry.expires_at))
+        self._registry.add_lease(key, self._worker_id, self._lease_seconds)
+
+    @staticmethod
+    def _registry_key(persona_name: str, model: str, system_instruction: str) -> str:
+        """レジストリのキー（システム命令が異なるキャッシュは共有しない）"""
+        digest = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        return f"{persona_name}:{model}:{digest[:16]}"
+
+    def _find(self, persona_name: str, model: Optional[str]) -> Optional[CacheEntry]:
+        if model is not None:
+            return self._entries.get((persona_name, model))
+        found = None
+        for (persona, _), entry in self._entries.items():
+            if persona == persona_name:
+                found = entry
+        return found
+
+    def _track(
+        self,
+        persona_name: str,
+        cache: Any,
+        model: str,
+        system_instruction: str,
+        ttl_seconds: int,
+        expires_at: Optional[float] = None,
+    ) -> str:
+        """作成したキャッシュを管理下に登録"""
+        key = (persona_name, model)
+        # 再登録時も「最後に作成したキャッシュ」になるよう末尾に移す
+        self._entries.pop(key, None)
+        self._entries[key] = CacheEntry(
+            name=cache.name,
+            persona_name=persona_name,
+            model=model,
+            system_instruction=system_instruction,
+            ttl_seconds=ttl_seconds,
+            expires_at=(
+                expires_at
+                if expires_at is not None
+                else self._expires_at(cache, ttl_seconds)
+            ),
+        )
+        self._keys[cache.name] = key
+        return cache.name
+
+    def _expires_at(self, cache: Any, ttl_seconds: int) -> float:
+        """API の expire_time（なければ現在時刻 + TTL）から有効期限を算出"""
+        expire_time = getattr(cache, "expire_time", None)
+        if isinstance(expire_time, datetime):
+            return expire_time.timestamp()
+        return self._clock() + ttl_seconds
+
+    def _lock(self, key: _CacheKey) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    @staticmethod
+    def _create_config(
+        persona_name: str, system_instruction: str, ttl_seconds: int
+    ) -> types.CreateCachedContentConfig:
+        return types.CreateCachedContentConfig(
+            system_instruction=system_instruction,
+            display_name=f"magi-{persona_name}",
+            ttl=f"{ttl_seconds}s",
+        )
+
+
+class SharedContextCache:
+    """フェーズ内で全エージェントが参照する共有コンテキストの短命キャッシュ
+
+    議論・投票では全エージェントに同じトランスクリプトを送るため、
+    モデルごとに1回だけキャッシュを作成して参照させ、入力トークンの
+    コストと最初のトークンまでの時間を削減する。キャッシュはフェーズの
+    終了時に削除する。
+
+    コンテキストキャッシュには最小トークン数があるため、推定トークン数が
+    min_tokens に満たないトランスクリプトはキャッシュしない。
+
+    Example:
+        >>> shared = SharedContextCache(genai.Client(api_key="your-api-key"))
+        >>> orchestrator = MagiOrchestrator(client, shared_context_cache=shared)
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        ttl_seconds: int = 600,
+        min_tokens: int = 1024,
+    ) -> None:
+        """SharedContextCache を初期化
+
+        Args:
+            client: google.genai.Client インスタンス
+            ttl_seconds: キャッシュの有効期限（秒）。削除に失敗した場合の上限になる
+            min_tokens: キャッシュするトランスクリプトの最小推定トークン数
+        """
+        self._client = client
+        self._ttl_seconds = ttl_seconds
+        self._min_tokens = min_tokens
+
+    @asynccontextmanager
+    async def share(
+        self,
+        text: str,
+        models: Iterable[str],
+    ) -> AsyncIterator[Dict[str, str]]:
+        """トランスクリプトをモデルごとにキャッシュし、ブロックの終了時に削除
+
+        作成に失敗したモデルは結果に含めない（呼び出し側はキャッシュなしで送信する）。
+
+        Args:
+            text: 共有するトランスクリプト
+            models: トランスクリプトを参照するモデル名（重複可）
+
+        Yields:
+            モデル名 -> キャッシュ名（短いトランスクリプトの場合は空）
+        """
+        if estimate_tokens(text) < self._min_tokens:
+            yield {}
+            return
+
+        targets = list(dict.fromkeys(models))
+        results = await asyncio.gather(
+            *(self._create(model, text) for model in targets),
+            return_exceptions=True,
+        )
+        caches: Dict[str, str] = {}
+        for model, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to cache shared context for {model}: {result}")
+            else:
+                caches[model] = result
+
+        try:
+            yield caches
+        finally:
+            await asyncio.gather(*(self._delete(name) for name in caches.values()))
+
+    async def _create(self, model: str, text: str) -> str:
+        cache = await self._client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+                display_name="magi-shared-context",
+                ttl=f"{self._ttl_seconds}s",
+            ),
+        )
+        return cache.name
+
+    async def _delete(self, cache_name: str) -> None:
+        try:
+            await self._client.aio.caches.delete(name=cache_name)
+        except Exception as e:
+            # 削除できなかったキャッシュは TTL で失効する
+            logger.warning(f"Failed to delete shared context cache {cache_name}: {e}")
 
 
 class NullCacheManager:
@@ -150,14 +835,47 @@ class NullCacheManager:
     def create_persona_cache(self, *args: Any, **kwargs: Any) -> str:
         return ""
 
-    def get_cache_name(self, persona_name: str) -> Optional[str]:
+    async def create_persona_cache_async(self, *args: Any, **kwargs: Any) -> str:
+        return ""
+
+    def get_cache_name(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[str]:
+        return None
+
+    def remaining_lifetime(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[float]:
         return None
 
     def list_caches(self) -> Dict[str, str]:
         return {}
 
-    def clear_cache(self, persona_name: str) -> bool:
+    def list_entries(self) -> List[CacheEntry]:
+        return []
+
+    def clear_cache(self, persona_name: str, model: Optional[str] = None) -> bool:
         return False
 
     def warmup_all_personas(self, *args: Any, **kwargs: Any) -> Dict[str, str]:
         return {}
+
+    async def warmup(self, *args: Any, **kwargs: Any) -> WarmupReport:
+        return WarmupReport()
+
+    async def refresh(
+        self, persona_name: str, model: Optional[str] = None
+    ) -> Optional[str]:
+        return None
+
+    async def refresh_expiring(self) -> Dict[str, str]:
+        return {}
+
+    async def recover(self, cache_name: str) -> Optional[str]:
+        return None
+
+    def start_auto_refresh(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def stop_auto_refresh(self) -> None:
+        pass
@@ -0,0 +1,485 @@
+"""キャッシュレジストリ
+
+複数のワーカープロセスでペルソナのコンテキストキャッシュを共有するための
+レジストリ。CacheManager に渡すと、他のワーカーが作成済みのキャッシュを
+再利用し、同時起動時の作成は1ワーカーだけが行う（シングルフライト）。
+
+各キャッシュには、それを使用中のワーカーのリース（期限付き）を記録する。
+キャッシュの削除は、他に有効なリースが残っていない場合だけ行う。
+
+バックエンド:
+    FileCacheRegistry: ファイルロック付きの JSON ファイル（同一ホスト）
+    SQLiteCacheRegistry: SQLite ファイル（同一ホスト）
+    RedisCacheRegistry: Redis 互換クライアント（複数ホスト）
+    InMemoryRedis: RedisCacheRegistry 用のプロセス内の代替実装（テスト・単一プロセス用）
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+@dataclass
+class RegisteredCache:
+    """レジストリに登録されたキャッシュ
+
+    Attributes:
+        name: キャッシュ名（例: "caches/12345"）
+        expires_at: 有効期限（UNIX 時刻）
+    """
+
+    name: str
+    expires_at: float
+
+
+class CacheRegistry:
+    """キャッシュレジストリの基底クラス
+
+    キーは CacheManager が (ペルソナ名, モデル名, システム命令のハッシュ) から作る。
+    時刻はすべて UNIX 時刻（ワーカー間で比較するため monotonic は使わない）。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+
+    def get(self, key: str) -> Optional[RegisteredCache]:
+        """有効期限内のキャッシュを取得（存在しない場合は None）"""
+        raise NotImplementedError
+
+    def put(self, key: str, cache: RegisteredCache) -> None:
+        """キャッシュを登録（同一キーは上書き）"""
+        raise NotImplementedError
+
+    def remove(self, key: str, name: str) -> bool:
+        """登録中のキャッシュ名が name の場合だけ登録を削除"""
+        raise NotImplementedError
+
+    def acquire_lock(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """キャッシュ作成のロックを取得
+
+        ロックは ttl_seconds で失効するため、作成中のワーカーが停止しても
+        他のワーカーが作成を引き継げる。
+
+        Returns:
+            取得できた場合 True
+        """
+        raise NotImplementedError
+
+    def release_lock(self, key: str, owner: str) -> None:
+        """owner が保持しているロックを解放"""
+        raise NotImplementedError
+
+    def add_lease(self, key: str, owner: str, ttl_seconds: float) -> None:
+        """キャッシュの使用リースを追加・延長"""
+        raise NotImplementedError
+
+    def release_lease(self, key: str, owner: str) -> int:
+        """リースを解放
+
+        Returns:
+            他のワーカーの有効なリースの数
+        """
+        raise NotImplementedError
+
+
+class _DocumentRegistry(CacheRegistry):
+    """状態全体を1つのドキュメントとして排他的に読み書きするレジストリ
+
+    サブクラスは _transaction でドキュメントを排他的に読み込み、
+    ブロックの終了時に書き戻す。ドキュメントの形式:
+
+        {"caches": {key: {"name", "expires_at"}},
+         "locks": {key: {"owner", "expires_at"}},
+         "leases": {key: {owner: expires_at}}}
+    """
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[RegisteredCache]:
+        with self._transaction() as doc:
+            data = doc["caches"].get(key)
+        if data is None or data["expires_at"] <= self._clock():
+            return None
+        return RegisteredCache(**data)
+
+    def put(self, key: str, cache: RegisteredCache) -> None:
+        with self._transaction() as doc:
+            doc["caches"][key] = {"name": cache.name, "expires_at": cache.expires_at}
+
+    def remove(self, key: str, name: str) -> bool:
+        with self._transaction() as doc:
+            data = doc["caches"].get(key)
+            if data is None or data["name"] != name:
+                return False
+            del doc["caches"][key]
+            return True
+
+    def acquire_lock(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = self._clock()
+        with self._transaction() as doc:
+            lock = doc["locks"].get(key)
+            if lock is not None and lock["owner"] != owner and lock["expires_at"] > now:
+                return False
+            doc["locks"][key] = {"owner": owner, "expires_at": now + ttl_seconds}
+            return True
+
+    def release_lock(self, key: str, owner: str) -> None:
+        with self._transaction() as doc:
+            lock = doc["locks"].get(key)
+            if lock is not None and lock["owner"] == owner:
+                del doc["locks"][key]
+
+    def add_lease(self, key: str, owner: str, ttl_seconds: float) -> None:
+        with self._transaction() as doc:
+            doc["leases"].setdefault(key, {})[owner] = self._clock() + ttl_seconds
+
+    def release_lease(self, key: str, owner: str) -> int:
+        now = self._clock()
+        with self._transaction() as doc:
+            leases = doc["leases"].get(key, {})
+            leases.pop(owner, None)
+            live = {o: exp for o, exp in leases.items() if exp > now}
+            if live:
+                doc["leases"][key] = live
+            else:
+                doc["leases"].pop(key, None)
+            return len(live)
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"caches": {}, "locks": {}, "leases": {}}
+
+
+class FileCacheRegistry(_DocumentRegistry):
+    """ファイルロック付きの JSON ファイルで共有するレジストリ
+
+    同一ホストのワーカー間で共有する。読み書きは隣接するロックファイルの
+    排他ロック（fcntl.flock）の下で行い、書き込みはアトミックに置換する。
+
+    Example:
+        >>> registry = FileCacheRegistry(".magi/cache-registry.json")
+        >>> cache_manager = CacheManager(genai_client, registry=registry)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """レジストリを初期化
+
+        Args:
+            path: JSON ファイルのパス
+            clock: 現在時刻（UNIX 時刻）を返す関数（テスト用）
+        """
+        super().__init__(clock)
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self._path.with_name(self._path.name + ".lock")
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Dict[str, Any]]:
+        import fcntl
+
+        with self._thread_lock, self._lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                doc = self._read()
+                before = json.dumps(doc, sort_keys=True)
+                yield doc
+                if json.dumps(doc, sort_keys=True) != before:
+                    self._write(doc)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Any]:
+        if not self._path.exists():
+            return self._empty()
+        with self._path.open(encoding="utf-8") as f:
+            return {**self._empty(), **json.load(f)}
+
+    def _write(self, doc: Dict[str, Any]) -> None:
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        os.replace(tmp_path, self._path)
+
+
+class SQLiteCacheRegistry(_DocumentRegistry):
+    """SQLite ファイルで共有するレジストリ
+
+    同一ホストのワーカー間で共有する。読み書きは BEGIN IMMEDIATE の
+    トランザクション内で行うため、プロセス間でも排他的になる。
+
+    Example:
+        >>> registry = SQLiteCacheRegistry(".magi/cache-registry.db")
+        >>> cache_manager = CacheManager(genai_client, registry=registry)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """レジストリを初期化
+
+        Args:
+            path: SQLite データベースファイルのパス
+            clock: 現在時刻（UNIX 時刻）を返す関数（テスト用）
+        """
+        super().__init__(clock)
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self._path), check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_registry (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    payload TEXT NOT NULL
+                )
+                """)
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT payload FROM cache_registry WHERE id = 0"
+                ).fetchone()
+                doc = {**self._empty(), **json.loads(row[0])} if row else self._empty()
+                before = json.dumps(doc, sort_keys=True)
+                yield doc
+                payload = json.dumps(doc, sort_keys=True)
+                if payload != before:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cache_registry (id, payload) "
+                        "VALUES (0, ?)",
+                        (payload,),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class RedisCacheRegistry(CacheRegistry):
+    """Redis 互換クライアントで共有するレジストリ
+
+    複数ホストのワーカー間で共有する。redis-py の同期クライアント
+    （または同じメソッドを持つ互換クライアント）を渡す。使用するコマンドは
+    GET / SET (NX, PX) / DELETE / PEXPIRE / ZADD / ZREM / ZRANGE /
+    ZREMRANGEBYSCORE / ZCARD のみ。
+
+    Example:
+        >>> import redis
+        >>> registry = RedisCacheRegistry(redis.Redis.from_url("redis://localhost"))
+        >>> cache_manager = CacheManager(genai_client, registry=registry)
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = "magi:cache",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """レジストリを初期化
+
+        Args:
+            redis_client: Redis 互換クライアント
+            prefix: キーの接頭辞
+            clock: 現在時刻（UNIX 時刻）を返す関数（テスト用）
+        """
+        super().__init__(clock)
+        self._redis = redis_client
+        self._prefix = prefix
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self._prefix}:{kind}:{key}"
+
+    def get(self, key: str) -> Optional[RegisteredCache]:
+        raw = self._redis.get(self._key("entry", key))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        if data["expires_at"] <= self._clock():
+            return None
+        return RegisteredCache(**data)
+
+    def put(self, key: str, cache: RegisteredCache) -> None:
+        ttl_ms = int((cache.expires_at - self._clock()) * 1000)
+        if ttl_ms <= 0:
+            return
+        payload = json.dumps({"name": cache.name, "expires_at": cache.expires_at})
+        self._redis.set(self._key("entry", key), payload, px=ttl_ms)
+
+    def remove(self, key: str, name: str) -> bool:
+        # GET と DELETE の間に他のワーカーが再登録する可能性は小さく、
+        # その場合も再登録したワーカーが次の参照時に再作成する
+        current = self.get(key)
+        if current is None or current.name != name:
+            return False
+        self._redis.delete(self._key("entry", key))
+        return True
+
+    def acquire_lock(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        return bool(
+            self._redis.set(
+                self._key("lock", key), owner, nx=True, px=int(ttl_seconds * 1000)
+            )
+        )
+
+    def release_lock(self, key: str, owner: str) -> None:
+        lock_key = self._key("lock", key)
+        current = self._redis.get(lock_key)
+        if current is not None and _to_str(current) == owner:
+            self._redis.delete(lock_key)
+
+    def add_lease(self, key: str, owner: str, ttl_seconds: float) -> None:
+        leases_key = self._key("leases", key)
+        now = self._clock()
+        self._redis.zremrangebyscore(leases_key, "-inf", now)
+        self._redis.zadd(leases_key, {owner: now + ttl_seconds})
+        # 停止したワーカーのリースだけが残った集合は最も遅いリースの期限で消える
+        latest = self._redis.zrange(leases_key, -1, -1, withscores=True)
+        if latest:
+            _, expires_at = latest[0]
+            self._redis.pexpire(leases_key, max(int((expires_at - now) * 1000), 1))
+
+    def release_lease(self, key: str, owner: str) -> int:
+        leases_key = self._key("leases", key)
+        self._redis.zrem(leases_key, owner)
+        self._redis.zremrangebyscore(leases_key, "-inf", self._clock())
+        return int(self._redis.zcard(leases_key))
+
+
+class InMemoryRedis:
+    """RedisCacheRegistry が使う Redis コマンドのプロセス内の代替実装
+
+    Redis を用意できない開発環境・テスト・単一プロセスでの利用向け。
+    プロセス間では共有されない。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._zsets: Dict[str, Dict[str, float]] = {}
+        self._zset_expiry: Dict[str, float] = {}
+
+    def _live(self, name: str) -> Optional[Any]:
+        item = self._values.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= self._clock():
+            del self._values[name]
+            return None
+        return value
+
+    def _live_zset(self, name: str) -> Dict[str, float]:
+        expires_at = self._zset_expiry.get(name)
+        if expires_at is not None and expires_at <= self._clock():
+            self._zsets.pop(name, None)
+            del self._zset_expiry[name]
+        return self._zsets.get(name, {})
+
+    def get(self, name: str) -> Optional[Any]:
+        with self._lock:
+            return self._live(name)
+
+    def set(
+        self,
+        name: str,
+        value: Any,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(name) is not None:
+                return None
+            expires_at = self._clock() + px / 1000 if px is not None else None
+            self._values[name] = (value, expires_at)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            removed = 0
+            for name in names:
+                removed += int(self._values.pop(name, None) is not None)
+                removed += int(self._zsets.pop(name, None) is not None)
+                self._zset_expiry.pop(name, None)
+            return removed
+
+    def pexpire(self, name: str, ms: int) -> bool:
+        with self._lock:
+            expires_at = self._clock() + ms / 1000
+            if self._live(name) is not None:
+                value, _ = self._values[name]
+                self._values[name] = (value, expires_at)
+                return True
+            if self._live_zset(name):
+                self._zset_expiry[name] = expires_at
+                return True
+            return False
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            zset = self._live_zset(name)
+            if not zset:
+                zset = self._zsets[name] = {}
+            added = sum(1 for member in mapping if member not in zset)
+            zset.update(mapping)
+            return added
+
+    def zrem(self, name: str, *members: str) -> int:
+        with self._lock:
+            zset = self._live_zset(name)
+            return sum(1 for m in members if zset.pop(m, None) is not None)
+
+    def zrange(
+        self, name: str, start: int, end: int, withscores: bool = False
+    ) -> List[Any]:
+        with self._lock:
+            ranked = sorted(self._live_zset(name).items(), key=lambda item: item[1])
+            stop = end + 1 if end >= 0 else len(ranked) + end + 1
+            members = ranked[start:stop]
+            return members if withscores else [member for member, _ in members]
+
+    def zremrangebyscore(
+        self, name: str, min: Union[str, float], max: Union[str, float]
+    ) -> int:
+        low, high = float(min), float(max)
+        with self._lock:
+            zset = self._live_zset(name)
+            doomed = [m for m, score in zset.items() if low <= score <= high]
+            for member in doomed:
+                del zset[member]
+            return len(doomed)
+
+    def zcard(self, name: str) -> int:
+        with self._lock:
+            return len(self._live_zset(name))
+
+
+def _to_str(value: Any) -> str:
+    """redis-py が返す bytes を str に変換"""
+    return value.decode() if isinstance(value, bytes) else str(value)
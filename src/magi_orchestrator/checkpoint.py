@@ -0,0 +1,247 @@
+"""フェーズ単位のチェックポイント
+
+合議の各フェーズ（Thinking / Debate の各ラウンド / Voting）の出力を
+合議 ID ごとに永続化し、クラッシュや再起動後に未完了のフェーズから再開できるようにする。
+
+バックエンド:
+    FileCheckpointStore: 合議ごとの JSON ファイル
+    SQLiteCheckpointStore: SQLite ファイル
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from magi.models import DebateRound, PersonaType, ThinkingOutput, VoteOutput
+
+from magi_orchestrator.serialization import (
+    debate_round_from_dict,
+    debate_round_to_dict,
+    thinking_output_from_dict,
+    thinking_output_to_dict,
+    vote_output_from_dict,
+    vote_output_to_dict,
+)
+
+
+@dataclass
+class ConsultationCheckpoint:
+    """合議の途中状態
+
+    Attributes:
+        consultation_id: 合議 ID
+        query: ユーザーからの質問/議題
+        thinking_results: Thinking Phase の結果（未完了の場合は None）
+        debate_results: 完了済みの議論ラウンド
+        debate_complete: Debate Phase が完了したか
+        voting_results: Voting Phase の結果（未完了の場合は None）
+    """
+
+    consultation_id: str
+    query: str
+    thinking_results: Optional[Dict[PersonaType, ThinkingOutput]] = None
+    debate_results: List[DebateRound] = field(default_factory=list)
+    debate_complete: bool = False
+    voting_results: Optional[Dict[PersonaType, VoteOutput]] = None
+
+    @property
+    def is_complete(self) -> bool:
+        """全フェーズが完了しているか"""
+        return self.voting_results is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 互換の dict に変換"""
+        return {
+            "consultation_id": self.consultation_id,
+            "query": self.query,
+            "thinking_results": (
+                {
+                    pt.value: thinking_output_to_dict(output)
+                    for pt, output in self.thinking_results.items()
+                }
+                if self.thinking_results is not None
+                else None
+            ),
+            "debate_results": [debate_round_to_dict(r) for r in self.debate_results],
+            "debate_complete": self.debate_complete,
+            "voting_results": (
+                {
+                    pt.value: vote_output_to_dict(output)
+                    for pt, output in self.voting_results.items()
+                }
+                if self.voting_results is not None
+                else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConsultationCheckpoint":
+        """dict から復元"""
+        thinking = data.get("thinking_results")
+        voting = data.get("voting_results")
+        return cls(
+            consultation_id=data["consultation_id"],
+            query=data["query"],
+            thinking_results=(
+                {
+                    PersonaType(pt): thinking_output_from_dict(output)
+                    for pt, output in thinking.items()
+                }
+                if thinking is not None
+                else None
+            ),
+            debate_results=[
+                debate_round_from_dict(r) for r in data.get("debate_results", [])
+            ],
+            debate_complete=data.get("debate_complete", False),
+            voting_results=(
+                {
+                    PersonaType(pt): vote_output_from_dict(output)
+                    for pt, output in voting.items()
+                }
+                if voting is not None
+                else None
+            ),
+        )
+
+
+class CheckpointStore:
+    """チェックポイントストアの基底クラス"""
+
+    def save(self, checkpoint: ConsultationCheckpoint) -> None:
+        """チェックポイントを保存（同一 ID は上書き）"""
+        raise NotImplementedError
+
+    def load(self, consultation_id: str) -> Optional[ConsultationCheckpoint]:
+        """チェックポイントを読み込む（存在しない場合は None）"""
+        raise NotImplementedError
+
+    def delete(self, consultation_id: str) -> bool:
+        """チェックポイントを削除（削除した場合 True）"""
+        raise NotImplementedError
+
+
+# FileCheckpointStore のファイル名に使える合議 ID
+_SAFE_ID = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+class FileCheckpointStore(CheckpointStore):
+    """合議ごとに JSON ファイルで保存するストア
+
+    書き込みは一時ファイル経由のアトミックな置換で行う。
+    合議 ID はファイル名に使うため、英数字と "_" "." "-" のみ（".." を除く）を受け付ける。
+
+    Example:
+        >>> store = FileCheckpointStore(".magi/checkpoints")
+        >>> orchestrator = MagiOrchestrator(client, checkpoint_store=store)
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """ストアを初期化
+
+        Args:
+            directory: チェックポイントを保存するディレクトリ
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, consultation_id: str) -> Path:
+        """合議 ID のファイルパス
+
+        Raises:
+            ValueError: ディレクトリ外を指し得る合議 ID の場合
+        """
+        if not _SAFE_ID.fullmatch(consultation_id) or ".." in consultation_id:
+            raise ValueError(f"Invalid consultation_id: {consultation_id!r}")
+        return self._directory / f"{consultation_id}.json"
+
+    def save(self, checkpoint: ConsultationCheckpoint) -> None:
+        path = self._path(checkpoint.consultation_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def load(self, consultation_id: str) -> Optional[ConsultationCheckpoint]:
+        path = self._path(consultation_id)
+        if not path.exists():
+            return None
+        with path.open(encoding="utf-8") as f:
+            return ConsultationCheckpoint.from_dict(json.load(f))
+
+    def delete(self, consultation_id: str) -> bool:
+        path = self._path(consultation_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """SQLite ファイルで保存するストア
+
+    Example:
+        >>> store = SQLiteCheckpointStore(".magi/checkpoints.db")
+        >>> orchestrator = MagiOrchestrator(client, checkpoint_store=store)
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """ストアを初期化
+
+        Args:
+            path: SQLite データベースファイルのパス
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    consultation_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL
+                )
+                """)
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        self._conn.close()
+
+    def save(self, checkpoint: ConsultationCheckpoint) -> None:
+        payload = json.dumps(checkpoint.to_dict(), ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (consultation_id, payload) "
+                "VALUES (?, ?)",
+                (checkpoint.consultation_id, payload),
+            )
+
+    def load(self, consultation_id: str) -> Optional[ConsultationCheckpoint]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM checkpoints WHERE consultation_id = ?",
+                (consultation_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return ConsultationCheckpoint.from_dict(json.loads(row[0]))
+
+    def delete(self, consultation_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM checkpoints WHERE consultation_id = ?",
+                (consultation_id,),
+            )
+        return cursor.rowcount > 0
@@ -1,23 +1,73 @@
+"""magi-gemini コマンド
+
+magi-gemini "質問"           1件の合議を実行して結果を表示
+magi-gemini ask "質問"       同上（サブコマンド名と同じ質問は ask か -- の後に指定）
+magi-gemini serve [...]      常駐サービス（HTTP API・ジョブキュー）を起動
+magi-gemini batch [...]      JSONL の質問を並行して合議し、結果を JSONL に出力
+
+google.genai・pydantic・magi を読み込むモジュールは実行時に関数内で import する
+（--help や引数エラーでは読み込まないため、起動が速い）。
+"""
+
+from __future__ import annotations
+
 import argparse
-import asyncio
 import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    from magi_orchestrator.client import GeminiNativeClient
+    from magi_orchestrator.config import OrchestratorSettings
+    from magi_orchestrator.orchestrator import MagiOrchestrator
 
-from magi_orchestrator.client import GeminiNativeClient
-from magi_orchestrator.config import OrchestratorSettings
-from magi_orchestrator.orchestrator import MagiOrchestrator
 
+def _load_settings() -> OrchestratorSettings:
+    """設定を読み込む（API Key が未設定の場合は終了）"""
+    from dotenv import load_dotenv
+
+    from magi_orchestrator.config import OrchestratorSettings
 
-async def run_magi(query: str, verbose: bool = False) -> None:
-    """MAGI システムを実行する"""
-    # 設定読み込み
     load_dotenv()
     settings = OrchestratorSettings()
 
     if not settings.api_key:
         print("Error: MAGI_GEMINI_API_KEY is not set.", file=sys.stderr)
         sys.exit(1)
+    return settings
+
+
+def _create_client(settings: OrchestratorSettings) -> GeminiNativeClient:
+    """設定からクライアントを作成"""
+    from magi_orchestrator.client import GeminiNativeClient
+
+    return GeminiNativeClient.from_settings(settings)
+
+
+def _build_orchestrator(
+    settings: OrchestratorSettings,
+    client: GeminiNativeClient,
+    **kwargs: Any,
+) -> MagiOrchestrator:
+    """設定からオーケストレーターを作成"""
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+
+    return MagiOrchestrator(
+        client=client,
+        voting_threshold=settings.voting_threshold,
+        debate_rounds=settings.debate_rounds,
+        convergence_threshold=settings.debate_convergence_threshold,
+        context_token_budget=settings.debate_context_token_budget,
+        generation_profiles=settings.phase_profiles(),
+        router=settings.model_router(),
+        **kwargs,
+    )
+
+
+async def run_magi(query: str, verbose: bool = False) -> None:
+    """MAGI システムを実行する"""
+    from magi_orchestrator.transcript import debate_statement
+
+    settings = _load_settings()
 
     if verbose:
         print(f"Model: {settings.default_model}")
@@ -25,16 +75,10 @@ async def run_magi(query: str, verbose: bool = False) -> None:
         print("-" * 50)
 
     # クライアントとオーケストレーターの初期化
-    client = GeminiNativeClient(
-        api_key=settings.api_key,
-        timeout=settings.timeout,
-    )
+    client = _create_client(settings)
 
     try:
-        orchestrator = MagiOrchestrator(
-            client=client,
-            voting_threshold=settings.voting_threshold,
-        )
+        orchestrator = _build_orchestrator(settings, client)
 
         print(f"MAGI System Processing: '{query}'...\n")
 
@@ -58,14 +102,14 @@ async def run_magi(query: str, verbose: bool = False) -> None:
             for round_data in result.debate_results:
                 print(f"\n[Round {round_data.round_number}]")
                 for persona, output in round_data.outputs.items():
-                    content = (
-                        list(output.responses.values())[0] if output.responses else ""
-                    )
-                    print(
-                        f"  {persona.value.upper()}: {content[:100]}..."
-                        if not verbose
-                        else f"\n[{persona.value.upper()}]\n{content}"
-                    )
+                    content = debate_statement(output)
+                    if not verbose:
+                        print(f"  {persona.value.upper()}: {content[:100]}...")
+                        continue
+                    print(f"\n[{persona.value.upper()}]\n{content}")
+                    for target, text in output.responses.items():
+                        if target != persona:
+                            print(f"  -> {target.value.upper()}: {text}")
 
         # Voting Phase
         print("\n--- Phase 3: Voting ---")
@@ -86,12 +130,158 @@ async def run_magi(query: str, verbose: bool = False) -> None:
         await client.close()
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="MAGI Gemini Orchestrator CLI")
+async def run_server(
+    host: str,
+    port: int,
+    workers: int,
+    warmup_caches: bool = True,
+) -> None:
+    """常駐サービスを起動し、停止されるまで待ち受ける
+
+    全リクエストで1つのクライアント（コネクションプール・アドミッション制御）と
+    事前作成したペルソナキャッシュを共有する。
+    """
+    from magi_orchestrator.cache import CacheManager
+    from magi_orchestrator.server import MagiHTTPServer, MagiService
+
+    settings = _load_settings()
+    client = _create_client(settings)
+    cache_manager = None
+    if warmup_caches and client.genai_client is not None:
+        cache_manager = CacheManager(
+            client.genai_client,
+            refresh_margin_seconds=settings.cache_refresh_margin_seconds,
+        )
+
+    orchestrator = _build_orchestrator(settings, client, cache_manager=cache_manager)
+    service = MagiService(
+        orchestrator,
+        workers=workers,
+        cache_manager=cache_manager,
+        cache_ttl_seconds=settings.cache_ttl_seconds,
+    )
+    server = MagiHTTPServer(service, host=host, port=port)
+    try:
+        await server.start()
+        print(f"MAGI server listening on http://{host}:{server.port}")
+        await server.serve_forever()
+    finally:
+        await server.stop()
+        await client.close()
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int) -> int:
+    """JSONL の質問を1つのクライアントで並行して合議し、結果を JSONL に追記
+
+    Returns:
+        終了コード（失敗した合議があれば 1）
+    """
+    from magi_orchestrator.batch import run_jsonl
+
+    settings = _load_settings()
+    client = _create_client(settings)
+    try:
+        stats = await run_jsonl(
+            _build_orchestrator(settings, client),
+            input_path,
+            output_path,
+            max_concurrency=concurrency,
+        )
+    finally:
+        await client.close()
+
+    print(
+        f"Completed: {stats.completed}, Failed: {stats.failed}, "
+        f"Elapsed: {stats.elapsed:.1f}s ({stats.throughput:.2f} consults/sec)",
+        file=sys.stderr,
+    )
+    return 1 if stats.failed else 0
+
+
+def _batch_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="magi-gemini batch",
+        description="Run consultations for every query in a JSONL file",
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        required=True,
+        help='JSONL file of {"id": ..., "query": ...} objects or query strings',
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        help="JSONL file to append results to (ids already done are skipped)",
+    )
+    parser.add_argument(
+        "--concurrency", "-c", type=int, default=4, help="Concurrent consultations"
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+
+    import asyncio
+
+    try:
+        exit_code = asyncio.run(run_batch(args.input, args.output, args.concurrency))
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Re-run to resume.")
+        sys.exit(130)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(exit_code)
+
+
+def _serve_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="magi-gemini serve",
+        description="Run MAGI as a long-running HTTP/job-queue service",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8080, help="Bind port")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent job-queue workers"
+    )
+    parser.add_argument(
+        "--no-cache-warmup",
+        action="store_true",
+        help="Do not pre-create persona context caches",
+    )
+    args = parser.parse_args(argv)
+
+    import asyncio
+
+    try:
+        asyncio.run(
+            run_server(
+                args.host,
+                args.port,
+                args.workers,
+                warmup_caches=not args.no_cache_warmup,
+            )
+        )
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+def _consult_main(argv: List[str], prog: str = "magi-gemini") -> None:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="MAGI Gemini Orchestrator CLI",
+        epilog="Subcommands: serve (run as a service), batch (JSONL queries). "
+        "Use 'magi-gemini <subcommand> --help' for details. To ask a query that "
+        "is a subcommand name, use 'magi-gemini ask serve' or 'magi-gemini -- serve'.",
+    )
     parser.add_argument("query", help="Query or topic for MAGI system")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # --help や引数エラーの場合は asyncio の読み込みを省く
+    import asyncio
 
     try:
         asyncio.run(run_magi(args.query, args.verbose))
@@ -100,5 +290,25 @@ def main() -> None:
         sys.exit(130)
 
 
+def _ask_main(argv: List[str]) -> None:
+    _consult_main(argv, prog="magi-gemini ask")
+
+
+# サブコマンド名 -> エントリーポイント（それ以外の引数は質問として扱う）
+_COMMANDS: Dict[str, Callable[[List[str]], None]] = {
+    "serve": _serve_main,
+    "batch": _batch_main,
+    "ask": _ask_main,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in _COMMANDS:
+        _COMMANDS[args[0]](args[1:])
+    else:
+        _consult_main(args)
+
+
 if __name__ == "__main__":
     main()
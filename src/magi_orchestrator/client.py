@@ -7,11 +7,60 @@ google-genai SDK を使った非同期クライアント。
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Optional
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    Tuple,
+)
 
 from google import genai
 from google.genai import types
 
+from magi_orchestrator.backends import GenaiBackend, GenerationBackend
+from magi_orchestrator.cache import is_cache_not_found_error
+from magi_orchestrator.memo import ResponseMemo, make_request_key
+from magi_orchestrator.rate_limit import (
+    AdmissionController,
+    ModelRateLimit,
+    estimate_tokens,
+)
+from magi_orchestrator.retry import (
+    HedgePolicy,
+    LatencyTracker,
+    RetryBudget,
+    RetryPolicy,
+    is_transient_error,
+)
+from magi_orchestrator.tracing import call_span, current_call
+
+if TYPE_CHECKING:
+    from magi_orchestrator.config import OrchestratorSettings
+
+logger = logging.getLogger(__name__)
+
+# キャッシュ名を受け取り、再作成したキャッシュ名（できなければ None）を返す
+CacheRecovery = Callable[[str], Awaitable[Optional[str]]]
+
+# generate_concurrent 等が例外を変換したテキストの接頭辞
+ERROR_PREFIX = "[ERROR]"
+
+
+def format_error(error: BaseException) -> str:
+    """例外をエラーメッセージのテキストに変換"""
+    return f"{ERROR_PREFIX} {type(error).__name__}: {error}"
+
+
+def is_error_text(text: str) -> bool:
+    """format_error で変換されたエラーメッセージか判定"""
+    return text.startswith(ERROR_PREFIX)
+
 
 class GeminiNativeClient:
     """google-genai SDK ネイティブクライアント
@@ -29,20 +78,117 @@ class GeminiNativeClient:
         >>> print(response)
     """
 
-    def __init__(self, api_key: str, timeout: int = 60) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 60,
+        response_memo: Optional[ResponseMemo] = None,
+        admission: Optional[AdmissionController] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        backend: Optional[GenerationBackend] = None,
+    ) -> None:
         """クライアントを初期化
 
         Args:
             api_key: Gemini API Key
             timeout: リクエストタイムアウト（秒）
+            response_memo: リクエスト単位のレスポンスメモ（オプション）。
+                指定時は同一の (model, contents, config) の生成結果を再利用する
+            admission: アドミッション制御（オプション）。複数クライアントで
+                共有すると、同時実行数とレート上限をまとめて管理できる
+            retry_policy: 一時的なエラーに対するリトライ戦略
+                （省略時は RetryPolicy の既定値。無効化は max_attempts=1）
+            hedge_policy: ヘッジ戦略（オプション）。指定時は遅いリクエストに
+                重複リクエストを送り、先着の応答を採用する
+            backend: 生成バックエンド（オプション）。省略時は google-genai SDK を
+                使う GenaiBackend。負荷試験では magi_orchestrator.fake.FakeBackend を使う
         """
         self._api_key = api_key
         self._timeout = timeout
-        self._client = genai.Client(
-            api_key=api_key,
-            http_options=types.HttpOptions(timeout=timeout * 1000),
+        self._response_memo = response_memo
+        self._admission = admission
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._retry_budget = RetryBudget(
+            ratio=self._retry_policy.budget_ratio,
+            min_retries=self._retry_policy.budget_min_retries,
+        )
+        self._hedge_policy = hedge_policy
+        self._latency: dict[str, LatencyTracker] = {}
+        self._cache_recovery: Optional[CacheRecovery] = None
+        if backend is None:
+            self._client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(timeout=timeout * 1000),
+            )
+            backend = GenaiBackend(self._client.aio)
+        else:
+            self._client = None
+        self._backend = backend
+
+    @property
+    def genai_client(self) -> Optional[genai.Client]:
+        """google-genai SDK のクライアント（backend を指定した場合は None）
+
+        CacheManager に渡すと、キャッシュの作成・延長と生成リクエストで
+        同じコネクションプールを共有できる。
+        """
+        return self._client
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: "OrchestratorSettings",
+        **kwargs: Any,
+    ) -> "GeminiNativeClient":
+        """設定からクライアントを作成
+
+        同時実行数・レート上限の設定からアドミッション制御を構築する。
+
+        Args:
+            settings: OrchestratorSettings インスタンス
+            **kwargs: __init__ に渡す追加の引数
+
+        Returns:
+            GeminiNativeClient インスタンス
+        """
+        kwargs.setdefault(
+            "admission",
+            AdmissionController(
+                max_in_flight=settings.max_concurrent_requests,
+                default_limit=ModelRateLimit(
+                    requests_per_minute=settings.requests_per_minute,
+                    tokens_per_minute=settings.tokens_per_minute,
+                ),
+                model_limits={
+                    model: ModelRateLimit(**limit.model_dump())
+                    for model, limit in settings.model_rate_limits.items()
+                },
+            ),
         )
-        self._aio_client = self._client.aio
+        kwargs.setdefault(
+            "retry_policy",
+            RetryPolicy(
+                max_attempts=settings.retry_max_attempts,
+                deadline=settings.retry_deadline_seconds,
+            ),
+        )
+        if settings.hedge_requests:
+            kwargs.setdefault("hedge_policy", HedgePolicy())
+        return cls(api_key=settings.api_key, timeout=settings.timeout, **kwargs)
+
+    def set_cache_recovery(self, recovery: Optional[CacheRecovery]) -> None:
+        """キャッシュが見つからないエラーからの回復処理を設定
+
+        cached_content を指定したリクエストが失効したキャッシュを参照して
+        失敗した場合、recovery で再作成したキャッシュを使って1回だけ再実行する。
+        再作成できなかった場合はキャッシュなしで再実行する。
+
+        Args:
+            recovery: キャッシュ名を受け取り、新しいキャッシュ名を返す
+                コルーチン関数（例: CacheManager.recover）。None で解除
+        """
+        self._cache_recovery = recovery
 
     async def generate_content(
         self,
@@ -66,19 +212,50 @@ class GeminiNativeClient:
         Returns:
             生成されたテキスト
         """
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-            temperature=temperature,
-            max_output_tokens=max_output_tokens,
-            cached_content=cached_content,
+        return await self._generate(
+            model,
+            contents,
+            {
+                "system_instruction": system_instruction,
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens,
+                "cached_content": cached_content,
+            },
         )
 
-        response = await self._aio_client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=config,
-        )
-        return response.text or ""
+    async def generate_content_stream(
+        self,
+        model: str,
+        contents: str,
+        system_instruction: str,
+        temperature: float = 0.7,
+        max_output_tokens: int = 4096,
+        cached_content: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """非同期ストリーミング生成
+
+        トークンが到着するたびにテキストチャンクを返す。
+
+        Args:
+            model: モデル名（例: "gemini-1.5-flash"）
+            contents: ユーザープロンプト
+            system_instruction: システム命令
+            temperature: 温度パラメータ（0.0〜1.0）
+            max_output_tokens: 最大出力トークン数
+            cached_content: キャッシュ名（オプション）
+
+        Yields:
+            生成されたテキストチャンク
+        """
+        config = {
+            "system_instruction": system_instruction,
+            "temperature": temperature,
+            "max_output_tokens": max_output_tokens,
+            "cached_content": cached_content,
+        }
+        async for chunk in self._stream_with_retry(model, contents, config):
+            if chunk.text:
+                yield chunk.text
 
     async def generate_concurrent(
         self,
@@ -91,6 +268,7 @@ class GeminiNativeClient:
                 - model: モデル名
                 - contents: ユーザープロンプト
                 - config: GenerateContentConfig の引数（dict）
+                - agent: 呼び出し元のペルソナ名（オプション、トレース用）
 
         Returns:
             生成されたテキストのリスト（リクエスト順）
@@ -104,10 +282,8 @@ class GeminiNativeClient:
             >>> results = await client.generate_concurrent(requests)
         """
         tasks = [
-            self._aio_client.models.generate_content(
-                model=req["model"],
-                contents=req["contents"],
-                config=types.GenerateContentConfig(**req.get("config", {})),
+            self._generate(
+                req["model"], req["contents"], req.get("config", {}), req.get("agent")
             )
             for req in requests
         ]
@@ -117,14 +293,374 @@ class GeminiNativeClient:
         texts: list[str] = []
         for result in results:
             if isinstance(result, Exception):
-                texts.append(f"[ERROR] {type(result).__name__}: {result}")
+                texts.append(format_error(result))
             else:
-                texts.append(result.text or "")
+                texts.append(result)
         return texts
 
+    async def generate_as_completed(
+        self,
+        requests: list[dict[str, Any]],
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """複数リクエストを並列実行し、完了順に結果を返す
+
+        リクエストの形式は generate_concurrent と同じ。
+        呼び出し側が途中で反復を打ち切った場合、未完了のリクエストはキャンセルされる。
+
+        Args:
+            requests: リクエストのリスト
+
+        Yields:
+            (リクエストのインデックス, 生成されたテキスト) のタプル。
+            例外は generate_concurrent と同様にエラーメッセージに変換する。
+        """
+
+        async def run(index: int, req: dict[str, Any]) -> Tuple[int, str]:
+            try:
+                text = await self._generate(
+                    req["model"],
+                    req["contents"],
+                    req.get("config", {}),
+                    req.get("agent"),
+                )
+                return index, text
+            except Exception as e:
+                return index, format_error(e)
+
+        tasks = [asyncio.create_task(run(i, req)) for i, req in enumerate(requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def generate_concurrent_stream(
+        self,
+        requests: list[dict[str, Any]],
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """複数リクエストを並列にストリーミング実行
+
+        各リクエストのチャンクを到着順にマージして返す。
+        リクエストの形式は generate_concurrent と同じ。
+
+        Args:
+            requests: リクエストのリスト
+
+        Yields:
+            (リクエストのインデックス, テキストチャンク) のタプル。
+            例外は generate_concurrent と同様にエラーメッセージのチャンクに変換する。
+        """
+        queue: asyncio.Queue[Tuple[int, Optional[str]]] = asyncio.Queue()
+
+        async def pump(index: int, req: dict[str, Any]) -> None:
+            try:
+                with call_span(req["model"], req.get("agent")) as span:
+                    span.streamed = True
+                    stream = self._stream_with_retry(
+                        req["model"], req["contents"], req.get("config", {})
+                    )
+                    async for chunk in stream:
+                        # 使用量は最終チャンクの値が累計になる
+                        span.record_usage(chunk.usage_metadata)
+                        if chunk.text:
+                            await queue.put((index, chunk.text))
+            except Exception as e:
+                await queue.put((index, format_error(e)))
+            finally:
+                # None は当該リクエストの終端を表す
+                await queue.put((index, None))
+
+        tasks = [asyncio.create_task(pump(i, req)) for i, req in enumerate(requests)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                index, text = await queue.get()
+                if text is None:
+                    remaining -= 1
+                    continue
+                yield index, text
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _generate(
+        self,
+        model: str,
+        contents: str,
+        config: dict[str, Any],
+        agent: Optional[str] = None,
+    ) -> str:
+        """1リクエストを実行（レスポンスメモを経由）
+
+        呼び出しは実行中の合議のトレースに CallSpan として記録される。
+
+        Args:
+            model: モデル名
+            contents: ユーザープロンプト
+            config: GenerateContentConfig の引数（dict）
+            agent: 呼び出し元のペルソナ名（トレース用）
+
+        Returns:
+            生成されたテキスト
+        """
+        with call_span(model, agent) as span:
+            key = None
+            if self._response_memo is not None:
+                key = make_request_key(model, contents, config)
+                memoized = self._response_memo.get(key)
+                if memoized is not None:
+                    span.memo_hit = True
+                    return memoized
+
+            try:
+                response = await self._request_with_retry(model, contents, config)
+            except Exception as e:
+                recovered = await self._recover_cache(config, e)
+                if recovered is None:
+                    raise
+                response = await self._request_with_retry(model, contents, recovered)
+            span.record_usage(getattr(response, "usage_metadata", None))
+            text = response.text or ""
+
+            if key is not None:
+                self._response_memo.set(key, text)
+            return text
+
+    async def _recover_cache(
+        self,
+        config: dict[str, Any],
+        error: Exception,
+    ) -> Optional[dict[str, Any]]:
+        """失効したキャッシュを参照したリクエストの再実行用の設定を作成
+
+        Returns:
+            再実行に使う設定（回復の対象外の場合は None）
+        """
+        cache_name = config.get("cached_content")
+        if (
+            self._cache_recovery is None
+            or not cache_name
+            or not is_cache_not_found_error(error)
+        ):
+            return None
+        new_name = await self._cache_recovery(cache_name)
+        logger.warning(
+            "Cache %s not found, retrying with %s", cache_name, new_name or "no cache"
+        )
+        return {**config, "cached_content": new_name}
+
+    async def _request_with_retry(
+        self,
+        model: str,
+        contents: str,
+        config: dict[str, Any],
+    ) -> Any:
+        """一時的なエラーを指数バックオフでリトライしながら API を呼び出す
+
+        リトライは RetryPolicy の試行回数・期限と RetryBudget の範囲内で行う。
+
+        Returns:
+            GenerateContentResponse
+        """
+        policy = self._retry_policy
+        started = time.monotonic()
+        self._retry_budget.record_request()
+
+        attempt = 1
+        while True:
+            try:
+                if policy.deadline is None:
+                    return await self._request_hedged(model, contents, config)
+                remaining = policy.deadline - (time.monotonic() - started)
+                async with asyncio.timeout(max(remaining, 0)):
+                    return await self._request_hedged(model, contents, config)
+            except Exception as e:
+                delay = self._retry_delay(model, attempt, started, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _retry_delay(
+        self,
+        model: str,
+        attempt: int,
+        started: float,
+        error: Exception,
+    ) -> Optional[float]:
+        """attempt 回目の試行の失敗をリトライする場合の待機時間を算出
+
+        RetryPolicy の試行回数・期限と RetryBudget の範囲内の一時的なエラーのみ
+        リトライする。リトライする場合はリトライ枠を消費し、トレースに記録する。
+
+        Returns:
+            待機時間（秒）。リトライしない場合は None
+        """
+        policy = self._retry_policy
+        if attempt >= policy.max_attempts or not is_transient_error(error):
+            return None
+        delay = policy.backoff(attempt)
+        if (
+            policy.deadline is not None
+            and time.monotonic() - started + delay >= policy.deadline
+        ):
+            return None
+        if not self._retry_budget.try_spend():
+            logger.warning("Retry budget exhausted for %s: %s", model, error)
+            return None
+        logger.warning(
+            "Transient error from %s (attempt %d/%d), retrying in %.2fs: %s",
+            model,
+            attempt,
+            policy.max_attempts,
+            delay,
+            error,
+        )
+        span = current_call()
+        if span is not None:
+            span.retries += 1
+        return delay
+
+    async def _stream_with_retry(
+        self,
+        model: str,
+        contents: str,
+        config: dict[str, Any],
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        """ストリーミングで API を呼び出す（最初のチャンクまではリトライする）
+
+        最初のチャンクが届くまでのエラーは _request_with_retry と同じ
+        RetryPolicy・RetryBudget でリトライし、失効したキャッシュの参照は
+        キャッシュを再作成して1回だけ再実行する。チャンクを返した後のエラーは
+        重複した出力を避けるためそのまま送出する。ヘッジは行わない。
+
+        Yields:
+            GenerateContentResponse のチャンク
+        """
+        started = time.monotonic()
+        self._retry_budget.record_request()
+        recovered = False
+        attempt = 1
+        while True:
+            streamed = False
+            try:
+                async with self._admit(model, contents) as wait:
+                    span = current_call()
+                    if span is not None:
+                        span.queue_wait += wait
+                    stream = self._backend.generate_content_stream(
+                        model, contents, types.GenerateContentConfig(**config)
+                    )
+                    async for chunk in stream:
+                        streamed = True
+                        yield chunk
+                return
+            except Exception as e:
+                if streamed:
+                    raise
+                if not recovered:
+                    retry_config = await self._recover_cache(config, e)
+                    if retry_config is not None:
+                        config, recovered = retry_config, True
+                        continue
+                delay = self._retry_delay(model, attempt, started, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _request_hedged(
+        self,
+        model: str,
+        contents: str,
+        config: dict[str, Any],
+    ) -> Any:
+        """ヘッジ戦略に従って API を呼び出す
+
+        先行リクエストがヘッジ遅延内に完了しない場合は重複リクエストを送り、
+        先に成功した応答を返す。両方失敗した場合は最後の例外を送出する。
+
+        Returns:
+            GenerateContentResponse
+        """
+        if self._hedge_policy is None:
+            return await self._request_once(model, contents, config)
+
+        tracker = self._latency.setdefault(model, LatencyTracker())
+        delay = self._hedge_policy.delay(tracker)
+        tasks = {asyncio.create_task(self._request_once(model, contents, config))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                logger.debug("Hedging request to %s after %.2fs", model, delay)
+                span = current_call()
+                if span is not None:
+                    span.hedged = True
+                tasks.add(
+                    asyncio.create_task(self._request_once(model, contents, config))
+                )
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            # 敗者のアドミッション枠の解放を待ち、例外も回収する
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _request_once(
+        self,
+        model: str,
+        contents: str,
+        config: dict[str, Any],
+    ) -> Any:
+        """アドミッション制御を経由して API を1回呼び出す
+
+        Returns:
+            GenerateContentResponse
+        """
+        async with self._admit(model, contents) as wait:
+            span = current_call()
+            if span is not None:
+                span.queue_wait += wait
+            started = time.monotonic()
+            response = await self._backend.generate_content(
+                model, contents, types.GenerateContentConfig(**config)
+            )
+            self._latency.setdefault(model, LatencyTracker()).record(
+                time.monotonic() - started
+            )
+        return response
+
+    @asynccontextmanager
+    async def _admit(self, model: str, contents: str) -> AsyncIterator[float]:
+        """アドミッション制御の実行枠を確保（未設定の場合は即時）
+
+        Yields:
+            アドミッションまでの待機時間（秒）
+        """
+        if self._admission is None:
+            yield 0.0
+            return
+        async with self._admission.admit(model, estimate_tokens(contents)) as wait:
+            yield wait
+
     async def close(self) -> None:
         """クライアントリソースをクリーンアップ"""
-        await self._aio_client.aclose()
+        await self._backend.aclose()
 
     async def __aenter__(self) -> "GeminiNativeClient":
         return self
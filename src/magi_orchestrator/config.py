@@ -4,11 +4,29 @@ OrchestratorSettings: MAGI Gemini Orchestrator の設定を管理する。
 環境変数または .env ファイルから設定を読み込む。
 """
 
-from typing import Literal
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from magi_orchestrator.generation import GenerationProfile, build_phase_profiles
+from magi_orchestrator.phases import Phase
+from magi_orchestrator.routing import ModelRouter
+
+
+class ModelRateLimitSettings(BaseModel):
+    """モデルごとの個別流量上限の設定（未知のキーはエラー）
+
+    Attributes:
+        requests_per_minute: 1分あたりのリクエスト数上限（None は無制限）
+        tokens_per_minute: 1分あたりの入力トークン数上限（None は無制限）
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    requests_per_minute: Optional[PositiveInt] = None
+    tokens_per_minute: Optional[PositiveInt] = None
+
 
 class OrchestratorSettings(BaseSettings):
     """MAGI Gemini Orchestrator 設定
@@ -19,9 +37,33 @@ class OrchestratorSettings(BaseSettings):
         api_key: Gemini API Key（必須）
         default_model: デフォルトモデル
         voting_threshold: 投票閾値（majority / unanimous）
+        debate_rounds: 議論のラウンド数（収束判定が有効な場合は上限）
+        debate_convergence_threshold: 議論の収束判定に使う発言の類似度の閾値
+            （None は収束判定なしで debate_rounds まで議論する）
+        debate_context_token_budget: 議論・投票のプロンプトに含めるトランスクリプトの
+            トークン予算（None は無制限）
         cache_ttl_seconds: コンテキストキャッシュ TTL（秒）
+        cache_refresh_margin_seconds: 残り有効期間がこの秒数を下回った
+            コンテキストキャッシュを自動更新で延長する
         timeout: API タイムアウト（秒）
-        max_output_tokens: 最大出力トークン数
+        max_output_tokens: 全フェーズ共通の最大出力トークン数
+        generation_profiles: フェーズ名 -> {"max_output_tokens", "temperature",
+            "stop_sequences", "thinking_budget"} のフェーズ別生成プロファイル
+            （JSON で指定、max_output_tokens・組み込みの既定値より優先）
+        routing_phase_models: フェーズ名 -> モデル名（JSON で指定）
+        routing_long_context_tokens: この推定トークン数以上のコンテキストでは
+            routing_long_context_model を使う（None は無効）
+        routing_long_context_model: 長いコンテキスト用のモデル名
+        routing_tiers: 軽量 -> 高性能の順のモデル名（JSON で指定、エスカレーション先）
+        routing_escalate_on_split: 投票が割れた場合に上位のモデルで再投票する
+        max_concurrent_requests: API リクエストの同時実行数上限
+        requests_per_minute: モデルごとの RPM 上限（None は無制限）
+        tokens_per_minute: モデルごとの入力 TPM 上限（None は無制限）
+        model_rate_limits: モデル名 -> {"requests_per_minute", "tokens_per_minute"}
+            の個別上限（JSON で指定）
+        retry_max_attempts: 一時的なエラー時の最大試行回数（初回を含む）
+        retry_deadline_seconds: 1リクエストあたりのリトライ期限（秒）
+        hedge_requests: 遅いリクエストに重複リクエストを送るか
     """
 
     model_config = SettingsConfigDict(
@@ -43,6 +85,18 @@ class OrchestratorSettings(BaseSettings):
         default="majority",
         description="投票閾値",
     )
+    debate_rounds: int = Field(default=1, ge=1, description="議論のラウンド数")
+    debate_convergence_threshold: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="議論の収束判定の類似度閾値",
+    )
+    debate_context_token_budget: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="議論のトランスクリプトのトークン予算",
+    )
 
     # キャッシュ設定
     cache_ttl_seconds: int = Field(
@@ -50,6 +104,11 @@ class OrchestratorSettings(BaseSettings):
         ge=60,
         description="コンテキストキャッシュ TTL（秒）",
     )
+    cache_refresh_margin_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="コンテキストキャッシュを延長する残り有効期間（秒）",
+    )
 
     # 生成設定
     max_output_tokens: int = Field(
@@ -58,6 +117,99 @@ class OrchestratorSettings(BaseSettings):
         le=8192,
         description="最大出力トークン数",
     )
+    generation_profiles: Dict[Phase, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="フェーズ別の生成プロファイル",
+    )
+
+    # モデルルーティング設定
+    routing_phase_models: Dict[Phase, str] = Field(
+        default_factory=dict,
+        description="フェーズ別のモデル",
+    )
+    routing_long_context_tokens: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="長いコンテキスト用のモデルに切り替えるトークン数",
+    )
+    routing_long_context_model: Optional[str] = Field(
+        default=None,
+        description="長いコンテキスト用のモデル",
+    )
+    routing_tiers: List[str] = Field(
+        default_factory=list,
+        description="エスカレーションのモデル段（軽量 -> 高性能）",
+    )
+    routing_escalate_on_split: bool = Field(
+        default=True,
+        description="投票が割れた場合に上位のモデルで再投票するか",
+    )
+
+    # 流量制御設定
+    max_concurrent_requests: Optional[int] = Field(
+        default=32,
+        ge=1,
+        description="API リクエストの同時実行数上限",
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="モデルごとの RPM 上限",
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="モデルごとの入力 TPM 上限",
+    )
+    model_rate_limits: Dict[str, ModelRateLimitSettings] = Field(
+        default_factory=dict,
+        description="モデルごとの個別流量上限",
+    )
+
+    # リトライ設定
+    retry_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="一時的なエラー時の最大試行回数",
+    )
+    retry_deadline_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="1リクエストあたりのリトライ期限（秒）",
+    )
+    hedge_requests: bool = Field(
+        default=False,
+        description="遅いリクエストに重複リクエストを送るか",
+    )
+
+    @field_validator("generation_profiles")
+    @classmethod
+    def _validate_generation_profiles(
+        cls, value: Dict[Phase, Dict[str, Any]]
+    ) -> Dict[Phase, Dict[str, Any]]:
+        for profile in value.values():
+            GenerationProfile.from_dict(profile)
+        return value
+
+    def phase_profiles(self) -> Dict[Phase, GenerationProfile]:
+        """MagiOrchestrator の generation_profiles に渡すプロファイルを返す"""
+        return build_phase_profiles(self.max_output_tokens, self.generation_profiles)
+
+    def model_router(self) -> Optional[ModelRouter]:
+        """ルーティング設定から ModelRouter を作成（未設定の場合は None）"""
+        if not (
+            self.routing_phase_models
+            or self.routing_long_context_model
+            or self.routing_tiers
+        ):
+            return None
+        return ModelRouter(
+            phase_models=dict(self.routing_phase_models),
+            long_context_tokens=self.routing_long_context_tokens,
+            long_context_model=self.routing_long_context_model,
+            tiers=list(self.routing_tiers),
+            escalate_on_split=self.routing_escalate_on_split,
+        )
 
     def dump_masked(self) -> dict:
         """機微情報をマスクした設定を返却する"""
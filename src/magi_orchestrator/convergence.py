@@ -0,0 +1,85 @@
+"""議論の収束判定
+
+複数ラウンドの議論を、追加の API 呼び出しなしで打ち切るための安価な指標。
+
+    - 暫定スタンス: 各エージェントが発言の末尾に記載する "STANCE: ..." 行
+    - ラウンド間の類似度: 同じエージェントの前ラウンドの発言との文字 bigram の Jaccard 係数
+
+全エージェントの暫定スタンスが一致した場合、または全エージェントの
+暫定スタンスが前ラウンドから変わらず発言の類似度が閾値以上の場合に収束とみなす。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Mapping, Optional, Set
+
+from magi.models import Vote
+
+# 議論の発言に暫定スタンスを記載させる指示
+STANCE_INSTRUCTION = """最後の行に、現時点での立場を以下の形式で記載してください：
+STANCE: [APPROVE または DENY または CONDITIONAL]"""
+
+_STANCE_PATTERN = re.compile(r"STANCE:\s*(APPROVE|DENY|CONDITIONAL)", re.IGNORECASE)
+
+
+def parse_stance(text: str) -> Optional[Vote]:
+    """発言から暫定スタンスを取得
+
+    Args:
+        text: エージェントの発言
+
+    Returns:
+        最後に記載されたスタンス（記載がない場合は None）
+    """
+    matches = _STANCE_PATTERN.findall(text)
+    if not matches:
+        return None
+    return Vote[matches[-1].upper()]
+
+
+def _bigrams(text: str) -> Set[str]:
+    normalized = " ".join(text.split()).lower()
+    return {normalized[i : i + 2] for i in range(len(normalized) - 1)}
+
+
+def text_similarity(a: str, b: str) -> float:
+    """2つの発言の類似度（文字 bigram 集合の Jaccard 係数、0.0〜1.0）
+
+    分かち書きのない日本語でも使えるよう、単語ではなく文字 bigram で比較する。
+    """
+    left, right = _bigrams(a), _bigrams(b)
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def has_converged(
+    previous: Optional[Mapping[str, str]],
+    current: Mapping[str, str],
+    similarity_threshold: float,
+) -> bool:
+    """議論が収束したか判定
+
+    Args:
+        previous: 前ラウンドのエージェント名 -> 発言（最初のラウンドは None）
+        current: 現ラウンドのエージェント名 -> 発言
+        similarity_threshold: スタンスが変わらない場合に収束とみなす類似度の下限
+
+    Returns:
+        収束した場合 True
+    """
+    stances: Dict[str, Optional[Vote]] = {
+        agent: parse_stance(text) for agent, text in current.items()
+    }
+    if not stances or None in stances.values():
+        return False
+    if len(set(stances.values())) == 1:
+        return True
+    if previous is None or set(previous) != set(current):
+        return False
+    return all(
+        parse_stance(previous[agent]) == stances[agent]
+        and text_similarity(previous[agent], current[agent]) >= similarity_threshold
+        for agent in current
+    )
@@ -0,0 +1,67 @@
+"""ストリーミングイベント
+
+MagiOrchestrator.consult_stream が返すイベントを定義する。
+
+イベント:
+    AgentChunk: エージェントの出力チャンク（トークン到着ごと）
+    PhaseComplete: フェーズ完了（パース済みの結果を含む）
+    ConsultComplete: 合議完了（最終結果を含む）
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from magi.models import ConsensusResult, PersonaType
+
+from magi_orchestrator.phases import Phase
+
+
+@dataclass
+class AgentChunk:
+    """エージェントの出力チャンク
+
+    Attributes:
+        phase: フェーズ
+        persona_type: 出力元のペルソナタイプ
+        text: テキストチャンク
+        round_number: 議論ラウンド番号（Debate Phase のみ）
+    """
+
+    phase: Phase
+    persona_type: PersonaType
+    text: str
+    round_number: Optional[int] = None
+
+
+@dataclass
+class PhaseComplete:
+    """フェーズ完了イベント
+
+    Attributes:
+        phase: 完了したフェーズ
+        results: フェーズの結果
+            - THINKING: Dict[PersonaType, ThinkingOutput]
+            - DEBATE: DebateRound（ラウンドごとに発行）
+            - VOTING: Dict[PersonaType, VoteOutput]
+        round_number: 議論ラウンド番号（Debate Phase のみ）
+    """
+
+    phase: Phase
+    results: Any
+    round_number: Optional[int] = None
+
+
+@dataclass
+class ConsultComplete:
+    """合議完了イベント
+
+    Attributes:
+        result: 合議プロセスの結果
+    """
+
+    result: ConsensusResult
+
+
+ConsultEvent = Union[AgentChunk, PhaseComplete, ConsultComplete]
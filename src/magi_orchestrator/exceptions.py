@@ -0,0 +1,33 @@
+"""例外定義"""
+
+from __future__ import annotations
+
+from magi.models import PersonaType
+
+
+class MagiOrchestratorError(Exception):
+    """MAGI Gemini Orchestrator の基底例外"""
+
+
+class VotingError(MagiOrchestratorError):
+    """投票の生成に失敗した
+
+    API エラーを CONDITIONAL 票として扱わないために送出する。
+    チェックポイントを使用している場合は resume で投票から再実行できる。
+
+    Attributes:
+        persona_type: 投票に失敗したペルソナタイプ
+        detail: エラーの詳細
+    """
+
+    def __init__(self, persona_type: PersonaType, detail: str) -> None:
+        self.persona_type = persona_type
+        self.detail = detail
+        super().__init__(f"Voting failed for {persona_type.value.upper()}: {detail}")
+
+
+class QueueFullError(MagiOrchestratorError):
+    """常駐サービスのジョブキューが満杯
+
+    HTTP API では 503 Service Unavailable として返す。
+    """
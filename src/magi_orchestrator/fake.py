@@ -0,0 +1,253 @@
+"""オフライン用の疑似 Gemini バックエンド
+
+ネットワークや API Key なしで GeminiNativeClient / MagiOrchestrator を動かし、
+オーケストレーター自身のオーバーヘッドやスケーラビリティを計測するためのバックエンド。
+
+    - レイテンシ分布（固定 / 一様 / 対数正規）
+    - エラー率（一時的な 503 エラーを送出）
+    - ストリーミングのチャンク分割
+    - 決定論的な投票出力（プロンプトのハッシュから VOTE を決定、JSON モードでは JSON）
+    - 議論の暫定スタンス（プロンプトが要求した場合に vote_policy で STANCE を付与）
+    - 議論の宛先ごとの発言（プロンプトが要求した場合に TO <名前>: / SUMMARY: で分割）
+
+Example:
+    >>> from magi_orchestrator.fake import FakeBackend, LogNormalLatency
+    >>> backend = FakeBackend(latency=LogNormalLatency(median=0.8, sigma=0.4), seed=42)
+    >>> client = GeminiNativeClient(api_key="fake", backend=backend)
+    >>> result = await MagiOrchestrator(client).consult("この設計は適切ですか？")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional, Sequence
+
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from magi_orchestrator.backends import GenerationBackend
+from magi_orchestrator.rate_limit import estimate_tokens
+
+# 投票プロンプト・暫定スタンス・宛先ごとの発言の要求の判定に使うマーカー
+_VOTE_MARKER = "VOTE:"
+_STANCE_MARKER = "STANCE:"
+_SUMMARY_MARKER = "SUMMARY:"
+_ADDRESSEE_PATTERN = re.compile(r"^TO ([A-Z]+):$", re.MULTILINE)
+_VOTES = ("APPROVE", "DENY", "CONDITIONAL")
+
+
+@dataclass
+class ConstantLatency:
+    """固定レイテンシ
+
+    Attributes:
+        seconds: レイテンシ（秒）
+    """
+
+    seconds: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass
+class UniformLatency:
+    """一様分布のレイテンシ
+
+    Attributes:
+        low: 最小値（秒）
+        high: 最大値（秒）
+    """
+
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass
+class LogNormalLatency:
+    """対数正規分布のレイテンシ（実 API に近いロングテール）
+
+    Attributes:
+        median: 中央値（秒）
+        sigma: 対数の標準偏差（大きいほどテールが重い）
+    """
+
+    median: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+def default_vote_policy(model: str, contents: str, system_instruction: str) -> str:
+    """プロンプトのハッシュから決定論的に投票を選ぶ"""
+    digest = hashlib.sha256(f"{system_instruction}\n{contents}".encode()).digest()
+    return _VOTES[digest[0] % len(_VOTES)]
+
+
+class FakeBackend(GenerationBackend):
+    """ネットワーク不要の疑似 Gemini バックエンド
+
+    Attributes:
+        calls: 呼び出し回数（モデル名ごと）
+        in_flight: 実行中のリクエスト数
+        peak_in_flight: 実行中リクエスト数の最大値
+    """
+
+    def __init__(
+        self,
+        latency: Optional[object] = None,
+        error_rate: float = 0.0,
+        error_codes: Sequence[int] = (503,),
+        response_chars: int = 800,
+        chunk_chars: int = 32,
+        chunk_interval: float = 0.0,
+        vote_policy: Callable[[str, str, str], str] = default_vote_policy,
+        seed: Optional[int] = None,
+    ) -> None:
+        """バックエンドを初期化
+
+        Args:
+            latency: レイテンシ分布（sample(rng) を持つオブジェクト）。
+                ストリーミングでは最初のチャンクまでの時間になる
+            error_rate: リクエストが失敗する確率（0.0〜1.0）
+            error_codes: 失敗時に送出する APIError のステータスコード
+            response_chars: 投票以外の応答の文字数
+            chunk_chars: ストリーミング時の1チャンクの文字数
+            chunk_interval: ストリーミング時のチャンク間隔（秒）
+            vote_policy: (model, contents, system_instruction) から
+                "APPROVE" / "DENY" / "CONDITIONAL" を返す関数
+            seed: 乱数シード（レイテンシ・エラーの再現用）
+        """
+        self._latency = latency or ConstantLatency()
+        self._error_rate = error_rate
+        self._error_codes = tuple(error_codes)
+        self._response_chars = response_chars
+        self._chunk_chars = max(1, chunk_chars)
+        self._chunk_interval = chunk_interval
+        self._vote_policy = vote_policy
+        self._rng = random.Random(seed)
+        self.calls: Counter[str] = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _render(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> str:
+        """プロンプトに対する応答テキストを生成"""
+        system_instruction = str(config.system_instruction or "")
+        if config.response_mime_type == "application/json":
+            vote = self._vote_policy(model, contents, system_instruction)
+            data = {"vote": vote, "reason": f"Simulated vote from {model}."}
+            if vote == "CONDITIONAL":
+                data["conditions"] = ["simulated condition"]
+            return json.dumps(data)
+        if _VOTE_MARKER in contents:
+            vote = self._vote_policy(model, contents, system_instruction)
+            text = f"VOTE: {vote}\nREASON: Simulated vote from {model}."
+            if vote == "CONDITIONAL":
+                text += "\nCONDITIONS: simulated condition"
+            return text
+        seed = hashlib.sha256(f"{system_instruction}\n{contents}".encode()).hexdigest()
+        filler = f"[{model}] simulated analysis {seed[:12]}. "
+        text = (filler * (self._response_chars // len(filler) + 1))[
+            : self._response_chars
+        ]
+        if _SUMMARY_MARKER in contents:
+            # 応答を宛先ごとの発言と要約に等分する
+            addressees = list(dict.fromkeys(_ADDRESSEE_PATTERN.findall(contents)))
+            size = max(1, len(text) // (len(addressees) + 1))
+            sections = [
+                f"TO {name}:\n{text[i * size : (i + 1) * size]}"
+                for i, name in enumerate(addressees)
+            ]
+            sections.append(f"SUMMARY:\n{text[len(addressees) * size :]}")
+            text = "\n".join(sections)
+        if _STANCE_MARKER in contents:
+            stance = self._vote_policy(model, contents, system_instruction)
+            text += f"\nSTANCE: {stance}"
+        return text
+
+    def _response(
+        self,
+        text: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        prompt_tokens = estimate_tokens(contents)
+        output_tokens = estimate_tokens(text)
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=[types.Part(text=text)])
+                )
+            ],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                cached_content_token_count=(
+                    prompt_tokens // 2 if config.cached_content else None
+                ),
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+    def _maybe_fail(self) -> None:
+        if self._error_rate and self._rng.random() < self._error_rate:
+            code = self._rng.choice(self._error_codes)
+            raise genai_errors.APIError(
+                code, {"error": {"code": code, "message": "Simulated failure"}}
+            )
+
+    def _enter(self, model: str) -> None:
+        self.calls[model] += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def generate_content(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        self._enter(model)
+        try:
+            await asyncio.sleep(self._latency.sample(self._rng))
+            self._maybe_fail()
+            text = self._render(model, contents, config)
+            return self._response(text, contents, config)
+        finally:
+            self.in_flight -= 1
+
+    async def generate_content_stream(
+        self,
+        model: str,
+        contents: str,
+        config: types.GenerateContentConfig,
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        self._enter(model)
+        try:
+            await asyncio.sleep(self._latency.sample(self._rng))
+            self._maybe_fail()
+            text = self._render(model, contents, config)
+            for start in range(0, len(text), self._chunk_chars):
+                if start and self._chunk_interval:
+                    await asyncio.sleep(self._chunk_interval)
+                yield self._response(
+                    text[start : start + self._chunk_chars], contents, config
+                )
+        finally:
+            self.in_flight -= 1
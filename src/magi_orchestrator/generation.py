@@ -0,0 +1,126 @@
+"""フェーズごとの生成プロファイル
+
+GenerationProfile: 1フェーズの生成パラメータ（最大出力トークン数・温度・
+停止シーケンス・思考予算）を保持するデータクラス。
+
+リクエストの生成パラメータは以下の順に上書きして決まる（後が優先）。
+
+    1. エージェントの温度（AgentConfig.temperature）
+    2. 組み込みのフェーズ既定値（DEFAULT_PHASE_PROFILES）
+    3. オーケストレーターのフェーズ別プロファイル（OrchestratorSettings など）
+    4. エージェントのフェーズ別プロファイル（AgentConfig.generation）
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, List, Mapping, Optional
+
+from google.genai import types
+
+from magi_orchestrator.phases import Phase
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """生成パラメータ（None の項目は上書きしない）
+
+    Attributes:
+        max_output_tokens: 最大出力トークン数（思考モデルでは思考トークンを含む）
+        temperature: 温度パラメータ
+        stop_sequences: 停止シーケンス
+        thinking_budget: 思考トークンの予算（0 で思考なし、-1 で自動）
+    """
+
+    max_output_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    stop_sequences: Optional[List[str]] = None
+    thinking_budget: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.max_output_tokens is not None and self.max_output_tokens < 1:
+            raise ValueError("max_output_tokens must be >= 1")
+        if self.temperature is not None and not 0.0 <= self.temperature <= 2.0:
+            raise ValueError("temperature must be between 0.0 and 2.0")
+        if self.thinking_budget is not None and self.thinking_budget < -1:
+            raise ValueError("thinking_budget must be >= -1")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> GenerationProfile:
+        """設定値（JSON など）からプロファイルを作成
+
+        Raises:
+            ValueError: 未知のキー、または不正な値が含まれる場合
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown generation profile keys: {unknown}")
+        values = dict(data)
+        if values.get("stop_sequences") is not None:
+            values["stop_sequences"] = list(values["stop_sequences"])
+        return cls(**values)
+
+    def merged(self, override: Optional[GenerationProfile]) -> GenerationProfile:
+        """override の None でない項目で上書きしたプロファイルを返す"""
+        if override is None:
+            return self
+        return replace(
+            self,
+            **{
+                f.name: getattr(override, f.name)
+                for f in fields(override)
+                if getattr(override, f.name) is not None
+            },
+        )
+
+    def to_config(self) -> Dict[str, Any]:
+        """GenerateContentConfig の引数（設定された項目のみ）に変換"""
+        config: Dict[str, Any] = {}
+        if self.max_output_tokens is not None:
+            config["max_output_tokens"] = self.max_output_tokens
+        if self.temperature is not None:
+            config["temperature"] = self.temperature
+        if self.stop_sequences:
+            config["stop_sequences"] = list(self.stop_sequences)
+        if self.thinking_budget is not None:
+            config["thinking_config"] = types.ThinkingConfig(
+                thinking_budget=self.thinking_budget
+            )
+        return config
+
+
+# 組み込みのフェーズ既定値。投票は低温度で安定させる。思考モデルでは思考トークンも
+# max_output_tokens に含まれ、上限が小さいと JSON が途中で切れるため出力上限は設けない
+DEFAULT_PHASE_PROFILES: Dict[Phase, GenerationProfile] = {
+    Phase.THINKING: GenerationProfile(),
+    Phase.DEBATE: GenerationProfile(),
+    Phase.VOTING: GenerationProfile(temperature=0.3),
+}
+
+
+def build_phase_profiles(
+    max_output_tokens: Optional[int] = None,
+    overrides: Optional[Mapping[Phase, Mapping[str, Any]]] = None,
+) -> Dict[Phase, GenerationProfile]:
+    """全フェーズ共通の上限とフェーズ別の設定値からプロファイルを作成
+
+    組み込みのフェーズ既定値 < 全フェーズ共通の設定 < フェーズ別の設定
+    の順に上書きする。
+
+    Args:
+        max_output_tokens: 全フェーズ共通の最大出力トークン数
+        overrides: フェーズ -> GenerationProfile の項目の dict
+
+    Returns:
+        フェーズ -> GenerationProfile（オーケストレーターの generation_profiles 形式）
+    """
+    common = GenerationProfile(max_output_tokens=max_output_tokens)
+    profiles: Dict[Phase, GenerationProfile] = {}
+    for phase in Phase:
+        profile = DEFAULT_PHASE_PROFILES[phase].merged(common)
+        values = (overrides or {}).get(phase)
+        if values:
+            profile = profile.merged(GenerationProfile.from_dict(values))
+        profiles[phase] = profile
+    return profiles
@@ -0,0 +1,133 @@
+"""リクエスト単位のレスポンスメモ化
+
+GeminiNativeClient の (model, contents, config) ごとの生成結果を
+バイトサイズ上限付き LRU に保存し、同一リクエストの再実行時に再利用する。
+失敗した合議をリトライする際、成功済みフェーズの API 呼び出しを省略できる。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from magi_orchestrator.result_cache import CacheStats
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps で扱えない設定値を安定した表現に変換"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return repr(value)
+
+
+def make_request_key(model: str, contents: Any, config: Dict[str, Any]) -> str:
+    """リクエストのメモ化キーを生成
+
+    Args:
+        model: モデル名
+        contents: ユーザープロンプト
+        config: GenerateContentConfig の引数（dict）
+
+    Returns:
+        SHA-256 ハッシュ（16進文字列）
+    """
+    payload = {
+        "model": model,
+        "contents": contents,
+        "config": {k: v for k, v in config.items() if v is not None},
+    }
+    encoded = json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, default=_json_default
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseMemo:
+    """バイトサイズ上限付き LRU によるレスポンスメモ
+
+    保存済みテキストの UTF-8 バイト数の合計が max_bytes を超えないよう、
+    最も古く使われたエントリから破棄する。
+
+    Example:
+        >>> memo = ResponseMemo(max_bytes=16 * 1024 * 1024)
+        >>> client = GeminiNativeClient(api_key="...", response_memo=memo)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """メモを初期化
+
+        Args:
+            max_bytes: 保存するテキストの合計バイト数の上限
+            max_entries: 最大エントリ数（None の場合は無制限）
+        """
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._size_bytes = 0
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """保存中のテキストの合計バイト数"""
+        return self._size_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        """メモ済みのテキストを取得
+
+        Args:
+            key: make_request_key で生成したキー
+
+        Returns:
+            生成済みテキスト（存在しない場合は None）
+        """
+        text = self._entries.get(key)
+        if text is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        """生成結果を保存
+
+        単体で max_bytes を超えるテキストは保存しない。
+
+        Args:
+            key: make_request_key で生成したキー
+            text: 生成されたテキスト
+        """
+        size = len(text.encode("utf-8"))
+        if size > self._max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= len(previous.encode("utf-8"))
+
+        self._entries[key] = text
+        self._size_bytes += size
+        while self._size_bytes > self._max_bytes or (
+            self._max_entries is not None and len(self._entries) > self._max_entries
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted.encode("utf-8"))
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        self._entries.clear()
+        self._size_bytes = 0
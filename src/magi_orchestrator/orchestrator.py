@@ -11,9 +11,27 @@ google-genai SDK ネイティブの MAGI オーケストレーター。
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import re
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import combinations_with_replacement
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from magi.models import (
     ConsensusResult,
@@ -28,8 +46,66 @@ from magi.models import (
 )
 
 from magi_orchestrator.agents import ALL_AGENTS, AgentConfig
-from magi_orchestrator.cache import CacheManager
-from magi_orchestrator.client import GeminiNativeClient
+from magi_orchestrator.batch import BatchRun
+from magi_orchestrator.cache import CacheManager, SharedContextCache
+from magi_orchestrator.checkpoint import CheckpointStore, ConsultationCheckpoint
+from magi_orchestrator.client import GeminiNativeClient, is_error_text
+from magi_orchestrator.convergence import STANCE_INSTRUCTION, has_converged
+from magi_orchestrator.events import (
+    AgentChunk,
+    ConsultComplete,
+    ConsultEvent,
+    PhaseComplete,
+)
+from magi_orchestrator.exceptions import VotingError
+from magi_orchestrator.generation import DEFAULT_PHASE_PROFILES, GenerationProfile
+from magi_orchestrator.phases import Phase
+from magi_orchestrator.result_cache import ConsultationCache, make_consultation_key
+from magi_orchestrator.routing import ModelRouter
+from magi_orchestrator.tracing import (
+    ConsultTrace,
+    TraceExporter,
+    current_trace,
+    phase_span,
+    start_trace,
+)
+from magi_orchestrator.transcript import (
+    DebateTranscript,
+    debate_statement,
+    directed_format,
+    parse_debate_response,
+)
+from magi_orchestrator.voting import (
+    VOTE_MIME_TYPE,
+    parse_vote_json,
+    vote_response_schema,
+)
+
+logger = logging.getLogger(__name__)
+
+_DEBATE_LEAD = "以下の議題と、他の賢者の意見を踏まえ、議論を行ってください。"
+_DEBATE_LEAD_SHARED = (
+    "キャッシュ済みの議題と、他の賢者の意見を踏まえ、議論を行ってください。"
+)
+_VOTING_LEAD = "以下の分析結果を踏まえ、元の議題に対して投票してください。"
+_VOTING_LEAD_SHARED = (
+    "キャッシュ済みの分析結果を踏まえ、元の議題に対して投票してください。"
+)
+_VOTING_FORMAT = """【投票形式】
+以下のキーを持つ JSON オブジェクトのみで回答してください：
+
+vote: APPROVE または DENY または CONDITIONAL
+reason: 投票理由を1-2文で簡潔に
+conditions: CONDITIONAL の場合のみ、条件の配列
+
+注意: vote は必ず APPROVE, DENY, CONDITIONAL のいずれか1つを選択してください。"""
+_VOTING_RETRY_NOTE = (
+    "前回の回答は投票形式の JSON として解析できませんでした。"
+    "投票形式の JSON オブジェクトのみで回答してください。"
+)
+_VOTE_SCHEMA = vote_response_schema()
+# JSON モードに対応していない応答向けの従来形式の判定
+_LEGACY_VOTE_PATTERN = re.compile(r"VOTE:\s*(APPROVE|DENY|CONDITIONAL)", re.IGNORECASE)
 
 
 class MagiOrchestrator:
@@ -52,6 +128,17 @@ class MagiOrchestrator:
         cache_manager: Optional[CacheManager] = None,
         voting_threshold: str = "majority",
         agents: Optional[List[AgentConfig]] = None,
+        early_exit_voting: bool = False,
+        result_cache: Optional[ConsultationCache] = None,
+        debate_rounds: int = 1,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        keep_checkpoints: bool = False,
+        trace_exporters: Optional[Sequence[TraceExporter]] = None,
+        shared_context_cache: Optional[SharedContextCache] = None,
+        convergence_threshold: Optional[float] = None,
+        context_token_budget: Optional[int] = None,
+        generation_profiles: Optional[Dict[Phase, GenerationProfile]] = None,
+        router: Optional[ModelRouter] = None,
     ) -> None:
         """オーケストレーターを初期化
 
@@ -60,11 +147,52 @@ class MagiOrchestrator:
             cache_manager: CacheManager インスタンス（オプション）
             voting_threshold: 投票閾値（"majority" または "unanimous"）
             agents: エージェント設定リスト（デフォルトは3賢者）
+            early_exit_voting: 残りの投票で判定が変わらなくなった時点で
+                Voting Phase を打ち切る（未完了の投票はキャンセルされ、
+                voting_results に含まれない）
+            result_cache: 合議結果キャッシュ（オプション）。ヒット時は API を
+                呼び出さずに保存済みの ConsensusResult を返す
+            debate_rounds: 議論のラウンド数（convergence_threshold 指定時は上限）
+            checkpoint_store: チェックポイントストア（オプション）。指定時は
+                フェーズ（議論はラウンド）完了ごとに出力を保存し、resume で再開できる。
+                合議が失敗した場合、送出される例外の consultation_id 属性に合議 ID を設定する
+            keep_checkpoints: 合議の完了後もチェックポイントを残す（デフォルトは削除）
+            trace_exporters: 合議完了時にトレースを渡すエクスポーターのリスト
+            shared_context_cache: 共有コンテキストキャッシュ（オプション）。指定時は
+                議論・投票のトランスクリプトをフェーズごとにキャッシュし、
+                全エージェントが参照する（ペルソナ定義はプロンプトに含めて送信する）
+            convergence_threshold: 議論の収束判定に使う発言の類似度の閾値（0.0〜1.0）。
+                指定時は各エージェントに暫定スタンスを記載させ、スタンスが一致した
+                ラウンド、またはスタンスが変わらず発言の類似度が閾値以上になった
+                ラウンドで議論を打ち切る
+            context_token_budget: 議論・投票のプロンプトに含めるトランスクリプトの
+                トークン予算（オプション）。超過時は直近のラウンドを残して古い
+                ラウンドから要約・省略する
+            generation_profiles: フェーズごとの生成プロファイル（オプション）。
+                組み込みのフェーズ既定値を上書きし、エージェントの
+                AgentConfig.generation で更に上書きされる
+            router: モデルルーター（オプション）。指定時はフェーズ・エージェント・
+                コンテキスト長ごとにモデルを選び、パースできない投票の再実行と
+                割れた投票の再投票を上位のモデルで行う
         """
         self.client = client
         self.cache_manager = cache_manager
+        if cache_manager is not None:
+            # 失効したキャッシュを参照したリクエストはキャッシュを再作成して再実行する
+            client.set_cache_recovery(cache_manager.recover)
         self.voting_threshold = voting_threshold
         self.agents = agents or ALL_AGENTS
+        self.early_exit_voting = early_exit_voting
+        self.result_cache = result_cache
+        self.debate_rounds = debate_rounds
+        self.checkpoint_store = checkpoint_store
+        self.keep_checkpoints = keep_checkpoints
+        self.trace_exporters = list(trace_exporters or [])
+        self.shared_context_cache = shared_context_cache
+        self.convergence_threshold = convergence_threshold
+        self.context_token_budget = context_token_budget
+        self.generation_profiles = dict(generation_profiles or {})
+        self.router = router
 
     async def execute(
         self,
@@ -90,29 +218,378 @@ class MagiOrchestrator:
         # TODO: attachments サポートを将来実装
         return await self.consult(prompt)
 
-    async def consult(self, query: str) -> ConsensusResult:
+    async def consult(
+        self,
+        query: str,
+        consultation_id: Optional[str] = None,
+    ) -> ConsensusResult:
         """3賢者への問い合わせを実行
 
         Args:
             query: ユーザーからの質問/議題
+            consultation_id: チェックポイントの保存に使う合議 ID（省略時は自動生成）
 
         Returns:
             ConsensusResult: 合議プロセスの結果
+
+        Note:
+            checkpoint_store 指定時に合議が失敗した場合、例外の consultation_id
+            属性（自動生成した ID を含む）を resume に渡して再開できる。
         """
+        result, _ = await self.consult_with_trace(query, consultation_id)
+        return result
+
+    async def consult_with_trace(
+        self,
+        query: str,
+        consultation_id: Optional[str] = None,
+    ) -> Tuple[ConsensusResult, ConsultTrace]:
+        """3賢者への問い合わせを実行し、トレースと共に返す
+
+        トレースにはフェーズ・API 呼び出しごとの所要時間、トークン数、
+        リトライ回数、アドミッション待機時間、キャッシュヒットが記録される。
+
+        Args:
+            query: ユーザーからの質問/議題
+            consultation_id: チェックポイントの保存に使う合議 ID（省略時は自動生成）
+
+        Returns:
+            (ConsensusResult, ConsultTrace) のタプル
+
+        Example:
+            >>> result, trace = await orchestrator.consult_with_trace("質問内容")
+            >>> for phase in trace.phases:
+            ...     print(phase.phase, phase.duration)
+            >>> print(trace.prompt_tokens, trace.output_tokens)
+        """
+        consultation_id = consultation_id or uuid.uuid4().hex
+        return await self._traced(
+            consultation_id, lambda: self._consult(query, consultation_id)
+        )
+
+    async def _consult(self, query: str, consultation_id: str) -> ConsensusResult:
+        """合議結果キャッシュを確認してから合議を実行"""
+        cache_key = self._consultation_key(query)
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                trace = current_trace()
+                if trace is not None:
+                    trace.result_cache_hit = True
+                return cached
+
+        checkpoint = ConsultationCheckpoint(
+            consultation_id=consultation_id,
+            query=query,
+        )
+        result = await self._run_consultation(checkpoint)
+        if cache_key is not None:
+            self.result_cache.set(cache_key, result)
+        return result
+
+    async def _traced(
+        self,
+        consultation_id: str,
+        run: Callable[[], Awaitable[ConsensusResult]],
+    ) -> Tuple[ConsensusResult, ConsultTrace]:
+        """トレースを記録しながら合議を実行し、完了後にエクスポートする"""
+        trace: Optional[ConsultTrace] = None
+        try:
+            with start_trace(consultation_id) as trace:
+                result = await run()
+                trace.decision = result.final_decision.value
+        except Exception as e:
+            if self.checkpoint_store is not None:
+                # 自動生成した合議 ID でも resume できるよう例外に付与する
+                e.consultation_id = consultation_id
+                e.add_note(f"Resume with consultation_id={consultation_id!r}")
+            raise
+        finally:
+            if trace is not None:
+                self._export_trace(trace)
+        return result, trace
+
+    def _export_trace(self, trace: ConsultTrace) -> None:
+        """トレースをエクスポート（エクスポーターの失敗は合議に影響させない）"""
+        for exporter in self.trace_exporters:
+            try:
+                exporter.export(trace)
+            except Exception:
+                logger.exception("Trace exporter %s failed", type(exporter).__name__)
+
+    def consult_many(
+        self,
+        queries: Iterable[str],
+        max_concurrency: int = 4,
+    ) -> BatchRun:
+        """複数の問い合わせを並行実行
+
+        同時に進行する合議数を max_concurrency に制限し、全ての合議で
+        同じクライアント（アドミッション制御・キャッシュ）を共有する。
+        ある合議の Voting Phase と別の合議の Thinking Phase は並行して進む。
+
+        Args:
+            queries: 質問/議題の列
+            max_concurrency: 同時に進行する合議数の上限
+
+        Returns:
+            BatchRun: async for で完了順に BatchItem を返す。
+                集計（スループット等）は BatchRun.stats で参照する
+
+        Example:
+            >>> run = orchestrator.consult_many(queries, max_concurrency=8)
+            >>> async for item in run:
+            ...     print(item.index, item.result.final_decision)
+            >>> print(f"{run.stats.throughput:.2f} consults/sec")
+        """
+        return BatchRun(self, queries, max_concurrency=max_concurrency)
+
+    async def resume(self, consultation_id: str) -> ConsensusResult:
+        """チェックポイントから合議を再開
+
+        完了済みのフェーズ（議論はラウンド単位）は保存済みの出力を再利用し、
+        最初の未完了フェーズから実行する。
+
+        Args:
+            consultation_id: 合議 ID
+
+        Returns:
+            ConsensusResult: 合議プロセスの結果
+
+        Raises:
+            ValueError: checkpoint_store が設定されていない場合
+            KeyError: 指定した合議 ID のチェックポイントが存在しない場合
+        """
+        if self.checkpoint_store is None:
+            raise ValueError("checkpoint_store is not configured")
+        checkpoint = self.checkpoint_store.load(consultation_id)
+        if checkpoint is None:
+            raise KeyError(f"Checkpoint not found: {consultation_id}")
+        result, _ = await self._traced(
+            consultation_id, lambda: self._run_consultation(checkpoint)
+        )
+        return result
+
+    async def _run_consultation(
+        self,
+        checkpoint: ConsultationCheckpoint,
+    ) -> ConsensusResult:
+        """チェックポイントの状態から合議を実行
+
+        Args:
+            checkpoint: 合議の途中状態（実行に伴い更新される）
+
+        Returns:
+            ConsensusResult: 合議プロセスの結果
+        """
+        query = checkpoint.query
+
         # Phase 1: Thinking（並列実行）
-        thinking_results = await self._run_thinking_phase(query)
+        if checkpoint.thinking_results is None:
+            with phase_span(Phase.THINKING.value):
+                checkpoint.thinking_results = await self._run_thinking_phase(query)
+            self._save_checkpoint(checkpoint)
+        thinking_results = checkpoint.thinking_results
 
         # Phase 2: Debate（並列実行）
-        debate_results = await self._run_debate_phase(query, thinking_results)
+        debate_results = checkpoint.debate_results
+        # 再開時は完了済みのラウンドから構築し、以降はラウンドごとに追記する
+        transcript = self._new_transcript(thinking_results, debate_results)
+        if not checkpoint.debate_complete:
+            while len(debate_results) < self.debate_rounds:
+                if self._debate_converged(debate_results):
+                    break
+                round_num = len(debate_results) + 1
+                with phase_span(Phase.DEBATE.value, round_num):
+                    debate_round = await self._run_debate_round(
+                        query, thinking_results, debate_results, round_num, transcript
+                    )
+                debate_results.append(debate_round)
+                transcript.add_round(debate_round)
+                self._save_checkpoint(checkpoint)
+            checkpoint.debate_complete = True
+            self._save_checkpoint(checkpoint)
 
         # Phase 3: Voting（並列実行）
-        voting_results = await self._run_voting_phase(
-            query, thinking_results, debate_results
+        if checkpoint.voting_results is None:
+            with phase_span(Phase.VOTING.value):
+                checkpoint.voting_results = await self._run_voting_phase(
+                    query, thinking_results, debate_results, transcript
+                )
+            self._save_checkpoint(checkpoint)
+
+        # Phase 4: Decision
+        result = self._build_consensus_result(
+            thinking_results, debate_results, checkpoint.voting_results
+        )
+        self._delete_checkpoint(checkpoint)
+        return result
+
+    def _save_checkpoint(self, checkpoint: ConsultationCheckpoint) -> None:
+        """チェックポイントストアが設定されていれば保存"""
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.save(checkpoint)
+
+    def _delete_checkpoint(self, checkpoint: ConsultationCheckpoint) -> None:
+        """完了した合議のチェックポイントを削除（keep_checkpoints 指定時は残す）"""
+        if self.checkpoint_store is not None and not self.keep_checkpoints:
+            self.checkpoint_store.delete(checkpoint.consultation_id)
+
+    async def consult_stream(
+        self,
+        query: str,
+        rounds: Optional[int] = None,
+    ) -> AsyncIterator[ConsultEvent]:
+        """3賢者への問い合わせをストリーミング実行
+
+        consult と同じ合議プロセスを実行し、トークン到着ごとに
+        AgentChunk を、各フェーズ（Debate はラウンド）完了時に PhaseComplete を、
+        最後に ConsultComplete を返す。
+
+        合議結果キャッシュ・ルーティング・議論の収束判定は consult と同様に適用するが、
+        以下は適用しない（必要な場合は consult / consult_with_trace を使う）。
+
+        - トレース: ConsultTrace を記録せず、trace_exporters にも渡さない
+        - チェックポイント: checkpoint_store に保存せず、resume で再開できない
+        - 投票の早期終了: early_exit_voting に関わらず全員の投票を最後まで配信する
+
+        Args:
+            query: ユーザーからの質問/議題
+            rounds: 議論のラウンド数（省略時は debate_rounds）
+
+        Yields:
+            ConsultEvent: ストリーミングイベント
+
+        Example:
+            >>> async for event in orchestrator.consult_stream("この設計は適切ですか？"):
+            ...     if isinstance(event, AgentChunk):
+            ...         print(event.text, end="")
+        """
+        if rounds is None:
+            rounds = self.debate_rounds
+
+        # キャッシュヒット時は最終結果のみを返す
+        cache_key = (
+            self._consultation_key(query) if rounds == self.debate_rounds else None
+        )
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                yield ConsultComplete(result=cached)
+                return
+
+        # Phase 1: Thinking
+        texts: List[str] = []
+        async for event in self._stream_phase(
+            Phase.THINKING, self._build_thinking_requests(query), texts
+        ):
+            yield event
+        thinking_results = self._to_thinking_outputs(texts)
+        yield PhaseComplete(phase=Phase.THINKING, results=thinking_results)
+
+        # Phase 2: Debate
+        debate_results: List[DebateRound] = []
+        debate_context = self._new_transcript(thinking_results, debate_results)
+        for round_num in range(1, rounds + 1):
+            if self._debate_converged(debate_results):
+                break
+            context = debate_context.render()
+            directed = self._directed_statements(debate_context)
+            texts = []
+            transcript = self._debate_transcript(query, context)
+            models = self._phase_models(Phase.DEBATE, transcript)
+            async with self._share_context(transcript, models) as shared:
+                async for event in self._stream_phase(
+                    Phase.DEBATE,
+                    self._build_debate_requests(
+                        query, context, shared, directed, models
+                    ),
+                    texts,
+                    round_number=round_num,
+                ):
+                    yield event
+            debate_round = self._to_debate_round(round_num, texts)
+            debate_results.append(debate_round)
+            debate_context.add_round(debate_round)
+            yield PhaseComplete(
+                phase=Phase.DEBATE, results=debate_round, round_number=round_num
+            )
+
+        # Phase 3: Voting
+        context = debate_context.render()
+        vote_prompt = self._vote_prompt(query, context)
+        texts = []
+        transcript = self._voting_transcript(query, context)
+        models = self._phase_models(Phase.VOTING, transcript)
+        async with self._share_context(transcript, models) as shared:
+            requests = self._build_voting_requests(query, context, shared, models)
+            async for event in self._stream_phase(Phase.VOTING, requests, texts):
+                yield event
+            voting_results = await self._to_voting_outputs(requests, texts, vote_prompt)
+        voting_results = await self._escalate_split_vote(
+            voting_results, requests, vote_prompt
         )
+        yield PhaseComplete(phase=Phase.VOTING, results=voting_results)
 
         # Phase 4: Decision
-        tally = self._tally_votes(voting_results)
-        decision = tally.get_decision(self.voting_threshold)
+        result = self._build_consensus_result(
+            thinking_results, debate_results, voting_results
+        )
+        if cache_key is not None:
+            self.result_cache.set(cache_key, result)
+        yield ConsultComplete(result=result)
+
+    async def _stream_phase(
+        self,
+        phase: Phase,
+        requests: List[Dict[str, Any]],
+        texts: List[str],
+        round_number: Optional[int] = None,
+    ) -> AsyncIterator[AgentChunk]:
+        """1フェーズ分のリクエストをストリーミング実行
+
+        Args:
+            phase: フェーズ
+            requests: エージェント順のリクエストリスト
+            texts: エージェントごとの全文を書き込むリスト（出力引数）
+            round_number: 議論ラウンド番号（Debate Phase のみ）
+
+        Yields:
+            AgentChunk: エージェントの出力チャンク
+        """
+        chunks: List[List[str]] = [[] for _ in requests]
+        async for index, text in self.client.generate_concurrent_stream(requests):
+            chunks[index].append(text)
+            yield AgentChunk(
+                phase=phase,
+                persona_type=self.agents[index].persona_type,
+                text=text,
+                round_number=round_number,
+            )
+        texts[:] = ["".join(parts) for parts in chunks]
+
+    def _build_consensus_result(
+        self,
+        thinking_results: Dict[PersonaType, ThinkingOutput],
+        debate_results: List[DebateRound],
+        voting_results: Dict[PersonaType, VoteOutput],
+    ) -> ConsensusResult:
+        """投票結果を集計して ConsensusResult を構築
+
+        Args:
+            thinking_results: Thinking Phase の結果
+            debate_results: Debate Phase の結果
+            voting_results: Voting Phase の結果
+
+        Returns:
+            ConsensusResult: 合議プロセスの結果
+        """
+        decision = self._settled_decision(
+            voting_results, len(self.agents) - len(voting_results)
+        )
+        if decision is None:
+            # 全票が揃っている場合は必ず確定するため、ここには到達しない
+            raise ValueError("Voting results are incomplete and undecided")
         exit_code = self._get_exit_code(decision)
 
         # 条件を収集
@@ -141,6 +618,12 @@ class MagiOrchestrator:
         Returns:
             ペルソナタイプごとの思考結果
         """
+        requests = self._build_thinking_requests(query)
+        results = await self.client.generate_concurrent(requests)
+        return self._to_thinking_outputs(results)
+
+    def _build_thinking_requests(self, query: str) -> List[Dict[str, Any]]:
+        """Thinking Phase のリクエストを構築"""
         thinking_prompt = f"""以下の議題について、あなたの立場から分析してください。
 
 【議題】
@@ -153,20 +636,22 @@ class MagiOrchestrator:
 
 明確で構造化された分析を提供してください。"""
 
-        requests = [
-            {
-                "model": agent.model,
-                "contents": thinking_prompt,
-                "config": {
-                    "system_instruction": agent.system_instruction,
-                    "temperature": agent.temperature,
-                    "cached_content": self._get_cache_name(agent),
-                },
-            }
+        models = self._phase_models(Phase.THINKING, query)
+        return [
+            self._build_request(
+                agent,
+                Phase.THINKING,
+                thinking_prompt,
+                model=models[agent.persona_type],
+            )
             for agent in self.agents
         ]
 
-        results = await self.client.generate_concurrent(requests)
+    def _to_thinking_outputs(
+        self,
+        results: List[str],
+    ) -> Dict[PersonaType, ThinkingOutput]:
+        """生成結果を ThinkingOutput に変換"""
         now = datetime.now()
 
         return {
@@ -195,52 +680,156 @@ class MagiOrchestrator:
             議論ラウンドのリスト
         """
         debate_rounds: List[DebateRound] = []
+        transcript = self._new_transcript(thinking_results, debate_rounds)
 
         for round_num in range(1, rounds + 1):
-            context = self._build_debate_context(thinking_results, debate_rounds)
-
-            requests = []
-            for agent in self.agents:
-                prompt = self._create_debate_prompt(query, agent.persona_type, context)
-                requests.append(
-                    {
-                        "model": agent.model,
-                        "contents": prompt,
-                        "config": {
-                            "system_instruction": agent.system_instruction,
-                            "temperature": agent.temperature,
-                            "cached_content": self._get_cache_name(agent),
-                        },
-                    }
-                )
+            if self._debate_converged(debate_rounds):
+                break
+            debate_round = await self._run_debate_round(
+                query, thinking_results, debate_rounds, round_num, transcript
+            )
+            debate_rounds.append(debate_round)
+            transcript.add_round(debate_round)
 
+        return debate_rounds
+
+    def _debate_converged(self, debate_rounds: List[DebateRound]) -> bool:
+        """直近のラウンドで議論が収束したか判定（収束判定が無効の場合は常に False）
+
+        Args:
+            debate_rounds: 完了済みの議論ラウンド
+
+        Returns:
+            以降のラウンドを省略できる場合 True
+        """
+        if self.convergence_threshold is None or not debate_rounds:
+            return False
+        current = self._round_statements(debate_rounds[-1])
+        previous = (
+            self._round_statements(debate_rounds[-2])
+            if len(debate_rounds) > 1
+            else None
+        )
+        converged = has_converged(previous, current, self.convergence_threshold)
+        if converged:
+            logger.info("Debate converged after %d round(s)", len(debate_rounds))
+        return converged
+
+    def _round_statements(self, round_data: DebateRound) -> Dict[str, str]:
+        """ラウンドのペルソナ名 -> 発言"""
+        return {
+            pt.value: debate_statement(output)
+            for pt, output in round_data.outputs.items()
+        }
+
+    async def _run_debate_round(
+        self,
+        query: str,
+        thinking_results: Dict[PersonaType, ThinkingOutput],
+        previous_rounds: List[DebateRound],
+        round_num: int,
+        transcript: Optional[DebateTranscript] = None,
+    ) -> DebateRound:
+        """議論の1ラウンドを並列実行
+
+        Args:
+            query: 元の質問
+            thinking_results: Thinking Phase の結果
+            previous_rounds: 完了済みの議論ラウンド
+            round_num: ラウンド番号
+            transcript: previous_rounds まで追記済みのトランスクリプト
+                （省略時は thinking_results と previous_rounds から構築）
+
+        Returns:
+            議論ラウンド
+        """
+        if transcript is None:
+            transcript = self._new_transcript(thinking_results, previous_rounds)
+        context = transcript.render()
+        directed = self._directed_statements(transcript)
+        shared_transcript = self._debate_transcript(query, context)
+        models = self._phase_models(Phase.DEBATE, shared_transcript)
+        async with self._share_context(shared_transcript, models) as shared:
+            requests = self._build_debate_requests(
+                query, context, shared, directed, models
+            )
             results = await self.client.generate_concurrent(requests)
-            now = datetime.now()
-
-            round_outputs = {}
-            for agent, result_text in zip(self.agents, results):
-                # 簡易的に、全員へのレスポンスとして同じテキストを割り当てる
-                responses = {}
-                for other_agent in self.agents:
-                    if other_agent.persona_type != agent.persona_type:
-                        responses[other_agent.persona_type] = result_text
-
-                round_outputs[agent.persona_type] = DebateOutput(
-                    persona_type=agent.persona_type,
-                    round_number=round_num,
-                    responses=responses,
-                    timestamp=now,
-                )
+        return self._to_debate_round(round_num, results)
 
-            debate_rounds.append(
-                DebateRound(
-                    round_number=round_num,
-                    outputs=round_outputs,
-                    timestamp=now,
+    def _directed_statements(
+        self, transcript: DebateTranscript
+    ) -> Dict[PersonaType, str]:
+        """エージェントごとの、直前のラウンドで自分に宛てられた発言"""
+        return {
+            agent.persona_type: transcript.render_directed(agent.persona_type)
+            for agent in self.agents
+        }
+
+    def _build_debate_requests(
+        self,
+        query: str,
+        context: str,
+        shared: Optional[Dict[str, str]] = None,
+        directed: Optional[Dict[PersonaType, str]] = None,
+        models: Optional[Dict[PersonaType, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Debate Phase のリクエストを構築
+
+        Args:
+            query: 元の質問
+            context: これまでの議論のコンテキスト（各ラウンドは要約）
+            shared: モデル名 -> 共有コンテキストのキャッシュ名（_share_context の結果）
+            directed: ペルソナタイプ -> 直前のラウンドで宛てられた発言
+            models: ペルソナタイプ -> モデル名（省略時はルーターで選択）
+        """
+        if models is None:
+            models = self._phase_models(
+                Phase.DEBATE, self._debate_transcript(query, context)
+            )
+        requests = []
+        for agent in self.agents:
+            addressed = (directed or {}).get(agent.persona_type, "")
+            model = models[agent.persona_type]
+            shared_cache = (shared or {}).get(model)
+            if shared_cache is not None:
+                prompt = "\n\n".join(
+                    part
+                    for part in (
+                        _DEBATE_LEAD_SHARED,
+                        addressed,
+                        self._debate_instruction(agent.persona_type),
+                    )
+                    if part
                 )
+            else:
+                prompt = self._create_debate_prompt(
+                    query, agent.persona_type, context, addressed
+                )
+            requests.append(
+                self._build_request(agent, Phase.DEBATE, prompt, shared_cache, model)
             )
+        return requests
 
-        return debate_rounds
+    def _to_debate_round(self, round_num: int, results: List[str]) -> DebateRound:
+        """生成結果を宛先ごとに分割して DebateRound に変換"""
+        now = datetime.now()
+
+        round_outputs = {}
+        for agent, result_text in zip(self.agents, results):
+            round_outputs[agent.persona_type] = DebateOutput(
+                persona_type=agent.persona_type,
+                round_number=round_num,
+                responses=parse_debate_response(
+                    result_text, agent.persona_type, self._others(agent.persona_type)
+                ),
+                timestamp=now,
+            )
+
+        return DebateRound(
+            round_number=round_num,
+            outputs=round_outputs,
+            timestamp=now,
+        )
 
     def _build_debate_context(
         self,
@@ -248,48 +837,74 @@ class MagiOrchestrator:
         debate_rounds: List[DebateRound],
     ) -> str:
         """議論用のコンテキストを構築"""
-        parts = []
-
-        # Thinking Phase の結果
-        parts.append("【Thinking Phase Results】")
-        for pt, to in thinking_results.items():
-            parts.append(f"[{pt.value.upper()}]:\n{to.content}\n")
+        return self._new_transcript(thinking_results, debate_rounds).render()
 
-        # 過去の Debate Rounds
-        for round_data in debate_rounds:
-            parts.append(f"【Debate Round {round_data.round_number}】")
-            for pt, output in round_data.outputs.items():
-                # 代表して最初のレスポンスを表示（現在は全て同じため）
-                content = list(output.responses.values())[0] if output.responses else ""
-                parts.append(f"[{pt.value.upper()}]:\n{content}\n")
-
-        return "\n".join(parts)
+    def _new_transcript(
+        self,
+        thinking_results: Dict[PersonaType, ThinkingOutput],
+        debate_rounds: List[DebateRound],
+    ) -> DebateTranscript:
+        """完了済みのラウンドまでを含むトランスクリプトを作成"""
+        return DebateTranscript.from_results(
+            thinking_results, debate_rounds, max_tokens=self.context_token_budget
+        )
 
     def _create_debate_prompt(
-        self, query: str, my_persona: PersonaType, context: str
+        self,
+        query: str,
+        my_persona: PersonaType,
+        context: str,
+        directed: str = "",
     ) -> str:
         """議論用のプロンプトを作成"""
-        return f"""以下の議題と、他の賢者の意見を踏まえ、議論を行ってください。
+        return "\n\n".join(
+            part
+            for part in (
+                _DEBATE_LEAD,
+                self._debate_transcript(query, context),
+                directed,
+                self._debate_instruction(my_persona),
+            )
+            if part
+        )
 
-【議題】
+    def _others(self, my_persona: PersonaType) -> List[PersonaType]:
+        """自分以外のエージェントのペルソナタイプ"""
+        return [
+            agent.persona_type
+            for agent in self.agents
+            if agent.persona_type != my_persona
+        ]
+
+    def _debate_transcript(self, query: str, context: str) -> str:
+        """議論用プロンプトのうち全エージェントで共通の部分"""
+        return f"""【議題】
 {query}
 
 【これまでの議論】
-{context}
+{context}"""
 
-【指示】
+    def _debate_instruction(self, my_persona: PersonaType) -> str:
+        """議論用プロンプトのうちエージェント固有の指示"""
+        instruction = f"""【指示】
 あなたの役割（{my_persona.value.upper()}）に基づき、以下の点について発言してください：
 1. 他の賢者の意見に対する賛成・反対とその理由
 2. 自身の当初の考えの修正や補強
 3. 最終的な合意形成に向けた提案
 
-他の賢者の意見を批判的に検討し、より良い結論を導き出してください。"""
+他の賢者の意見を批判的に検討し、より良い結論を導き出してください。
+
+{directed_format(my_persona, self._others(my_persona))}"""
+        if self.convergence_threshold is None:
+            return instruction
+        return f"{instruction}\n\n{STANCE_INSTRUCTION}"
 
     async def _run_voting_phase(
         self,
         query: str,
         thinking_results: Dict[PersonaType, ThinkingOutput],
         debate_results: List[DebateRound],
+        transcript: Optional[DebateTranscript] = None,
     ) -> Dict[PersonaType, VoteOutput]:
         """Voting Phase: 投票を並列実行
 
@@ -299,55 +914,411 @@ class MagiOrchestrator:
             query: 元の質問
             thinking_results: Thinking Phase の結果
             debate_results: Debate Phase の結果
+            transcript: debate_results まで追記済みのトランスクリプト
+                （省略時は thinking_results と debate_results から構築）
 
         Returns:
             ペルソナタイプごとの投票結果
+
+        Raises:
+            VotingError: リトライ後も投票の生成に失敗した場合
         """
         # 他エージェントの思考と議論をコンテキストとして構築
-        context = self._build_debate_context(thinking_results, debate_results)
+        if transcript is None:
+            transcript = self._new_transcript(thinking_results, debate_results)
+        context = transcript.render()
+        vote_prompt = self._vote_prompt(query, context)
+        shared_transcript = self._voting_transcript(query, context)
+        models = self._phase_models(Phase.VOTING, shared_transcript)
+        async with self._share_context(shared_transcript, models) as shared:
+            requests = self._build_voting_requests(query, context, shared, models)
+
+            if self.early_exit_voting:
+                voting_results = await self._run_voting_early_exit(
+                    requests, vote_prompt
+                )
+            else:
+                results = await self.client.generate_concurrent(requests)
+                voting_results = await self._to_voting_outputs(
+                    requests, results, vote_prompt
+                )
+        return await self._escalate_split_vote(voting_results, requests, vote_prompt)
 
-        vote_prompt = f"""以下の分析結果を踏まえ、元の議題に対して投票してください。
+    async def _run_voting_early_exit(
+        self,
+        requests: List[Dict[str, Any]],
+        vote_prompt: Optional[str] = None,
+    ) -> Dict[PersonaType, VoteOutput]:
+        """完了順に投票を集計し、判定が確定した時点で打ち切る
 
-【元の議題】
+        Args:
+            requests: エージェント順の投票リクエスト
+            vote_prompt: 共有キャッシュを参照しない投票プロンプト（エスカレーション用）
+
+        Returns:
+            判定確定までに得られた投票結果（エージェント順）
+        """
+        received: Dict[PersonaType, VoteOutput] = {}
+        async for index, result in self.client.generate_as_completed(requests):
+            agent = self.agents[index]
+            received[agent.persona_type] = await self._to_vote_output(
+                agent, requests[index], result, vote_prompt
+            )
+            remaining = len(self.agents) - len(received)
+            if remaining and self._settled_decision(received, remaining):
+                break
+
+        return {
+            agent.persona_type: received[agent.persona_type]
+            for agent in self.agents
+            if agent.persona_type in received
+        }
+
+    def _build_voting_requests(
+        self,
+        query: str,
+        context: str,
+        shared: Optional[Dict[str, str]] = None,
+        models: Optional[Dict[PersonaType, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Voting Phase のリクエストを構築
+
+        Args:
+            query: 元の質問
+            context: 各エージェントの分析と議論のコンテキスト
+            shared: モデル名 -> 共有コンテキストのキャッシュ名（_share_context の結果）
+            models: ペルソナタイプ -> モデル名（省略時はルーターで選択）
+        """
+        vote_prompt = self._vote_prompt(query, context)
+        shared_prompt = f"{_VOTING_LEAD_SHARED}\n\n{_VOTING_FORMAT}"
+        if models is None:
+            models = self._phase_models(
+                Phase.VOTING, self._voting_transcript(query, context)
+            )
+
+        requests = []
+        for agent in self.agents:
+            model = models[agent.persona_type]
+            shared_cache = (shared or {}).get(model)
+            prompt = vote_prompt if shared_cache is None else shared_prompt
+            requests.append(
+                self._build_request(agent, Phase.VOTING, prompt, shared_cache, model)
+            )
+        return requests
+
+    def _vote_prompt(self, query: str, context: str) -> str:
+        """共有コンテキストのキャッシュを参照しない投票プロンプト"""
+        return (
+            f"{_VOTING_LEAD}\n\n"
+            f"{self._voting_transcript(query, context)}\n\n"
+            f"{_VOTING_FORMAT}"
+        )
+
+    def _voting_transcript(self, query: str, context: str) -> str:
+        """投票用プロンプトのうち全エージェントで共通の部分"""
+        return f"""【元の議題】
 {query}
 
 【各エージェントの分析と議論】
-{context}
-
-【投票形式】
-以下の形式で厳密に回答してください：
-
-VOTE: [APPROVE または DENY または CONDITIONAL]
-REASON: [投票理由を1-2文で簡潔に]
-CONDITIONS: [CONDITIONAL の場合のみ、条件をカンマ区切りで記載]
-
-注意: VOTE は必ず APPROVE, DENY, CONDITIONAL のいずれか1つを選択してください。"""
-
-        requests = [
-            {
-                "model": agent.model,
-                "contents": vote_prompt,
-                "config": {
-                    "system_instruction": agent.system_instruction,
-                    "temperature": 0.3,  # 投票時は低温度で安定した出力
-                },
-            }
+{context}"""
+
+    def _build_request(
+        self,
+        agent: AgentConfig,
+        phase: Phase,
+        contents: str,
+        shared_cache: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """全フェーズ共通のリクエストを構築
+
+        参照するキャッシュは 共有コンテキストのキャッシュ > ペルソナのキャッシュ
+        の順に選ぶ。cached_content と system_instruction は併用できないため、
+        ペルソナのキャッシュ（システム命令を含む）を参照する場合はシステム命令を送らず、
+        共有コンテキストのキャッシュを参照する場合はペルソナ定義をプロンプトの先頭に含める。
+
+        Args:
+            agent: エージェント設定
+            phase: フェーズ
+            contents: ユーザープロンプト
+            shared_cache: 共有コンテキストのキャッシュ名（オプション）
+            model: 使用するモデル名（省略時は agent.model）。ペルソナのキャッシュも
+                このモデルのものを参照する
+
+        Returns:
+            GeminiNativeClient.generate_concurrent 形式のリクエスト
+        """
+        model = model or agent.model
+        config: Dict[str, Any] = {
+            "temperature": agent.temperature,
+            **self._generation_profile(agent, phase).to_config(),
+        }
+        if phase == Phase.VOTING:
+            # 投票はスキーマで検証される短い JSON として出力させる
+            config["response_mime_type"] = VOTE_MIME_TYPE
+            config["response_schema"] = _VOTE_SCHEMA
+        if shared_cache is not None:
+            contents = f"【あなたのペルソナ】\n{agent.system_instruction}\n\n{contents}"
+            config["cached_content"] = shared_cache
+        else:
+            cache_name = self._get_cache_name(agent, model)
+            if cache_name:
+                config["cached_content"] = cache_name
+            else:
+                config["system_instruction"] = agent.system_instruction
+
+        return {
+            "model": model,
+            "agent": agent.persona_type.value,
+            "contents": contents,
+            "config": config,
+        }
+
+    def _generation_profile(
+        self, agent: AgentConfig, phase: Phase
+    ) -> GenerationProfile:
+        """エージェント・フェーズに適用する生成プロファイルを解決
+
+        組み込みのフェーズ既定値 < オーケストレーターのプロファイル
+        < エージェントのプロファイル の順に上書きする。
+        """
+        return (
+            DEFAULT_PHASE_PROFILES[phase]
+            .merged(self.generation_profiles.get(phase))
+            .merged(agent.generation.get(phase))
+        )
+
+    @asynccontextmanager
+    async def _share_context(
+        self, transcript: str, models: Dict[PersonaType, str]
+    ) -> AsyncIterator[Dict[str, str]]:
+        """フェーズの共有トランスクリプトをキャッシュ（未設定の場合は空）
+
+        Args:
+            transcript: 共有するトランスクリプト
+            models: ペルソナタイプ -> フェーズで使うモデル名
+
+        Yields:
+            モデル名 -> キャッシュ名
+        """
+        if self.shared_context_cache is None:
+            yield {}
+            return
+        async with self.shared_context_cache.share(
+            transcript, models.values()
+        ) as shared:
+            yield shared
+
+    def _phase_models(self, phase: Phase, context: str) -> Dict[PersonaType, str]:
+        """フェーズで各エージェントが使うモデルを選択
+
+        Args:
+            phase: フェーズ
+            context: フェーズの入力（質問、または議論・投票のトランスクリプト）
+
+        Returns:
+            ペルソナタイプ -> モデル名（ルーター未設定の場合は agent.model）
+        """
+        if self.router is None:
+            return {agent.persona_type: agent.model for agent in self.agents}
+        return {
+            agent.persona_type: self.router.route(agent, phase, context)
+            for agent in self.agents
+        }
+
+    def routed_agents(self) -> List[AgentConfig]:
+        """ルーターが使い得る (ペルソナ, モデル) ごとのエージェント設定
+
+        CacheManager.warmup にペルソナのキャッシュを事前作成させるために使う
+        （エスカレーション先のモデルは含めない）。
+        """
+        if self.router is None:
+            return list(self.agents)
+        return [
+            replace(agent, model=model)
             for agent in self.agents
+            for model in self.router.candidate_models(agent)
         ]
 
-        results = await self.client.generate_concurrent(requests)
+    async def _to_voting_outputs(
+        self,
+        requests: List[Dict[str, Any]],
+        results: List[str],
+        vote_prompt: Optional[str] = None,
+    ) -> Dict[PersonaType, VoteOutput]:
+        """生成結果を VoteOutput に変換（パースできない投票は並列に再実行）
 
+        Args:
+            requests: エージェント順の投票リクエスト
+            results: エージェント順の生成結果
+            vote_prompt: 共有キャッシュを参照しない投票プロンプト（エスカレーション用）
+
+        Raises:
+            VotingError: いずれかの投票が API エラー、または再実行後も
+                パースできなかった場合
+        """
+        outputs = await asyncio.gather(
+            *(
+                self._to_vote_output(agent, request, result, vote_prompt)
+                for agent, request, result in zip(self.agents, requests, results)
+            )
+        )
         return {
-            agent.persona_type: self._parse_vote_output(agent.persona_type, result)
-            for agent, result in zip(self.agents, results)
+            agent.persona_type: output for agent, output in zip(self.agents, outputs)
+        }
+
+    async def _to_vote_output(
+        self,
+        agent: AgentConfig,
+        request: Dict[str, Any],
+        raw: str,
+        vote_prompt: Optional[str] = None,
+    ) -> VoteOutput:
+        """API エラーを検出してから投票結果をパース
+
+        JSON としても従来形式としてもパースできない場合は、その旨を
+        プロンプトに追記して1回だけ再実行する（同じリクエストのままでは
+        レスポンスメモから同じ応答が返るため）。ルーターに上位のモデルが
+        ある場合、再実行はそのモデルで行う。
+
+        Args:
+            agent: 投票したエージェント
+            request: 投票リクエスト
+            raw: 生のレスポンステキスト
+            vote_prompt: 共有キャッシュを参照しない投票プロンプト
+                （エスカレーション用、省略時は同じモデルで再実行）
+
+        Raises:
+            VotingError: raw が API エラーだった場合、または再実行後も
+                パースできなかった場合
+        """
+        persona_type = agent.persona_type
+        if is_error_text(raw):
+            raise VotingError(persona_type, raw)
+        vote = self._parse_vote(persona_type, raw)
+        if vote is not None:
+            return vote
+
+        logger.warning("Unparseable vote from %s, retrying", persona_type.value)
+        escalated = self._escalated_vote_request(agent, request, vote_prompt)
+        retry = dict(escalated or request)
+        retry["contents"] = f"{retry['contents']}\n\n{_VOTING_RETRY_NOTE}"
+        raw = (await self.client.generate_concurrent([retry]))[0]
+        if is_error_text(raw):
+            raise VotingError(persona_type, raw)
+        vote = self._parse_vote(persona_type, raw)
+        if vote is None:
+            raise VotingError(persona_type, f"Unparseable vote: {raw[:200]}")
+        return vote
+
+    def _escalated_vote_request(
+        self,
+        agent: AgentConfig,
+        request: Dict[str, Any],
+        vote_prompt: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """1つ上の段のモデルで投票をやり直すリクエストを構築
+
+        共有コンテキストのキャッシュはモデルごとに作成されるため、
+        エスカレーション時は vote_prompt（全文）を送る。
+
+        Returns:
+            投票リクエスト（ルーター未設定、または上位のモデルがない場合は None）
+        """
+        if self.router is None or vote_prompt is None:
+            return None
+        model = self.router.escalate(request["model"])
+        if model is None:
+            return None
+        logger.info(
+            "Escalating %s vote from %s to %s",
+            agent.persona_type.value,
+            request["model"],
+            model,
+        )
+        return self._build_request(agent, Phase.VOTING, vote_prompt, model=model)
+
+    async def _escalate_split_vote(
+        self,
+        voting_results: Dict[PersonaType, VoteOutput],
+        requests: List[Dict[str, Any]],
+        vote_prompt: str,
+    ) -> Dict[PersonaType, VoteOutput]:
+        """投票が割れた場合、上位のモデルがあるエージェントだけ再投票する
+
+        ルーターの escalate_on_split が無効、または割れていない場合は
+        voting_results をそのまま返す。エスカレーションは1段のみ行う。
+
+        Args:
+            voting_results: 投票結果
+            requests: エージェント順の投票リクエスト
+            vote_prompt: 共有キャッシュを参照しない投票プロンプト
+
+        Returns:
+            再投票の結果で置き換えた投票結果
+        """
+        if (
+            self.router is None
+            or not self.router.escalate_on_split
+            or not self._panel_split(voting_results)
+        ):
+            return voting_results
+
+        retries: Dict[PersonaType, Tuple[AgentConfig, Dict[str, Any]]] = {}
+        for agent, request in zip(self.agents, requests):
+            if agent.persona_type not in voting_results:
+                continue
+            retry = self._escalated_vote_request(agent, request, vote_prompt)
+            if retry is not None:
+                retries[agent.persona_type] = (agent, retry)
+        if not retries:
+            return voting_results
+
+        results = await self.client.generate_concurrent(
+            [retry for _, retry in retries.values()]
+        )
+        outputs = await asyncio.gather(
+            *(
+                self._to_vote_output(agent, retry, raw)
+                for (agent, retry), raw in zip(retries.values(), results)
+            )
+        )
+        revoted = dict(zip(retries, outputs))
+        return {
+            persona_type: revoted.get(persona_type, vote)
+            for persona_type, vote in voting_results.items()
         }
 
+    def _panel_split(self, voting_results: Dict[PersonaType, VoteOutput]) -> bool:
+        """投票が割れているか判定
+
+        unanimous では1票でも異なる投票がある場合、majority では
+        過半数を得た投票がない場合に割れているとみなす。
+        """
+        counts = Counter(vote.vote for vote in voting_results.values())
+        if len(counts) <= 1:
+            return False
+        if self.voting_threshold == "unanimous":
+            return True
+        return max(counts.values()) * 2 <= len(voting_results)
+
+    def _parse_vote(self, persona_type: PersonaType, raw: str) -> Optional[VoteOutput]:
+        """JSON の投票をパースし、従来形式（VOTE: ...）の応答は正規表現でパース
+
+        Returns:
+            パースされた VoteOutput（どちらの形式でもない場合は None）
+        """
+        vote = parse_vote_json(persona_type, raw)
+        if vote is None and _LEGACY_VOTE_PATTERN.search(raw):
+            vote = self._parse_vote_output(persona_type, raw)
+        return vote
+
     def _parse_vote_output(
         self,
         persona_type: PersonaType,
         raw: str,
     ) -> VoteOutput:
-        """投票結果をパース
+        """従来形式（VOTE: / REASON: / CONDITIONS:）の投票結果をパース
 
         Args:
             persona_type: ペルソナタイプ
@@ -419,6 +1390,38 @@ CONDITIONS: [CONDITIONAL の場合のみ、条件をカンマ区切りで記載]
             conditional_count=conditional_count,
         )
 
+    def _settled_decision(
+        self,
+        voting_results: Dict[PersonaType, VoteOutput],
+        remaining: int,
+    ) -> Optional[Decision]:
+        """残りの投票に関わらず確定している判定を返す
+
+        未投票分のあらゆる投票の組み合わせについて VotingTally.get_decision を
+        評価し、全て同じ判定になる場合のみその判定を返す。
+
+        Args:
+            voting_results: 得られた投票結果
+            remaining: 未投票のエージェント数
+
+        Returns:
+            確定した判定（まだ変わり得る場合は None）
+        """
+        tally = self._tally_votes(voting_results)
+        decisions = set()
+        for pending in combinations_with_replacement(list(Vote), remaining):
+            outcome = VotingTally(
+                approve_count=tally.approve_count + pending.count(Vote.APPROVE),
+                deny_count=tally.deny_count + pending.count(Vote.DENY),
+                conditional_count=(
+                    tally.conditional_count + pending.count(Vote.CONDITIONAL)
+                ),
+            )
+            decisions.add(outcome.get_decision(self.voting_threshold))
+            if len(decisions) > 1:
+                return None
+        return decisions.pop()
+
     def _get_exit_code(self, decision: Decision) -> int:
         """最終判定に対応する終了コードを取得
 
@@ -453,17 +1456,45 @@ CONDITIONS: [CONDITIONAL の場合のみ、条件をカンマ区切りで記載]
                 conditions.extend(vo.conditions)
         return conditions
 
-    def _get_cache_name(self, agent: AgentConfig) -> Optional[str]:
+    def _consultation_key(self, query: str) -> Optional[str]:
+        """合議結果キャッシュのキーを生成
+
+        Args:
+            query: ユーザーからの質問/議題
+
+        Returns:
+            キャッシュキー（result_cache 未設定の場合は None）
+        """
+        if self.result_cache is None:
+            return None
+        return make_consultation_key(
+            query,
+            self.agents,
+            self.voting_threshold,
+            self.debate_rounds,
+            self.generation_profiles,
+            self.router,
+            early_exit_voting=self.early_exit_voting,
+            context_token_budget=self.context_token_budget,
+            convergence_threshold=self.convergence_threshold,
+        )
+
+    def _get_cache_name(
+        self, agent: AgentConfig, model: Optional[str] = None
+    ) -> Optional[str]:
         """エージェントのキャッシュ名を取得
 
         Args:
             agent: エージェント設定
+            model: リクエストに使うモデル名（省略時は agent.model）
 
         Returns:
             キャッシュ名（存在しない場合は None）
         """
-        if agent.cached_content:
+        model = model or agent.model
+        # agent.cached_content は agent.model 用に作成されたキャッシュ
+        if agent.cached_content and model == agent.model:
             return agent.cached_content
         if self.cache_manager:
-            return self.cache_manager.get_cache_name(agent.persona_type.value)
+            return self.cache_manager.get_cache_name(agent.persona_type.value, model)
         return None
@@ -0,0 +1,20 @@
+"""合議フェーズ定義
+
+Phase: 合議プロセスの各フェーズを表す列挙型。
+"""
+
+from enum import Enum
+
+
+class Phase(str, Enum):
+    """合議フェーズ
+
+    Attributes:
+        THINKING: 独立思考フェーズ
+        DEBATE: 議論フェーズ
+        VOTING: 投票フェーズ
+    """
+
+    THINKING = "thinking"
+    DEBATE = "debate"
+    VOTING = "voting"
@@ -0,0 +1,220 @@
+"""アドミッション制御
+
+GeminiNativeClient が送信するリクエストの流量を制御する。
+
+    - 同時実行数の上限（プロセス全体で共有するセマフォ）
+    - モデルごとの RPM（requests per minute）トークンバケット
+    - モデルごとの TPM（tokens per minute）トークンバケット
+
+待機は到着順（FIFO）に処理されるため、大量の合議が同時に走っても
+特定のリクエストだけが待たされ続けることはない。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """テキストのトークン数を概算
+
+    ASCII 文字は約4文字で1トークン、それ以外（日本語など）は1文字1トークンとして数える。
+
+    Args:
+        text: テキスト
+
+    Returns:
+        推定トークン数（1以上）
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return max(1, math.ceil(ascii_chars / 4) + (len(text) - ascii_chars))
+
+
+class TokenBucket:
+    """非同期トークンバケット
+
+    capacity を上限に毎秒 refill_per_second ずつ補充される。
+    acquire の待機者は到着順に処理される。
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """バケットを初期化
+
+        Args:
+            capacity: バケットの容量
+            refill_per_second: 毎秒の補充量
+            clock: 時刻関数（テスト用）
+        """
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: int) -> "TokenBucket":
+        """1分あたりの上限からバケットを作成"""
+        return cls(capacity=limit, refill_per_second=limit / 60)
+
+    @property
+    def available(self) -> float:
+        """現在利用可能なトークン量"""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(
+            self._capacity, self._tokens + elapsed * self._refill_per_second
+        )
+
+    async def acquire(self, amount: float = 1) -> None:
+        """トークンを消費（不足時は補充まで待機）
+
+        容量を超える量は容量に切り詰めて扱う（永久に待機しないため）。
+
+        Args:
+            amount: 消費するトークン量
+        """
+        amount = min(amount, self._capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                shortfall = amount - self._tokens
+                await asyncio.sleep(shortfall / self._refill_per_second)
+
+
+@dataclass
+class ModelRateLimit:
+    """モデルごとの流量上限
+
+    Attributes:
+        requests_per_minute: 1分あたりのリクエスト数上限（None は無制限）
+        tokens_per_minute: 1分あたりの入力トークン数上限（None は無制限）
+    """
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+class AdmissionController:
+    """リクエストのアドミッション制御
+
+    1つのインスタンスを複数のクライアント・合議で共有することで、
+    プロセス全体の流量を制御できる。
+
+    Example:
+        >>> admission = AdmissionController(
+        ...     max_in_flight=16,
+        ...     default_limit=ModelRateLimit(requests_per_minute=60),
+        ... )
+        >>> client = GeminiNativeClient(api_key="...", admission=admission)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        default_limit: Optional[ModelRateLimit] = None,
+        model_limits: Optional[Dict[str, ModelRateLimit]] = None,
+    ) -> None:
+        """アドミッション制御を初期化
+
+        Args:
+            max_in_flight: 同時実行数の上限（None は無制限）
+            default_limit: model_limits に含まれないモデルの流量上限
+            model_limits: モデル名 -> 流量上限
+        """
+        self._semaphore = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight is not None else None
+        )
+        self._default_limit = default_limit or ModelRateLimit()
+        self._model_limits = dict(model_limits or {})
+        self._request_buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._token_buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._model_locks: Dict[str, asyncio.Lock] = {}
+        self._waiting = 0
+        self._in_flight = 0
+
+    @property
+    def waiting(self) -> int:
+        """アドミッション待ちのリクエスト数"""
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        """実行中のリクエスト数"""
+        return self._in_flight
+
+    def _limit_for(self, model: str) -> ModelRateLimit:
+        return self._model_limits.get(model, self._default_limit)
+
+    def _buckets_for(
+        self, model: str
+    ) -> tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        if model not in self._request_buckets:
+            limit = self._limit_for(model)
+            self._request_buckets[model] = (
+                TokenBucket.per_minute(limit.requests_per_minute)
+                if limit.requests_per_minute
+                else None
+            )
+            self._token_buckets[model] = (
+                TokenBucket.per_minute(limit.tokens_per_minute)
+                if limit.tokens_per_minute
+                else None
+            )
+            self._model_locks[model] = asyncio.Lock()
+        return self._request_buckets[model], self._token_buckets[model]
+
+    @asynccontextmanager
+    async def admit(self, model: str, tokens: int = 0) -> AsyncIterator[float]:
+        """リクエストの実行枠を確保
+
+        モデルごとに到着順でレート上限を待ち、その後に同時実行枠を待つ。
+
+        Args:
+            model: モデル名
+            tokens: リクエストの推定入力トークン数
+
+        Yields:
+            アドミッションまでの待機時間（秒）
+        """
+        started = time.monotonic()
+        request_bucket, token_bucket = self._buckets_for(model)
+        self._waiting += 1
+        try:
+            if request_bucket is not None or token_bucket is not None:
+                # RPM と TPM を同じ順序で消費するため、モデル単位で直列化する
+                async with self._model_locks[model]:
+                    if request_bucket is not None:
+                        await request_bucket.acquire(1)
+                    if token_bucket is not None:
+                        await token_bucket.acquire(tokens)
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            yield time.monotonic() - started
+        finally:
+            self._in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
@@ -0,0 +1,327 @@
+"""合議結果キャッシュ
+
+同一の質問・エージェント構成に対する合議結果（ConsensusResult）を保存し、
+再実行時の API 呼び出しを省略する。
+
+バックエンド:
+    InMemoryConsultationCache: TTL 付き LRU（プロセス内）
+    SQLiteConsultationCache: SQLite ファイル（プロセス間・再起動後も共有）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from magi.models import ConsensusResult
+
+from magi_orchestrator.agents import AgentConfig
+from magi_orchestrator.generation import GenerationProfile
+from magi_orchestrator.phases import Phase
+from magi_orchestrator.routing import ModelRouter
+from magi_orchestrator.serialization import (
+    consensus_result_from_dict,
+    consensus_result_to_dict,
+)
+
+# キー生成ロジックを変更した場合はインクリメントする
+CACHE_KEY_VERSION = 3
+
+
+def normalize_query(query: str) -> str:
+    """キャッシュキー用に質問文を正規化
+
+    Unicode NFKC 正規化（全角英数の半角化など）を行い、
+    連続する空白を1つにまとめて前後の空白を除去する。
+
+    Args:
+        query: 質問文
+
+    Returns:
+        正規化された質問文
+    """
+    normalized = unicodedata.normalize("NFKC", query)
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def _profiles_payload(
+    profiles: Mapping[Phase, GenerationProfile],
+) -> Dict[str, Dict[str, Any]]:
+    """生成プロファイルをキー用の dict に変換（未設定の項目は除く）"""
+    return {
+        phase.value: {k: v for k, v in asdict(profile).items() if v is not None}
+        for phase, profile in profiles.items()
+    }
+
+
+def _router_payload(router: Optional[ModelRouter]) -> Optional[Dict[str, Any]]:
+    """モデルルーターをキー用の dict に変換"""
+    if router is None:
+        return None
+    return {
+        "phase_models": {p.value: m for p, m in router.phase_models.items()},
+        "agent_models": {
+            persona.value: {p.value: m for p, m in models.items()}
+            for persona, models in router.agent_models.items()
+        },
+        "long_context_tokens": router.long_context_tokens,
+        "long_context_model": router.long_context_model,
+        "tiers": list(router.tiers),
+        "escalate_on_split": router.escalate_on_split,
+    }
+
+
+def make_consultation_key(
+    query: str,
+    agents: List[AgentConfig],
+    voting_threshold: str,
+    debate_rounds: int,
+    generation_profiles: Optional[Mapping[Phase, GenerationProfile]] = None,
+    router: Optional[ModelRouter] = None,
+    early_exit_voting: bool = False,
+    context_token_budget: Optional[int] = None,
+    convergence_threshold: Optional[float] = None,
+) -> str:
+    """合議結果キャッシュのキーを生成
+
+    Args:
+        query: 質問文
+        agents: エージェント設定リスト
+        voting_threshold: 投票閾値
+        debate_rounds: 議論のラウンド数
+        generation_profiles: オーケストレーターのフェーズ別生成プロファイル
+        router: オーケストレーターのモデルルーター
+        early_exit_voting: 投票の早期打ち切り（打ち切った結果は投票が欠ける）
+        context_token_budget: 議論のトランスクリプトのトークン予算
+        convergence_threshold: 議論の収束判定の類似度閾値
+
+    Returns:
+        SHA-256 ハッシュ（16進文字列）
+    """
+    payload = {
+        "version": CACHE_KEY_VERSION,
+        "query": normalize_query(query),
+        "agents": [
+            {
+                "persona": agent.persona_type.value,
+                "model": agent.model,
+                "temperature": agent.temperature,
+                "system_instruction": agent.system_instruction,
+                "generation": _profiles_payload(agent.generation),
+            }
+            for agent in agents
+        ],
+        "voting_threshold": voting_threshold,
+        "debate_rounds": debate_rounds,
+        "generation": _profiles_payload(generation_profiles or {}),
+        "router": _router_payload(router),
+        "early_exit_voting": early_exit_voting,
+        "context_token_budget": context_token_budget,
+        "convergence_threshold": convergence_threshold,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """キャッシュのヒット/ミス統計
+
+    Attributes:
+        hits: ヒット数
+        misses: ミス数
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（0.0〜1.0）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ConsultationCache:
+    """合議結果キャッシュの基底クラス
+
+    サブクラスは _get / _set / clear を実装する。
+    ヒット/ミスの計数は基底クラスが行う。
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[ConsensusResult]:
+        """キャッシュから合議結果を取得
+
+        Args:
+            key: make_consultation_key で生成したキー
+
+        Returns:
+            ConsensusResult（存在しない・期限切れの場合は None）
+        """
+        result = self._get(key)
+        if result is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return result
+
+    def set(self, key: str, result: ConsensusResult) -> None:
+        """合議結果をキャッシュに保存
+
+        Args:
+            key: make_consultation_key で生成したキー
+            result: 合議結果
+        """
+        self._set(key, result)
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        raise NotImplementedError
+
+    def _get(self, key: str) -> Optional[ConsensusResult]:
+        raise NotImplementedError
+
+    def _set(self, key: str, result: ConsensusResult) -> None:
+        raise NotImplementedError
+
+
+class InMemoryConsultationCache(ConsultationCache):
+    """TTL 付き LRU キャッシュ（プロセス内）
+
+    Example:
+        >>> cache = InMemoryConsultationCache(max_entries=256, ttl_seconds=3600)
+        >>> orchestrator = MagiOrchestrator(client, result_cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: Optional[float] = 3600,
+    ) -> None:
+        """キャッシュを初期化
+
+        Args:
+            max_entries: 最大エントリ数（超過時は最も古く使われたものを破棄）
+            ttl_seconds: 有効期限（秒）。None の場合は無期限
+        """
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        # key -> (有効期限の monotonic 時刻, 結果)
+        self._entries: OrderedDict[str, Tuple[Optional[float], ConsensusResult]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get(self, key: str) -> Optional[ConsensusResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _set(self, key: str, result: ConsensusResult) -> None:
+        expires_at = (
+            time.monotonic() + self._ttl_seconds
+            if self._ttl_seconds is not None
+            else None
+        )
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteConsultationCache(ConsultationCache):
+    """SQLite ファイルによる永続キャッシュ
+
+    複数プロセスや再起動後でも結果を共有できる。
+
+    Example:
+        >>> cache = SQLiteConsultationCache(".magi/consult-cache.db")
+        >>> orchestrator = MagiOrchestrator(client, result_cache=cache)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl_seconds: Optional[float] = 86400,
+    ) -> None:
+        """キャッシュを初期化
+
+        Args:
+            path: SQLite データベースファイルのパス
+            ttl_seconds: 有効期限（秒）。None の場合は無期限
+        """
+        super().__init__()
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS consultations (
+                    key TEXT PRIMARY KEY,
+                    expires_at REAL,
+                    payload TEXT NOT NULL
+                )
+                """)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM consultations")
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        self._conn.close()
+
+    def _get(self, key: str) -> Optional[ConsensusResult]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, payload FROM consultations WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            expires_at, payload = row
+            if expires_at is not None and expires_at <= time.time():
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM consultations WHERE key = ?", (key,)
+                    )
+                return None
+        return consensus_result_from_dict(json.loads(payload))
+
+    def _set(self, key: str, result: ConsensusResult) -> None:
+        expires_at = (
+            time.time() + self._ttl_seconds if self._ttl_seconds is not None else None
+        )
+        payload = json.dumps(consensus_result_to_dict(result), ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO consultations (key, expires_at, payload) "
+                "VALUES (?, ?, ?)",
+                (key, expires_at, payload),
+            )
@@ -0,0 +1,169 @@
+"""リトライとヘッジ
+
+GeminiNativeClient のリクエストに対するリトライ・ヘッジ戦略を提供する。
+
+    - RetryPolicy: 一時的なエラーに対する指数バックオフ（ジッター付き）と期限
+    - RetryBudget: リトライの総量を通常リクエストの一定割合に制限する
+    - HedgePolicy: 遅いリクエストに対して重複リクエストを送り、先着を採用する
+    - LatencyTracker: ヘッジ遅延の算出に使うレイテンシ統計
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from google.genai import errors as genai_errors
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - google-genai が httpx に依存している
+    httpx = None  # type: ignore[assignment]
+
+# リトライ対象の HTTP ステータスコード
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """リトライで回復し得る一時的なエラーか判定
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        一時的なエラーの場合 True
+    """
+    if isinstance(error, genai_errors.APIError):
+        return error.code in TRANSIENT_STATUS_CODES
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """リトライ戦略
+
+    Attributes:
+        max_attempts: 最大試行回数（初回を含む）
+        initial_delay: 初回リトライまでの待機時間（秒）
+        max_delay: 待機時間の上限（秒）
+        multiplier: 待機時間の増加率
+        jitter: True の場合は 0〜算出値の一様乱数で待機する（full jitter）
+        deadline: 初回試行からの期限（秒）。期限を超える待機は行わない
+        budget_ratio: 通常リクエスト1件あたりに積み立てるリトライ枠
+        budget_min_retries: リトライ枠の初期値。積み立ての上限も兼ねるため、
+            枠がこの値を超えて貯まることはない
+    """
+
+    max_attempts: int = 3
+    initial_delay: float = 0.5
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    deadline: Optional[float] = None
+    budget_ratio: float = 0.2
+    budget_min_retries: int = 10
+
+    def backoff(self, retry_number: int) -> float:
+        """retry_number 回目（1始まり）のリトライ前の待機時間を算出"""
+        delay = min(
+            self.max_delay, self.initial_delay * self.multiplier ** (retry_number - 1)
+        )
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class RetryBudget:
+    """リトライ枠
+
+    通常リクエストごとに ratio 分の枠を積み立て、リトライ時に1消費する。
+    枠は min_retries から始まり、min_retries を上限に積み立てる。
+    障害時にリトライが流量を増幅させるのを防ぐ。
+    """
+
+    def __init__(self, ratio: float, min_retries: int) -> None:
+        """リトライ枠を初期化
+
+        Args:
+            ratio: 通常リクエスト1件あたりに積み立てる枠
+            min_retries: 初期枠（積み立ての上限を兼ねる）
+        """
+        self._ratio = ratio
+        self._max_tokens = float(max(min_retries, 1))
+        self._tokens = self._max_tokens
+
+    @property
+    def available(self) -> float:
+        """残りのリトライ枠"""
+        return self._tokens
+
+    def record_request(self) -> None:
+        """通常リクエストを記録して枠を積み立てる"""
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        """リトライ枠を1消費（不足時は False）"""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class LatencyTracker:
+    """直近のレイテンシからパーセンタイルを算出"""
+
+    def __init__(self, window: int = 200) -> None:
+        """トラッカーを初期化
+
+        Args:
+            window: 保持するサンプル数
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """レイテンシを記録"""
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """パーセンタイル値（0.0〜1.0）を取得（サンプルがない場合は None）"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))
+        return ordered[index]
+
+
+@dataclass
+class HedgePolicy:
+    """ヘッジ戦略
+
+    先行リクエストが hedge 遅延内に完了しない場合、同一リクエストを追加送信し、
+    先に成功した応答を採用する（もう一方はキャンセルする）。
+
+    Attributes:
+        percentile: ヘッジ遅延に使うレイテンシのパーセンタイル
+        min_delay: ヘッジ遅延の下限（秒）
+        initial_delay: サンプル不足時のヘッジ遅延（秒）
+        min_samples: パーセンタイルを採用するのに必要なサンプル数
+    """
+
+    percentile: float = 0.95
+    min_delay: float = 0.5
+    initial_delay: float = 10.0
+    min_samples: int = 20
+
+    def delay(self, tracker: LatencyTracker) -> float:
+        """現在のヘッジ遅延を算出"""
+        if len(tracker) < self.min_samples:
+            return self.initial_delay
+        observed = tracker.percentile(self.percentile)
+        return max(self.min_delay, observed if observed is not None else 0.0)
@@ -0,0 +1,98 @@
+"""フェーズごとのモデルルーティング
+
+ModelRouter: リクエストごとに使うモデルを選択し、投票がパースできない場合や
+投票が割れた場合に上位のモデルへエスカレーションするポリシー。
+
+モデルは以下の優先順で選ぶ。
+
+    1. コンテキストが long_context_tokens 以上の場合は long_context_model
+    2. エージェント・フェーズ別のモデル（agent_models）
+    3. フェーズ別のモデル（phase_models）
+    4. エージェントのモデル（AgentConfig.model）
+
+Example:
+    >>> router = ModelRouter(
+    ...     phase_models={Phase.VOTING: "gemini-2.5-flash-lite"},
+    ...     tiers=["gemini-2.5-flash-lite", "gemini-3-flash-preview"],
+    ... )
+    >>> orchestrator = MagiOrchestrator(client, router=router)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from magi.models import PersonaType
+
+from magi_orchestrator.agents import AgentConfig
+from magi_orchestrator.phases import Phase
+from magi_orchestrator.rate_limit import estimate_tokens
+
+
+@dataclass
+class ModelRouter:
+    """モデルの選択とエスカレーションのポリシー
+
+    Attributes:
+        phase_models: フェーズ -> モデル名
+        agent_models: ペルソナタイプ -> {フェーズ -> モデル名}（phase_models より優先）
+        long_context_tokens: コンテキストの推定トークン数がこの値以上の場合に
+            long_context_model を使う（None は無効）
+        long_context_model: 長いコンテキスト用のモデル名
+        tiers: 軽量 -> 高性能の順に並べたモデル名。エスカレーション時は
+            1つ上の段のモデルを使う（段に含まれないモデルはエスカレーションしない）
+        escalate_on_split: 投票が割れた場合に上位のモデルで再投票する
+    """
+
+    phase_models: Dict[Phase, str] = field(default_factory=dict)
+    agent_models: Dict[PersonaType, Dict[Phase, str]] = field(default_factory=dict)
+    long_context_tokens: Optional[int] = None
+    long_context_model: Optional[str] = None
+    tiers: List[str] = field(default_factory=list)
+    escalate_on_split: bool = True
+
+    def route(self, agent: AgentConfig, phase: Phase, context: str) -> str:
+        """リクエストに使うモデルを選択
+
+        Args:
+            agent: エージェント設定
+            phase: フェーズ
+            context: フェーズの入力（質問、または議論・投票のトランスクリプト）
+
+        Returns:
+            モデル名
+        """
+        if (
+            self.long_context_model is not None
+            and self.long_context_tokens is not None
+            and estimate_tokens(context) >= self.long_context_tokens
+        ):
+            return self.long_context_model
+        routed = self.agent_models.get(agent.persona_type, {}).get(phase)
+        return routed or self.phase_models.get(phase) or agent.model
+
+    def escalate(self, model: str) -> Optional[str]:
+        """1つ上の段のモデルを返す
+
+        Returns:
+            上位のモデル名（最上段、または段に含まれないモデルの場合は None）
+        """
+        if model not in self.tiers:
+            return None
+        index = self.tiers.index(model)
+        return self.tiers[index + 1] if index + 1 < len(self.tiers) else None
+
+    def candidate_models(self, agent: AgentConfig) -> List[str]:
+        """エージェントのリクエストがエスカレーションなしで使い得るモデルの一覧
+
+        コンテキストキャッシュの事前作成に使う。
+        """
+        models = [
+            agent.model,
+            *self.agent_models.get(agent.persona_type, {}).values(),
+            *self.phase_models.values(),
+        ]
+        if self.long_context_model is not None and self.long_context_tokens is not None:
+            models.append(self.long_context_model)
+        return list(dict.fromkeys(models))
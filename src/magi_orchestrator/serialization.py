@@ -0,0 +1,142 @@
+"""合議結果のシリアライズ
+
+magi-core のモデル（ThinkingOutput, DebateRound, VoteOutput, ConsensusResult）を
+JSON 互換の dict と相互変換する。永続キャッシュやチェックポイントで使用する。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from magi.models import (
+    ConsensusResult,
+    DebateOutput,
+    DebateRound,
+    Decision,
+    PersonaType,
+    ThinkingOutput,
+    Vote,
+    VoteOutput,
+)
+
+
+def _persona_key(persona: Any) -> str:
+    """PersonaType または文字列のキーを文字列に正規化"""
+    return persona.value if isinstance(persona, PersonaType) else str(persona)
+
+
+def thinking_output_to_dict(output: ThinkingOutput) -> Dict[str, Any]:
+    """ThinkingOutput を dict に変換"""
+    return {
+        "persona_type": output.persona_type.value,
+        "content": output.content,
+        "timestamp": output.timestamp.isoformat(),
+    }
+
+
+def thinking_output_from_dict(data: Dict[str, Any]) -> ThinkingOutput:
+    """dict から ThinkingOutput を復元"""
+    return ThinkingOutput(
+        persona_type=PersonaType(data["persona_type"]),
+        content=data["content"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+    )
+
+
+def debate_round_to_dict(debate_round: DebateRound) -> Dict[str, Any]:
+    """DebateRound を dict に変換"""
+    return {
+        "round_number": debate_round.round_number,
+        "timestamp": debate_round.timestamp.isoformat(),
+        "outputs": {
+            pt.value: {
+                "round_number": output.round_number,
+                "timestamp": output.timestamp.isoformat(),
+                "responses": {
+                    target.value: text for target, text in output.responses.items()
+                },
+            }
+            for pt, output in debate_round.outputs.items()
+        },
+    }
+
+
+def debate_round_from_dict(data: Dict[str, Any]) -> DebateRound:
+    """dict から DebateRound を復元"""
+    outputs = {}
+    for persona, output in data["outputs"].items():
+        persona_type = PersonaType(persona)
+        outputs[persona_type] = DebateOutput(
+            persona_type=persona_type,
+            round_number=output["round_number"],
+            responses={
+                PersonaType(target): text
+                for target, text in output["responses"].items()
+            },
+            timestamp=datetime.fromisoformat(output["timestamp"]),
+        )
+    return DebateRound(
+        round_number=data["round_number"],
+        outputs=outputs,
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+    )
+
+
+def vote_output_to_dict(output: VoteOutput) -> Dict[str, Any]:
+    """VoteOutput を dict に変換"""
+    return {
+        "persona_type": output.persona_type.value,
+        "vote": output.vote.value,
+        "reason": output.reason,
+        "conditions": list(output.conditions) if output.conditions else None,
+    }
+
+
+def vote_output_from_dict(data: Dict[str, Any]) -> VoteOutput:
+    """dict から VoteOutput を復元"""
+    return VoteOutput(
+        persona_type=PersonaType(data["persona_type"]),
+        vote=Vote(data["vote"]),
+        reason=data["reason"],
+        conditions=data.get("conditions"),
+    )
+
+
+def consensus_result_to_dict(result: ConsensusResult) -> Dict[str, Any]:
+    """ConsensusResult を dict に変換"""
+    debate_results: List[DebateRound] = result.debate_results or []
+    return {
+        "thinking_results": {
+            _persona_key(persona): thinking_output_to_dict(output)
+            for persona, output in result.thinking_results.items()
+        },
+        "debate_results": [debate_round_to_dict(r) for r in debate_results],
+        "voting_results": {
+            pt.value: vote_output_to_dict(output)
+            for pt, output in result.voting_results.items()
+        },
+        "final_decision": result.final_decision.value,
+        "exit_code": result.exit_code,
+        "all_conditions": (
+            list(result.all_conditions) if result.all_conditions else None
+        ),
+    }
+
+
+def consensus_result_from_dict(data: Dict[str, Any]) -> ConsensusResult:
+    """dict から ConsensusResult を復元"""
+    return ConsensusResult(
+        thinking_results={
+            persona: thinking_output_from_dict(output)
+            for persona, output in data["thinking_results"].items()
+        },
+        debate_results=[debate_round_from_dict(r) for r in data["debate_results"]],
+        voting_results={
+            PersonaType(persona): vote_output_from_dict(output)
+            for persona, output in data["voting_results"].items()
+        },
+        final_decision=Decision(data["final_decision"]),
+        exit_code=data["exit_code"],
+        all_conditions=data.get("all_conditions"),
+    )
@@ -0,0 +1,369 @@
+"""常駐サービス（HTTP API とジョブキュー）
+
+1つのオーケストレーター（= 共有クライアント・コネクションプール・
+アドミッション制御・事前作成済みのペルソナキャッシュ）で多数の合議を処理する。
+問い合わせごとの設定読み込みやクライアント構築のコストがかからない。
+
+エンドポイント:
+    - GET  /health: 稼働状況（キューの長さ・ワーカー数・ジョブ数）
+    - POST /consult: {"query": ...} を同期的に合議し、ConsensusResult を返す
+    - POST /jobs: {"query": ...} をジョブキューに投入し、ジョブ ID を返す（202）
+    - GET  /jobs/{id}: ジョブの状態（完了時は ConsensusResult を含む）
+
+Example:
+    >>> service = MagiService(orchestrator, workers=8, cache_manager=cache_manager)
+    >>> server = MagiHTTPServer(service, host="0.0.0.0", port=8080)
+    >>> await server.start()
+    >>> await server.serve_forever()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from magi.models import ConsensusResult
+
+from magi_orchestrator.exceptions import QueueFullError
+from magi_orchestrator.serialization import consensus_result_to_dict
+
+if TYPE_CHECKING:
+    from magi_orchestrator.cache import CacheManager
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+
+logger = logging.getLogger(__name__)
+
+# ジョブの状態
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """ジョブキューに投入された合議
+
+    Attributes:
+        id: ジョブ ID
+        query: 質問/議題
+        status: 状態（queued / running / done / failed）
+        result: 合議結果（完了前・失敗時は None）
+        error: エラーメッセージ（失敗時のみ）
+        created_at: 投入時刻（time.time）
+        finished_at: 完了時刻（time.time、未完了は None）
+    """
+
+    id: str
+    query: str
+    status: str = QUEUED
+    result: Optional[ConsensusResult] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 互換の dict に変換"""
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "query": self.query,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if self.result is not None:
+            data["result"] = consensus_result_to_dict(self.result)
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class MagiService:
+    """共有オーケストレーターで合議を処理する常駐サービス
+
+    start でペルソナキャッシュの事前作成・自動更新とワーカーを開始し、
+    stop で停止する。完了したジョブは max_finished_jobs 件まで保持する。
+    """
+
+    def __init__(
+        self,
+        orchestrator: "MagiOrchestrator",
+        workers: int = 4,
+        max_queue: int = 1000,
+        max_finished_jobs: int = 1000,
+        cache_manager: Optional["CacheManager"] = None,
+        cache_ttl_seconds: int = 3600,
+        cache_refresh_interval: float = 60,
+    ) -> None:
+        """サービスを初期化
+
+        Args:
+            orchestrator: 全リクエストで共有するオーケストレーター
+            workers: ジョブキューを処理するワーカー数（同時に進行するジョブ数の上限）
+            max_queue: 待機中のジョブ数の上限（超過時は QueueFullError）
+            max_finished_jobs: 保持する完了済みジョブ数の上限（古いものから破棄）
+            cache_manager: 起動時に事前作成し、稼働中に自動更新する CacheManager
+                （オプション。orchestrator に渡したものと同じインスタンス）
+            cache_ttl_seconds: 事前作成するキャッシュの有効期限（秒）
+            cache_refresh_interval: キャッシュの自動更新の確認間隔（秒）
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.orchestrator = orchestrator
+        self._workers = workers
+        self._max_finished = max_finished_jobs
+        self._cache_manager = cache_manager
+        self._cache_ttl = cache_ttl_seconds
+        self._refresh_interval = cache_refresh_interval
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+
+    async def start(self) -> None:
+        """キャッシュを事前作成し、ワーカーを開始"""
+        if self._cache_manager is not None:
+            report = await self._cache_manager.warmup(
+                self.orchestrator.routed_agents(), ttl_seconds=self._cache_ttl
+            )
+            for key, error in report.failed.items():
+                logger.warning("Cache warmup failed for %s: %s", key, error)
+            self._cache_manager.start_auto_refresh(self._refresh_interval)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self._workers)
+        ]
+
+    async def stop(self) -> None:
+        """ワーカーとキャッシュの自動更新を停止"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._cache_manager is not None:
+            await self._cache_manager.stop_auto_refresh()
+
+    async def consult(self, query: str) -> ConsensusResult:
+        """ジョブキューを経由せずに合議を実行"""
+        return await self.orchestrator.consult(query)
+
+    def submit(self, query: str) -> Job:
+        """合議をジョブキューに投入
+
+        Raises:
+            QueueFullError: 待機中のジョブ数が上限に達している場合
+        """
+        job = Job(id=uuid.uuid4().hex, query=query, created_at=time.time())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("job queue is full") from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """ジョブを取得（未知・破棄済みの場合は None）"""
+        return self._jobs.get(job_id)
+
+    def health(self) -> Dict[str, Any]:
+        """稼働状況"""
+        return {
+            "status": "ok" if self._tasks else "stopped",
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize(),
+            "running": self._running,
+            "jobs": len(self._jobs),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            self._running += 1
+            try:
+                job.result = await self.orchestrator.consult(job.query)
+                job.status = DONE
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = FAILED
+            finally:
+                self._running -= 1
+                job.finished_at = time.time()
+                self._queue.task_done()
+                self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        """完了済みジョブが上限を超えたら古いものから破棄"""
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.status in (DONE, FAILED)
+        ]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MagiHTTPServer:
+    """MagiService を公開する asyncio の HTTP/1.1 サーバー（JSON API）
+
+    リクエストごとに接続を閉じる最小限の実装で、外部の Web フレームワークに依存しない。
+    """
+
+    def __init__(
+        self,
+        service: MagiService,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_body_bytes: int = 1 << 20,
+    ) -> None:
+        """サーバーを初期化
+
+        Args:
+            service: リクエストを処理するサービス
+            host: 待ち受けるホスト
+            port: 待ち受けるポート（0 は空きポート）
+            max_body_bytes: リクエストボディの上限（バイト）
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self._max_body = max_body_bytes
+        self._server: Optional[asyncio.Server] = None
+
+    async def start(self) -> None:
+        """サービスを開始して待ち受けを開始"""
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("MAGI server listening on %s:%d", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """停止されるまで待ち受ける"""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """待ち受けとサービスを停止"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.service.stop()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                status, payload = await self._route(method, path, body)
+            except _HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                logger.exception("Request failed")
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                payload = {"error": f"{type(e).__name__}: {e}"}
+            self._write_response(writer, status, payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+
+        length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                try:
+                    length = int(value.strip())
+                except ValueError:
+                    raise _HTTPError(
+                        HTTPStatus.BAD_REQUEST, "invalid Content-Length"
+                    ) from None
+                if length < 0:
+                    raise _HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length > self._max_body:
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, body
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        if path == "/health":
+            self._require(method, "GET")
+            return HTTPStatus.OK, self.service.health()
+        if path == "/consult":
+            self._require(method, "POST")
+            result = await self.service.consult(self._query(body))
+            return HTTPStatus.OK, consensus_result_to_dict(result)
+        if path == "/jobs":
+            self._require(method, "POST")
+            try:
+                job = self.service.submit(self._query(body))
+            except QueueFullError as e:
+                raise _HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(e)) from None
+            return HTTPStatus.ACCEPTED, job.to_dict()
+        if path.startswith("/jobs/"):
+            self._require(method, "GET")
+            job = self.service.get(path[len("/jobs/") :])
+            if job is None:
+                raise _HTTPError(HTTPStatus.NOT_FOUND, "job not found")
+            return HTTPStatus.OK, job.to_dict()
+        raise _HTTPError(HTTPStatus.NOT_FOUND, "not found")
+
+    @staticmethod
+    def _require(method: str, expected: str) -> None:
+        if method != expected:
+            raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "method not allowed")
+
+    @staticmethod
+    def _query(body: bytes) -> str:
+        """リクエストボディ {"query": ...} から質問を取得"""
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "invalid JSON") from None
+        query = data.get("query") if isinstance(data, dict) else None
+        if not isinstance(query, str) or not query.strip():
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, '"query" is required')
+        return query
+
+    @staticmethod
+    def _write_response(
+        writer: asyncio.StreamWriter, status: HTTPStatus, payload: Dict[str, Any]
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
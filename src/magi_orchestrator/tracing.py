@@ -0,0 +1,426 @@
+"""計測（トレース）
+
+合議ごとのフェーズ・API 呼び出し単位の所要時間とトークン使用量を記録する。
+
+    ConsultTrace: 1回の合議のトレース
+    PhaseSpan: フェーズ（議論はラウンド）単位のスパン
+    CallSpan: API 呼び出し単位のスパン（トークン数・リトライ回数・待機時間など）
+
+記録は contextvars を介して行うため、GeminiNativeClient の呼び出し側で
+スパンを明示的に受け渡す必要はない。エクスポーターは合議の完了時に呼び出される。
+
+    OpenTelemetryExporter: OpenTelemetry のスパンとして出力（opentelemetry-api が必要）
+    PrometheusExporter: Prometheus テキスト形式のカウンタとして集計
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_current_trace: ContextVar[Optional["ConsultTrace"]] = ContextVar(
+    "magi_current_trace", default=None
+)
+_current_phase: ContextVar[Optional["PhaseSpan"]] = ContextVar(
+    "magi_current_phase", default=None
+)
+_current_call: ContextVar[Optional["CallSpan"]] = ContextVar(
+    "magi_current_call", default=None
+)
+
+
+@dataclass
+class CallSpan:
+    """API 呼び出し単位のスパン
+
+    Attributes:
+        model: モデル名
+        agent: 呼び出し元のペルソナ名（不明な場合は None）
+        phase: フェーズ名（フェーズ外の呼び出しは None）
+        started_at: 開始時刻（UNIX 時刻）
+        duration: 所要時間（秒、メモ化ヒット時も含む）
+        queue_wait: アドミッション制御の待機時間の合計（秒）
+        retries: リトライ回数
+        hedged: ヘッジリクエストを送ったか
+        memo_hit: レスポンスメモから返したか
+        streamed: ストリーミング呼び出しか
+        prompt_tokens: 入力トークン数
+        cached_tokens: 入力のうちキャッシュされたトークン数
+        output_tokens: 出力トークン数
+        error: 失敗した場合のエラー内容
+    """
+
+    model: str
+    agent: Optional[str] = None
+    phase: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    queue_wait: float = 0.0
+    retries: int = 0
+    hedged: bool = False
+    memo_hit: bool = False
+    streamed: bool = False
+    prompt_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+    def record_usage(self, usage: Any) -> None:
+        """レスポンスの usage_metadata からトークン数を記録"""
+        if usage is None:
+            return
+        self.prompt_tokens = getattr(usage, "prompt_token_count", None)
+        self.cached_tokens = getattr(usage, "cached_content_token_count", None)
+        self.output_tokens = getattr(usage, "candidates_token_count", None)
+
+
+@dataclass
+class PhaseSpan:
+    """フェーズ単位のスパン
+
+    Attributes:
+        phase: フェーズ名
+        round_number: 議論ラウンド番号（Debate Phase のみ）
+        started_at: 開始時刻（UNIX 時刻）
+        duration: 所要時間（秒）
+        calls: フェーズ内の API 呼び出し
+    """
+
+    phase: str
+    round_number: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    calls: List[CallSpan] = field(default_factory=list)
+
+
+@dataclass
+class ConsultTrace:
+    """1回の合議のトレース
+
+    Attributes:
+        consultation_id: 合議 ID
+        started_at: 開始時刻（UNIX 時刻）
+        duration: 所要時間（秒）
+        phases: フェーズごとのスパン（実行順）
+        result_cache_hit: 合議結果キャッシュから返したか
+        decision: 最終判定（"approved" など、失敗時は None）
+        error: 失敗した場合のエラー内容
+    """
+
+    consultation_id: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    phases: List[PhaseSpan] = field(default_factory=list)
+    result_cache_hit: bool = False
+    decision: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def calls(self) -> List[CallSpan]:
+        """全フェーズの API 呼び出し"""
+        return [call for phase in self.phases for call in phase.calls]
+
+    def _sum(self, attr: str) -> int:
+        return sum(getattr(call, attr) or 0 for call in self.calls)
+
+    @property
+    def prompt_tokens(self) -> int:
+        """入力トークン数の合計"""
+        return self._sum("prompt_tokens")
+
+    @property
+    def cached_tokens(self) -> int:
+        """キャッシュされた入力トークン数の合計"""
+        return self._sum("cached_tokens")
+
+    @property
+    def output_tokens(self) -> int:
+        """出力トークン数の合計"""
+        return self._sum("output_tokens")
+
+    @property
+    def retries(self) -> int:
+        """リトライ回数の合計"""
+        return self._sum("retries")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 互換の dict に変換"""
+        data = asdict(self)
+        data["totals"] = {
+            "calls": len(self.calls),
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "retries": self.retries,
+            "queue_wait": sum(call.queue_wait for call in self.calls),
+        }
+        return data
+
+
+@contextmanager
+def start_trace(consultation_id: Optional[str] = None) -> Iterator[ConsultTrace]:
+    """合議のトレースを開始
+
+    ブロック内で開始したフェーズ・API 呼び出しがこのトレースに記録される。
+    """
+    trace = ConsultTrace(consultation_id=consultation_id)
+    started = time.perf_counter()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        trace.duration = time.perf_counter() - started
+        _current_trace.reset(token)
+
+
+@contextmanager
+def phase_span(phase: str, round_number: Optional[int] = None) -> Iterator[None]:
+    """現在のトレースにフェーズのスパンを記録（トレース外では何もしない）"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    span = PhaseSpan(phase=phase, round_number=round_number)
+    trace.phases.append(span)
+    started = time.perf_counter()
+    token = _current_phase.set(span)
+    try:
+        yield
+    finally:
+        span.duration = time.perf_counter() - started
+        _current_phase.reset(token)
+
+
+@contextmanager
+def call_span(model: str, agent: Optional[str] = None) -> Iterator[CallSpan]:
+    """API 呼び出しのスパンを記録
+
+    現在のフェーズのスパンがあればそこに追加する。
+    ブロック内では current_call() でこのスパンを参照できる。
+    """
+    phase = _current_phase.get()
+    span = CallSpan(
+        model=model,
+        agent=agent,
+        phase=phase.phase if phase is not None else None,
+    )
+    started = time.perf_counter()
+    token = _current_call.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - started
+        _current_call.reset(token)
+        if phase is not None:
+            phase.calls.append(span)
+
+
+def current_trace() -> Optional[ConsultTrace]:
+    """実行中の合議のトレースを取得"""
+    return _current_trace.get()
+
+
+def current_call() -> Optional[CallSpan]:
+    """実行中の API 呼び出しのスパンを取得"""
+    return _current_call.get()
+
+
+def _escape(value: str) -> str:
+    """Prometheus のラベル値をエスケープ"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class TraceExporter:
+    """トレースエクスポーターの基底クラス"""
+
+    def export(self, trace: ConsultTrace) -> None:
+        """完了した合議のトレースを出力"""
+        raise NotImplementedError
+
+
+class OpenTelemetryExporter(TraceExporter):
+    """OpenTelemetry のスパンとして出力
+
+    合議 → フェーズ → API 呼び出し の親子関係でスパンを作成する。
+    トークン数は OpenTelemetry の GenAI セマンティック規約の属性名で記録する。
+
+    Example:
+        >>> from opentelemetry import trace
+        >>> exporter = OpenTelemetryExporter(trace.get_tracer("magi"))
+        >>> orchestrator = MagiOrchestrator(client, trace_exporters=[exporter])
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """エクスポーターを初期化
+
+        Args:
+            tracer: opentelemetry.trace.Tracer（省略時はグローバルの tracer）
+
+        Raises:
+            ImportError: opentelemetry-api がインストールされていない場合
+        """
+        from opentelemetry import trace as otel_trace
+
+        self._otel_trace = otel_trace
+        self._tracer = tracer or otel_trace.get_tracer("magi_orchestrator")
+
+    @staticmethod
+    def _ns(seconds: float) -> int:
+        return int(seconds * 1_000_000_000)
+
+    def export(self, trace: ConsultTrace) -> None:
+        root = self._tracer.start_span(
+            "magi.consult",
+            start_time=self._ns(trace.started_at),
+            attributes={
+                "magi.consultation_id": trace.consultation_id or "",
+                "magi.result_cache_hit": trace.result_cache_hit,
+                "magi.decision": trace.decision or "",
+            },
+        )
+        root_ctx = self._otel_trace.set_span_in_context(root)
+        for phase in trace.phases:
+            phase_attrs: Dict[str, Any] = {"magi.phase": phase.phase}
+            if phase.round_number is not None:
+                phase_attrs["magi.round_number"] = phase.round_number
+            phase_span_ = self._tracer.start_span(
+                f"magi.phase.{phase.phase}",
+                context=root_ctx,
+                start_time=self._ns(phase.started_at),
+                attributes=phase_attrs,
+            )
+            phase_ctx = self._otel_trace.set_span_in_context(phase_span_)
+            for call in phase.calls:
+                attrs: Dict[str, Any] = {
+                    "gen_ai.system": "gemini",
+                    "gen_ai.request.model": call.model,
+                    "magi.agent": call.agent or "",
+                    "magi.retries": call.retries,
+                    "magi.queue_wait": call.queue_wait,
+                    "magi.memo_hit": call.memo_hit,
+                }
+                if call.prompt_tokens is not None:
+                    attrs["gen_ai.usage.input_tokens"] = call.prompt_tokens
+                if call.output_tokens is not None:
+                    attrs["gen_ai.usage.output_tokens"] = call.output_tokens
+                if call.cached_tokens is not None:
+                    attrs["magi.usage.cached_tokens"] = call.cached_tokens
+                span = self._tracer.start_span(
+                    "gen_ai.generate_content",
+                    context=phase_ctx,
+                    start_time=self._ns(call.started_at),
+                    attributes=attrs,
+                )
+                if call.error:
+                    span.set_status(
+                        self._otel_trace.Status(
+                            self._otel_trace.StatusCode.ERROR, call.error
+                        )
+                    )
+                span.end(end_time=self._ns(call.started_at + call.duration))
+            phase_span_.end(end_time=self._ns(phase.started_at + phase.duration))
+        if trace.error:
+            root.set_status(
+                self._otel_trace.Status(self._otel_trace.StatusCode.ERROR, trace.error)
+            )
+        root.end(end_time=self._ns(trace.started_at + trace.duration))
+
+
+class PrometheusExporter(TraceExporter):
+    """Prometheus テキスト形式のカウンタとして集計
+
+    外部ライブラリに依存せずプロセス内で集計し、render() で
+    Prometheus のテキスト形式（/metrics のレスポンス）を返す。
+
+    Example:
+        >>> metrics = PrometheusExporter()
+        >>> orchestrator = MagiOrchestrator(client, trace_exporters=[metrics])
+        >>> print(metrics.render())
+    """
+
+    def __init__(self, namespace: str = "magi") -> None:
+        """エクスポーターを初期化
+
+        Args:
+            namespace: メトリクス名の接頭辞
+        """
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        # (メトリクス名, ラベル) -> 値
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = (
+            defaultdict(float)
+        )
+
+    def _inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = (f"{self._namespace}_{name}", tuple(sorted(labels.items())))
+        self._counters[key] += value
+
+    def export(self, trace: ConsultTrace) -> None:
+        with self._lock:
+            status = "error" if trace.error else "ok"
+            self._inc("consults_total", status=status, decision=trace.decision or "")
+            self._inc("consult_duration_seconds_sum", trace.duration)
+            self._inc("consult_duration_seconds_count")
+            if trace.result_cache_hit:
+                self._inc("result_cache_hits_total")
+            for phase in trace.phases:
+                self._inc(
+                    "phase_duration_seconds_sum", phase.duration, phase=phase.phase
+                )
+                self._inc("phase_duration_seconds_count", phase=phase.phase)
+                for call in phase.calls:
+                    labels = {"model": call.model, "phase": phase.phase}
+                    self._inc(
+                        "api_calls_total",
+                        status="error" if call.error else "ok",
+                        **labels,
+                    )
+                    self._inc("api_call_duration_seconds_sum", call.duration, **labels)
+                    self._inc("api_call_duration_seconds_count", **labels)
+                    self._inc("api_queue_wait_seconds_sum", call.queue_wait, **labels)
+                    self._inc("api_retries_total", call.retries, **labels)
+                    if call.memo_hit:
+                        self._inc("memo_hits_total", **labels)
+                    for kind, value in (
+                        ("prompt", call.prompt_tokens),
+                        ("cached", call.cached_tokens),
+                        ("output", call.output_tokens),
+                    ):
+                        if value:
+                            self._inc("tokens_total", value, kind=kind, **labels)
+
+    def value(self, name: str, **labels: str) -> float:
+        """メトリクスの現在値を取得（テスト・デバッグ用）"""
+        key = (f"{self._namespace}_{name}", tuple(sorted(labels.items())))
+        return self._counters.get(key, 0.0)
+
+    def render(self) -> str:
+        """Prometheus テキスト形式で出力"""
+        lines: List[str] = []
+        declared = set()
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                family = name
+                for suffix in ("_sum", "_count"):
+                    if name.endswith(suffix):
+                        family = name[: -len(suffix)]
+                if family not in declared:
+                    declared.add(family)
+                    kind = "summary" if family != name else "counter"
+                    lines.append(f"# TYPE {family} {kind}")
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}{suffix} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,251 @@
+"""議論のトランスクリプト
+
+議論・投票のプロンプトに含めるトランスクリプト（Thinking Phase の結果と
+議論の各ラウンド）を、ラウンドごとに追記しながら構築する。
+
+議論の発言は他の賢者それぞれに宛てた部分（"TO <名前>:"）と全員に共有する
+要約（"SUMMARY:"）に分けて出力させる。トランスクリプトには各ラウンドの要約を、
+各エージェントのプロンプトには直前のラウンドで自分に宛てられた発言だけを含める。
+
+各セクションのテキストとトークン数は表現ごとに1回だけ算出する。
+トークン予算を指定した場合は、直近のラウンドを残して古いセクションから
+順に要約（既定は各発言の先頭部分への切り詰め）し、それでも超える場合は
+古いセクションから省略する。
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from magi.models import DebateOutput, DebateRound, PersonaType, ThinkingOutput
+
+from magi_orchestrator.rate_limit import estimate_tokens
+
+# セクションの表現の段階
+_FULL, _SUMMARY, _OMITTED = 0, 1, 2
+
+_SECTION_PATTERN = re.compile(
+    r"^[ \t]*(?:TO[ \t]+([A-Za-z]+)|(SUMMARY))[ \t]*:[ \t]*", re.MULTILINE
+)
+
+
+def directed_format(speaker: PersonaType, addressees: Sequence[PersonaType]) -> str:
+    """宛先ごとの発言と要約を出力させる形式の指示"""
+    lines = [
+        "以下の形式で、他の賢者それぞれに宛てた発言と、全員に共有する要約を記載してください："
+    ]
+    for addressee in addressees:
+        name = addressee.value.upper()
+        lines.append(f"TO {name}:\n（{name} の意見に対する賛成・反対とその理由）")
+    lines.append(
+        f"SUMMARY:\n（{speaker.value.upper()} としての現在の立場と提案の要約、3文以内）"
+    )
+    return "\n".join(lines)
+
+
+def parse_debate_response(
+    text: str,
+    speaker: PersonaType,
+    addressees: Sequence[PersonaType],
+) -> Dict[PersonaType, str]:
+    """議論の発言を宛先ごとに分割
+
+    DebateOutput.responses の形式で返す。要約は発言者自身のキーに格納する。
+
+    Args:
+        text: エージェントの発言
+        speaker: 発言者
+        addressees: 宛先となる他のエージェント
+
+    Returns:
+        宛先 -> 宛てた発言（形式に従っていない宛先は含まない）と、発言者 -> 要約。
+        要約がない場合は発言全体を要約とする
+    """
+    names = {pt.value.upper(): pt for pt in addressees}
+    sections: Dict[PersonaType, str] = {}
+    summary: Optional[str] = None
+    matches = list(_SECTION_PATTERN.finditer(text))
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following is not None else len(text)
+        body = text[match.end() : end].strip()
+        if match.group(2):
+            summary = body
+        elif match.group(1).upper() in names and body:
+            sections[names[match.group(1).upper()]] = body
+
+    responses = {pt: sections[pt] for pt in addressees if pt in sections}
+    responses[speaker] = summary if summary else text.strip()
+    return responses
+
+
+def debate_statement(output: DebateOutput) -> str:
+    """議論の出力から全員に共有する発言（要約）を取得
+
+    宛先ごとに分割されていない出力（全員に同じ発言）の場合はその発言を返す。
+    """
+    summary = output.responses.get(output.persona_type)
+    if summary is not None:
+        return summary
+    return next(iter(output.responses.values()), "")
+
+
+def truncate_statement(text: str, max_chars: int = 400) -> str:
+    """発言を先頭 max_chars 文字に切り詰める（既定の要約）"""
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}…（以下省略）"
+
+
+@dataclass
+class _Section:
+    """トランスクリプトの1セクション（見出しと各エージェントの発言）"""
+
+    heading: str
+    statements: List[Tuple[PersonaType, str]]
+    # 表現の段階 -> (テキスト, トークン数)
+    rendered: Dict[int, Tuple[str, int]] = field(default_factory=dict)
+
+
+class DebateTranscript:
+    """ラウンドごとに追記する議論のトランスクリプト
+
+    予算内であれば render() の結果は従来の全文再構築と同じテキストになる。
+
+    Example:
+        >>> transcript = DebateTranscript(max_tokens=8000)
+        >>> transcript.set_thinking(thinking_results)
+        >>> transcript.add_round(debate_round)
+        >>> context = transcript.render()
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        keep_recent_rounds: int = 1,
+        summarizer: Callable[[str], str] = truncate_statement,
+    ) -> None:
+        """トランスクリプトを初期化
+
+        Args:
+            max_tokens: トークン予算（None は無制限）
+            token_counter: テキストのトークン数を返す関数（既定はローカルの推定）
+            keep_recent_rounds: 要約・省略の対象外とする直近のラウンド数
+            summarizer: 古いセクションの発言を要約する関数
+        """
+        self._max_tokens = max_tokens
+        self._count = token_counter
+        self._keep_recent = keep_recent_rounds
+        self._summarize = summarizer
+        self._thinking: Optional[_Section] = None
+        self._rounds: List[_Section] = []
+        self._last_round: Optional[DebateRound] = None
+
+    @classmethod
+    def from_results(
+        cls,
+        thinking_results: Dict[PersonaType, ThinkingOutput],
+        debate_rounds: List[DebateRound],
+        **kwargs: object,
+    ) -> "DebateTranscript":
+        """Thinking Phase の結果と完了済みのラウンドから作成"""
+        transcript = cls(**kwargs)  # type: ignore[arg-type]
+        transcript.set_thinking(thinking_results)
+        for round_data in debate_rounds:
+            transcript.add_round(round_data)
+        return transcript
+
+    @property
+    def round_count(self) -> int:
+        """追記済みのラウンド数"""
+        return len(self._rounds)
+
+    def set_thinking(self, thinking_results: Dict[PersonaType, ThinkingOutput]) -> None:
+        """Thinking Phase の結果を設定"""
+        self._thinking = _Section(
+            heading="【Thinking Phase Results】",
+            statements=[(pt, to.content) for pt, to in thinking_results.items()],
+        )
+
+    def add_round(self, round_data: DebateRound) -> None:
+        """議論のラウンドを追記（トランスクリプトには各エージェントの要約を含める）"""
+        self._last_round = round_data
+        self._rounds.append(
+            _Section(
+                heading=f"【Debate Round {round_data.round_number}】",
+                statements=[
+                    (pt, debate_statement(output))
+                    for pt, output in round_data.outputs.items()
+                ],
+            )
+        )
+
+    def render(self) -> str:
+        """トークン予算内のトランスクリプトを返す"""
+        sections = ([self._thinking] if self._thinking is not None else []) + list(
+            self._rounds
+        )
+        levels = [_FULL] * len(sections)
+        if self._max_tokens is not None:
+            # 直近のラウンド以外を、古いものから順に要約 → 省略
+            degradable = max(0, len(sections) - self._keep_recent)
+            for level in (_SUMMARY, _OMITTED):
+                for index in range(degradable):
+                    if self._total(sections, levels) <= self._max_tokens:
+                        break
+                    levels[index] = level
+        return "\n".join(
+            self._render(section, level)[0] for section, level in zip(sections, levels)
+        )
+
+    def render_directed(self, persona: PersonaType) -> str:
+        """直前のラウンドで persona に宛てられた発言
+
+        Args:
+            persona: 宛先のエージェント
+
+        Returns:
+            宛てられた発言のセクション（ない場合は空文字列）
+        """
+        if self._last_round is None:
+            return ""
+        parts = [
+            f"【Debate Round {self._last_round.round_number}: "
+            f"{persona.value.upper()} 宛ての発言】"
+        ]
+        for pt, output in self._last_round.outputs.items():
+            text = output.responses.get(persona) if pt != persona else None
+            if text:
+                parts.append(f"[{pt.value.upper()}]:\n{text}\n")
+        return "\n".join(parts) if len(parts) > 1 else ""
+
+    def token_count(self) -> int:
+        """render() の結果のトークン数（セクションごとの合計による概算）"""
+        return self._count(self.render())
+
+    def _total(self, sections: List[_Section], levels: List[int]) -> int:
+        return sum(
+            self._render(section, level)[1] for section, level in zip(sections, levels)
+        )
+
+    def _render(self, section: _Section, level: int) -> Tuple[str, int]:
+        cached = section.rendered.get(level)
+        if cached is not None:
+            return cached
+
+        if level == _OMITTED:
+            text = f"{section.heading}\n（省略）\n"
+        else:
+            parts = [section.heading]
+            for pt, statement in section.statements:
+                if level == _SUMMARY:
+                    statement = self._summarize(statement)
+                parts.append(f"[{pt.value.upper()}]:\n{statement}\n")
+            text = "\n".join(parts)
+        # 予算がなければトークン数は不要
+        tokens = self._count(text) if self._max_tokens is not None else 0
+        rendered = (text, tokens)
+        section.rendered[level] = rendered
+        return rendered
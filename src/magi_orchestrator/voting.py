@@ -0,0 +1,90 @@
+"""構造化された投票出力
+
+投票は Gemini の JSON モード（response_mime_type="application/json"）と
+VoteOutput から構築したレスポンススキーマで出力させ、正規表現ではなく
+JSON として検証しながらパースする。
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Optional
+
+from google.genai import types
+from magi.models import PersonaType, Vote, VoteOutput
+
+VOTE_MIME_TYPE = "application/json"
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def vote_response_schema() -> types.Schema:
+    """VoteOutput（persona_type を除く）に対応するレスポンススキーマ
+
+    vote は Vote の名前（APPROVE / DENY / CONDITIONAL）の列挙とする。
+    """
+    return types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "vote": types.Schema(
+                type=types.Type.STRING,
+                enum=[vote.name for vote in Vote],
+                description="投票",
+            ),
+            "reason": types.Schema(
+                type=types.Type.STRING,
+                description="投票理由（1-2文）",
+            ),
+            "conditions": types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(type=types.Type.STRING),
+                description="CONDITIONAL の場合の条件",
+            ),
+        },
+        required=["vote", "reason"],
+        property_ordering=["vote", "reason", "conditions"],
+    )
+
+
+def parse_vote_json(persona_type: PersonaType, raw: str) -> Optional[VoteOutput]:
+    """JSON の投票出力を検証してパース
+
+    Args:
+        persona_type: ペルソナタイプ
+        raw: 生のレスポンステキスト
+
+    Returns:
+        パースされた VoteOutput（JSON として不正、またはスキーマに
+        合わない場合は None）
+    """
+    text = raw.strip()
+    fenced = _CODE_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data: Any = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    vote_name = data.get("vote")
+    reason = data.get("reason")
+    if not isinstance(vote_name, str) or vote_name.upper() not in Vote.__members__:
+        return None
+    if not isinstance(reason, str):
+        return None
+    vote = Vote[vote_name.upper()]
+
+    conditions = None
+    raw_conditions = data.get("conditions")
+    if vote == Vote.CONDITIONAL and isinstance(raw_conditions, list):
+        conditions = [str(c).strip() for c in raw_conditions if str(c).strip()] or None
+
+    return VoteOutput(
+        persona_type=persona_type,
+        vote=vote,
+        reason=reason.strip(),
+        conditions=conditions,
+    )
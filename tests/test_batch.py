@@ -0,0 +1,148 @@
+"""consult_many のユニットテスト"""
+
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+
+from magi.models import Decision
+
+
+def _make_client(delays):
+    """質問ごとの遅延で応答するモッククライアント（同時実行数を記録）"""
+    state = {"active": 0, "peak": 0}
+
+    async def generate_concurrent(requests):
+        contents = requests[0]["contents"]
+        query = next(q for q in delays if f"\n{q}\n" in contents)
+        if query == "boom":
+            raise RuntimeError("boom")
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(delays[query])
+        finally:
+            state["active"] -= 1
+        if "投票してください" in contents:
+            vote = "DENY" if query == "deny-me" else "APPROVE"
+            return [f"VOTE: {vote}\nREASON: r"] * len(requests)
+        return ["text"] * len(requests)
+
+    client = MagicMock()
+    client.generate_concurrent = generate_concurrent
+    return client, state
+
+
+@pytest.mark.asyncio
+class TestConsultMany:
+    """consult_many のテスト"""
+
+    async def test_yields_in_completion_order_with_stats(self):
+        """完了順に結果を返し、スループットを集計する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client, state = _make_client({"slow": 0.05, "fast": 0.0, "deny-me": 0.0})
+        orchestrator = MagiOrchestrator(client)
+
+        run = orchestrator.consult_many(["slow", "fast", "deny-me"], max_concurrency=2)
+        items = [item async for item in run]
+
+        assert [item.query for item in items][-1] == "slow"
+        decisions = {item.query: item.result.final_decision for item in items}
+        assert decisions["deny-me"] == Decision.DENIED
+        assert run.stats.completed == 3
+        assert run.stats.throughput > 0
+        assert state["peak"] <= 2
+
+    async def test_failures_are_reported(self):
+        """失敗した合議は例外付きで返し、他の合議は継続する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client, _ = _make_client({"ok": 0.0, "boom": 0.0})
+        orchestrator = MagiOrchestrator(client)
+
+        run = orchestrator.consult_many(["ok", "boom"])
+        items = [item async for item in run]
+
+        by_query = {item.query: item for item in items}
+        assert by_query["ok"].ok
+        assert isinstance(by_query["boom"].error, RuntimeError)
+        assert run.stats.failed == 1
+
+
+@pytest.mark.asyncio
+class TestRunJsonl:
+    """JSONL バッチのテスト"""
+
+    async def test_streams_results_and_resumes(self, tmp_path):
+        """結果を JSONL に追記し、再実行時は成功済みの ID をスキップする"""
+        import json
+
+        from magi_orchestrator.batch import run_jsonl
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        input_path = tmp_path / "queries.jsonl"
+        input_path.write_text(
+            '{"id": "a", "query": "ok"}\n'
+            '{"id": "b", "query": "boom"}\n'
+            '"deny-me"\n',
+            encoding="utf-8",
+        )
+        output_path = tmp_path / "results.jsonl"
+        client, _ = _make_client({"ok": 0.0, "boom": 0.0, "deny-me": 0.0})
+        orchestrator = MagiOrchestrator(client)
+
+        stats = await run_jsonl(orchestrator, input_path, output_path)
+
+        records = {
+            r["id"]: r
+            for r in map(json.loads, output_path.read_text("utf-8").splitlines())
+        }
+        assert stats.completed == 2 and stats.failed == 1
+        assert records["a"]["result"]["final_decision"] == "approved"
+        assert records["3"]["result"]["final_decision"] == "denied"
+        assert "boom" in records["b"]["error"]
+
+        # 中断時の書きかけの行があっても、失敗した ID だけを再実行する
+        with open(output_path, "a", encoding="utf-8") as f:
+            f.write('{"id": "a", "res')
+        stats = await run_jsonl(orchestrator, input_path, output_path)
+        assert stats.total == 1 and stats.failed == 1
+
+        # 書きかけの行は切り詰めてから追記し、全ての行が JSON として読める
+        output_path.write_text(
+            json.dumps(records["a"]) + "\n" + '{"id": "b", "query": "X", "res',
+            encoding="utf-8",
+        )
+        input_path.write_text(
+            '{"id": "a", "query": "ok"}\n{"id": "b", "query": "deny-me"}\n',
+            encoding="utf-8",
+        )
+        stats = await run_jsonl(orchestrator, input_path, output_path)
+        lines = [
+            json.loads(line) for line in output_path.read_text("utf-8").splitlines()
+        ]
+        assert stats.total == 1 and stats.completed == 1
+        assert sorted(record["id"] for record in lines) == ["a", "b"]
+
+        # 末尾の改行だけが欠けた行も書きかけとして扱い、その ID を再実行する
+        output_path.write_text(
+            json.dumps(records["a"]) + "\n" + json.dumps(lines[-1]),
+            encoding="utf-8",
+        )
+        stats = await run_jsonl(orchestrator, input_path, output_path)
+        lines = [
+            json.loads(line) for line in output_path.read_text("utf-8").splitlines()
+        ]
+        assert stats.total == 1 and stats.completed == 1
+        assert sorted(record["id"] for record in lines) == ["a", "b"]
+
+    async def test_invalid_line_fails_before_running(self, tmp_path):
+        """不正な行があれば合議を始める前にエラーにする"""
+        from magi_orchestrator.batch import run_jsonl
+
+        input_path = tmp_path / "queries.jsonl"
+        input_path.write_text('{"query": "ok"}\n{"id": 2}\n', encoding="utf-8")
+
+        with pytest.raises(ValueError, match=":2:"):
+            await run_jsonl(MagicMock(), input_path, tmp_path / "out.jsonl")
+        assert not (tmp_path / "out.jsonl").exists()
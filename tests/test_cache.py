@@ -0,0 +1,260 @@
+"""CacheManager のユニットテスト"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai import errors as genai_errors
+
+
+def _not_found() -> genai_errors.APIError:
+    return genai_errors.APIError(
+        404, {"error": {"code": 404, "message": "CachedContent not found"}}
+    )
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_client() -> MagicMock:
+    """作成のたびに連番のキャッシュ名を返す genai.Client のモック"""
+    counter = iter(range(1, 100))
+
+    def create(**_kwargs):
+        return SimpleNamespace(name=f"caches/{next(counter)}", expire_time=None)
+
+    client = MagicMock()
+    client.caches.create.side_effect = create
+    client.aio.caches.create = AsyncMock(side_effect=create)
+    client.aio.caches.update = AsyncMock(return_value=SimpleNamespace(expire_time=None))
+    return client
+
+
+@pytest.mark.asyncio
+class TestCacheLifecycle:
+    """有効期限の追跡・延長・再作成のテスト"""
+
+    async def test_expired_cache_is_not_returned(self):
+        """期限切れのキャッシュ名は返さない"""
+        from magi_orchestrator.cache import CacheManager
+
+        clock = _Clock()
+        manager = CacheManager(_make_client(), clock=clock)
+        name = manager.create_persona_cache("melchior", "m", "sys", ttl_seconds=600)
+
+        assert manager.get_cache_name("melchior") == name
+        assert manager.remaining_lifetime("melchior") == 600
+
+        clock.now += 601
+        assert manager.get_cache_name("melchior") is None
+        assert manager.remaining_lifetime("unknown") is None
+
+    async def test_refresh_expiring_extends_ttl(self):
+        """残り有効期間がマージンを下回ったキャッシュだけ延長する"""
+        from magi_orchestrator.cache import CacheManager
+
+        clock = _Clock()
+        client = _make_client()
+        manager = CacheManager(client, refresh_margin_seconds=300, clock=clock)
+        name = manager.create_persona_cache("melchior", "m", "sys", ttl_seconds=600)
+        manager.create_persona_cache("casper", "m", "sys", ttl_seconds=3600)
+
+        clock.now += 400
+        refreshed = await manager.refresh_expiring()
+
+        assert refreshed == {name: name}
+        assert manager.remaining_lifetime("melchior") == 600
+        client.aio.caches.update.assert_awaited_once()
+
+    async def test_refresh_recreates_expired_cache(self):
+        """サーバー側で失効していた場合は再作成する"""
+        from magi_orchestrator.cache import CacheManager
+
+        client = _make_client()
+        client.aio.caches.update.side_effect = _not_found()
+        manager = CacheManager(client)
+        old = manager.create_persona_cache("melchior", "m", "sys")
+
+        new = await manager.refresh("melchior")
+
+        assert new is not None and new != old
+        assert manager.get_cache_name("melchior") == new
+
+    async def test_concurrent_recover_recreates_once(self):
+        """同じキャッシュの回復が並行しても再作成は1回"""
+        import asyncio
+
+        from magi_orchestrator.cache import CacheManager
+
+        client = _make_client()
+        manager = CacheManager(client)
+        old = manager.create_persona_cache("melchior", "m", "sys")
+
+        names = await asyncio.gather(*(manager.recover(old) for _ in range(3)))
+
+        assert len(set(names)) == 1 and names[0] != old
+        assert client.aio.caches.create.await_count == 1
+        assert await manager.recover("caches/unknown") is None
+
+    async def test_auto_refresh_runs_in_background(self):
+        """自動更新はバックグラウンドで延長し、停止できる"""
+        import asyncio
+
+        from magi_orchestrator.cache import CacheManager
+
+        clock = _Clock()
+        client = _make_client()
+        manager = CacheManager(client, refresh_margin_seconds=300, clock=clock)
+        manager.create_persona_cache("melchior", "m", "sys", ttl_seconds=100)
+
+        manager.start_auto_refresh(interval_seconds=0.01)
+        await asyncio.sleep(0.05)
+        await manager.stop_auto_refresh()
+
+        assert client.aio.caches.update.await_count >= 1
+
+
+@pytest.mark.asyncio
+class TestCacheWarmup:
+    """非同期・並列の事前作成のテスト"""
+
+    async def test_warmup_covers_every_persona_and_model(self):
+        """エージェントの全 (ペルソナ, モデル) を並列に作成し、失敗を報告する"""
+        from dataclasses import replace
+
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.cache import CacheManager
+
+        client = _make_client()
+        create = client.aio.caches.create.side_effect
+
+        def flaky(**kwargs):
+            if kwargs["model"] == "broken-model":
+                raise RuntimeError("quota")
+            return create(**kwargs)
+
+        client.aio.caches.create.side_effect = flaky
+        agents = list(ALL_AGENTS) + [replace(ALL_AGENTS[0], model="broken-model")]
+        manager = CacheManager(client)
+
+        report = await manager.warmup(agents)
+
+        assert not report.ok
+        assert len(report.created) == 3
+        assert list(report.failed) == [("melchior", "broken-model")]
+        assert "quota" in report.failed[("melchior", "broken-model")]
+        client.caches.create.assert_not_called()
+        model = ALL_AGENTS[0].model
+        assert (
+            manager.get_cache_name("melchior", model)
+            == report.created[("melchior", model)]
+        )
+        assert manager.get_cache_name("melchior", "broken-model") is None
+
+
+@pytest.mark.asyncio
+class TestCacheRecovery:
+    """キャッシュが見つからないエラーからの回復のテスト"""
+
+    async def test_client_retries_with_recreated_cache(self):
+        """失効したキャッシュは再作成したキャッシュで再実行する"""
+        from magi_orchestrator.backends import GenerationBackend
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+
+        class ExpiringBackend(GenerationBackend):
+            def __init__(self):
+                self.fake = FakeBackend()
+                self.seen = []
+
+            async def generate_content(self, model, contents, config):
+                self.seen.append(config.cached_content)
+                if config.cached_content == "caches/old":
+                    raise _not_found()
+                return await self.fake.generate_content(model, contents, config)
+
+        backend = ExpiringBackend()
+        client = GeminiNativeClient(api_key="fake", backend=backend)
+        recovery = AsyncMock(return_value="caches/new")
+        client.set_cache_recovery(recovery)
+
+        text = await client.generate_content(
+            "m", "Q", system_instruction="sys", cached_content="caches/old"
+        )
+
+        assert text
+        assert backend.seen == ["caches/old", "caches/new"]
+        recovery.assert_awaited_once_with("caches/old")
+
+
+@pytest.mark.asyncio
+class TestSharedContextCache:
+    """フェーズ内の共有コンテキストキャッシュのテスト"""
+
+    async def test_share_creates_per_model_and_deletes(self):
+        """モデルごとに1回作成し、ブロックの終了時に削除する"""
+        from magi_orchestrator.cache import SharedContextCache
+
+        client = _make_client()
+        client.aio.caches.delete = AsyncMock()
+        shared = SharedContextCache(client, min_tokens=10)
+
+        async with shared.share("x" * 400, ["a", "b", "a"]) as caches:
+            assert caches == {"a": "caches/1", "b": "caches/2"}
+            client.aio.caches.delete.assert_not_awaited()
+
+        assert client.aio.caches.delete.await_count == 2
+
+    async def test_short_transcript_is_not_cached(self):
+        """最小トークン数に満たないトランスクリプトはキャッシュしない"""
+        from magi_orchestrator.cache import SharedContextCache
+
+        client = _make_client()
+        shared = SharedContextCache(client, min_tokens=1024)
+
+        async with shared.share("short", ["a"]) as caches:
+            assert caches == {}
+        client.aio.caches.create.assert_not_awaited()
+
+    async def test_orchestrator_references_shared_cache(self):
+        """議論・投票は共有キャッシュを参照し、ペルソナ定義をプロンプトに含める"""
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.cache import SharedContextCache
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        class RecordingBackend(FakeBackend):
+            def __init__(self):
+                super().__init__(response_chars=2000, seed=0)
+                self.requests = []
+
+            async def generate_content(self, model, contents, config):
+                self.requests.append((contents, config))
+                return await super().generate_content(model, contents, config)
+
+        genai_client = _make_client()
+        genai_client.aio.caches.delete = AsyncMock()
+        backend = RecordingBackend()
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend),
+            shared_context_cache=SharedContextCache(genai_client, min_tokens=100),
+        )
+
+        await orchestrator.consult("Q")
+
+        thinking, rest = backend.requests[:3], backend.requests[3:]
+        assert all(config.cached_content is None for _, config in thinking)
+        assert len(rest) == 6
+        for contents, config in rest:
+            assert config.cached_content is not None
+            assert config.system_instruction is None
+        assert any(ALL_AGENTS[0].system_instruction in c for c, _ in rest)
+        # 議論・投票でそれぞれ1つ作成し、フェーズ後に削除
+        assert genai_client.aio.caches.create.await_count == 2
+        assert genai_client.aio.caches.delete.await_count == 2
@@ -0,0 +1,187 @@
+"""キャッシュレジストリのユニットテスト"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["file", "sqlite", "redis"])
+def make_registry(request, tmp_path):
+    """同じ保存先を共有するレジストリを作成する関数"""
+    from magi_orchestrator.cache_registry import (
+        FileCacheRegistry,
+        InMemoryRedis,
+        RedisCacheRegistry,
+        SQLiteCacheRegistry,
+    )
+
+    clock = _Clock()
+    redis = InMemoryRedis(clock=clock)
+
+    def make():
+        if request.param == "file":
+            return FileCacheRegistry(tmp_path / "registry.json", clock=clock)
+        if request.param == "sqlite":
+            return SQLiteCacheRegistry(tmp_path / "registry.db", clock=clock)
+        return RedisCacheRegistry(redis, clock=clock)
+
+    make.clock = clock
+    return make
+
+
+class TestCacheRegistry:
+    """バックエンド共通の動作のテスト"""
+
+    def test_put_get_and_expiry(self, make_registry):
+        """登録したキャッシュは別インスタンスから参照でき、期限切れは返さない"""
+        from magi_orchestrator.cache_registry import RegisteredCache
+
+        first, second = make_registry(), make_registry()
+        first.put("k", RegisteredCache("caches/1", make_registry.clock() + 60))
+
+        assert second.get("k").name == "caches/1"
+        assert not second.remove("k", "caches/other")
+
+        make_registry.clock.now += 61
+        assert second.get("k") is None
+
+    def test_lock_is_exclusive_until_released_or_expired(self, make_registry):
+        """作成ロックは1ワーカーだけが取得でき、解放・失効後は再取得できる"""
+        first, second = make_registry(), make_registry()
+
+        assert first.acquire_lock("k", "w1", 30)
+        assert not second.acquire_lock("k", "w2", 30)
+        second.release_lock("k", "w2")  # 保持者以外の解放は無視
+        assert not second.acquire_lock("k", "w2", 30)
+
+        first.release_lock("k", "w1")
+        assert second.acquire_lock("k", "w2", 30)
+
+        make_registry.clock.now += 31
+        assert first.acquire_lock("k", "w1", 30)
+
+    def test_leases_count_other_live_workers(self, make_registry):
+        """リース解放時に他のワーカーの有効なリース数を返す"""
+        registry = make_registry()
+        registry.add_lease("k", "w1", 100)
+        registry.add_lease("k", "w2", 10)
+
+        make_registry.clock.now += 20
+        assert registry.release_lease("k", "w1") == 0
+
+        registry.add_lease("k", "w1", 100)
+        registry.add_lease("k", "w3", 100)
+        assert registry.release_lease("k", "w1") == 1
+
+    def test_redis_lease_key_expires_with_latest_lease(self):
+        """Redis のリース集合は最も遅いリースの期限で消え、期限切れは書き込み時に除く"""
+        from magi_orchestrator.cache_registry import InMemoryRedis, RedisCacheRegistry
+
+        clock = _Clock()
+        redis = InMemoryRedis(clock=clock)
+        registry = RedisCacheRegistry(redis, clock=clock)
+        leases_key = "magi:cache:leases:k"
+
+        registry.add_lease("k", "w1", 10)
+        registry.add_lease("k", "w2", 100)
+        clock.now += 50
+        registry.add_lease("k", "w3", 20)
+        assert redis.zrange(leases_key, 0, -1) == ["w3", "w2"]
+
+        clock.now += 51
+        assert redis.zcard(leases_key) == 0
+
+
+def _make_client():
+    """作成のたびに連番のキャッシュ名を返す genai.Client のモック（作成は少し待つ）"""
+    counter = iter(range(1, 100))
+
+    async def create(**_kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(name=f"caches/{next(counter)}", expire_time=None)
+
+    client = MagicMock()
+    client.aio.caches.create = AsyncMock(side_effect=create)
+    return client
+
+
+@pytest.mark.asyncio
+class TestSharedCacheManager:
+    """レジストリを共有する CacheManager のテスト"""
+
+    async def test_concurrent_warmup_creates_each_cache_once(self, make_registry):
+        """同時に起動したワーカーは作成済みのキャッシュを共有する"""
+        from magi_orchestrator.cache import CacheManager
+
+        client = _make_client()
+        workers = [
+            CacheManager(
+                client,
+                registry=make_registry(),
+                worker_id=f"w{i}",
+                poll_interval=0.005,
+            )
+            for i in range(4)
+        ]
+
+        reports = await asyncio.gather(*(w.warmup() for w in workers))
+
+        assert all(report.ok for report in reports)
+        assert len({tuple(sorted(r.created.items())) for r in reports}) == 1
+        assert client.aio.caches.create.await_count == 3
+
+    async def test_clear_keeps_cache_leased_by_others(self, make_registry):
+        """他のワーカーがリース中のキャッシュは削除しない"""
+        from magi_orchestrator.cache import CacheManager
+
+        client = _make_client()
+        first = CacheManager(client, registry=make_registry(), worker_id="w1")
+        second = CacheManager(client, registry=make_registry(), worker_id="w2")
+        name = await first.create_persona_cache_async("melchior", "m", "sys")
+        assert await second.create_persona_cache_async("melchior", "m", "sys") == name
+
+        assert first.clear_cache("melchior")
+        client.caches.delete.assert_not_called()
+
+        assert second.clear_cache("melchior")
+        client.caches.delete.assert_called_once_with(name=name)
+
+    async def test_registry_is_called_off_the_event_loop(self, make_registry):
+        """非同期の作成・延長・再作成ではレジストリをスレッドで呼び出す"""
+        import threading
+
+        from magi_orchestrator.cache import CacheManager
+
+        registry = make_registry()
+        loop_thread = threading.get_ident()
+        threads = set()
+        for method in ("get", "put", "remove", "acquire_lock", "add_lease"):
+            original = getattr(registry, method)
+
+            def wrapped(*args, _original=original):
+                threads.add(threading.get_ident())
+                return _original(*args)
+
+            setattr(registry, method, wrapped)
+
+        client = _make_client()
+        manager = CacheManager(client, registry=registry, refresh_margin_seconds=10**9)
+        await manager.warmup()
+        client.aio.caches.update = AsyncMock(
+            return_value=SimpleNamespace(expire_time=None)
+        )
+        await manager.refresh_expiring()
+        await manager.recover(manager.get_cache_name("melchior"))
+
+        assert threads
+        assert loop_thread not in threads
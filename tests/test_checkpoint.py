@@ -0,0 +1,137 @@
+"""チェックポイントと再開のユニットテスト"""
+
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from magi.models import Decision, PersonaType
+
+THINKING = ["t1", "t2", "t3"]
+DEBATE = ["d1", "d2", "d3"]
+VOTES = ["VOTE: DENY\nREASON: ng"] * 3
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    from magi_orchestrator.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+
+    if request.param == "file":
+        return FileCheckpointStore(tmp_path / "checkpoints")
+    return SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+
+
+@pytest.mark.asyncio
+class TestCheckpointResume:
+    """チェックポイントからの再開のテスト"""
+
+    async def test_resume_after_voting_failure(self, store):
+        """投票で失敗しても、再開時は Thinking / Debate を再実行しない"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[THINKING, DEBATE, DEBATE, TimeoutError("voting timed out")]
+        )
+        orchestrator = MagiOrchestrator(client, checkpoint_store=store, debate_rounds=2)
+
+        with pytest.raises(TimeoutError):
+            await orchestrator.consult("Q", consultation_id="c-1")
+
+        saved = store.load("c-1")
+        assert saved.thinking_results[PersonaType.MELCHIOR].content == "t1"
+        assert len(saved.debate_results) == 2
+        assert saved.debate_complete
+        assert saved.voting_results is None
+
+        client.generate_concurrent = AsyncMock(return_value=VOTES)
+        result = await orchestrator.resume("c-1")
+
+        assert client.generate_concurrent.await_count == 1
+        assert result.final_decision == Decision.DENIED
+        assert len(result.debate_results) == 2
+        assert store.load("c-1") is None
+
+    async def test_resume_mid_debate(self, store):
+        """議論の途中で失敗した場合は残りのラウンドから再開する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[THINKING, DEBATE, RuntimeError("crash")]
+        )
+        orchestrator = MagiOrchestrator(client, checkpoint_store=store, debate_rounds=3)
+
+        with pytest.raises(RuntimeError):
+            await orchestrator.consult("Q", consultation_id="c-2")
+
+        client.generate_concurrent = AsyncMock(side_effect=[DEBATE, DEBATE, VOTES])
+        result = await orchestrator.resume("c-2")
+
+        assert client.generate_concurrent.await_count == 3
+        assert [r.round_number for r in result.debate_results] == [1, 2, 3]
+
+    async def test_resume_unknown_id(self, store):
+        """存在しない合議 ID は KeyError"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        orchestrator = MagiOrchestrator(MagicMock(), checkpoint_store=store)
+
+        with pytest.raises(KeyError):
+            await orchestrator.resume("missing")
+
+    async def test_generated_id_is_attached_to_error(self, store):
+        """自動生成した合議 ID は例外から取得して再開できる"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[THINKING, DEBATE, TimeoutError("voting timed out")]
+        )
+        orchestrator = MagiOrchestrator(client, checkpoint_store=store)
+
+        with pytest.raises(TimeoutError) as excinfo:
+            await orchestrator.consult("Q")
+
+        consultation_id = excinfo.value.consultation_id
+        assert store.load(consultation_id) is not None
+
+        client.generate_concurrent = AsyncMock(return_value=VOTES)
+        result = await orchestrator.resume(consultation_id)
+
+        assert result.final_decision == Decision.DENIED
+
+    async def test_keep_checkpoints(self, store):
+        """keep_checkpoints 指定時は完了したチェックポイントを残す"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(side_effect=[THINKING, DEBATE, VOTES])
+        orchestrator = MagiOrchestrator(
+            client, checkpoint_store=store, keep_checkpoints=True
+        )
+
+        await orchestrator.consult("Q", consultation_id="c-3")
+
+        assert store.load("c-3").is_complete
+
+
+class TestFileCheckpointStore:
+    """FileCheckpointStore のテスト"""
+
+    @pytest.mark.parametrize("consultation_id", ["../../escape", "a/b", "..", ""])
+    def test_rejects_ids_outside_directory(self, tmp_path, consultation_id):
+        """ディレクトリ外を指し得る合議 ID は ValueError"""
+        from magi_orchestrator.checkpoint import (
+            ConsultationCheckpoint,
+            FileCheckpointStore,
+        )
+
+        store = FileCheckpointStore(tmp_path / "checkpoints")
+
+        with pytest.raises(ValueError):
+            store.save(ConsultationCheckpoint(consultation_id, query="Q"))
+        with pytest.raises(ValueError):
+            store.load(consultation_id)
+        with pytest.raises(ValueError):
+            store.delete(consultation_id)
+        assert list(tmp_path.rglob("*.json")) == []
+        assert list(tmp_path.rglob("*.tmp")) == []
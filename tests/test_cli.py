@@ -0,0 +1,114 @@
+"""CLI の起動（遅延インポート）のテスト"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+_HEAVY_MODULES = ("google.genai", "pydantic_settings", "magi_orchestrator.orchestrator")
+
+
+def _loaded_modules(code: str):
+    """新しいインタプリタで code を実行し、読み込まれた重いモジュールを返す"""
+    script = (
+        f"import sys\n{code}\n"
+        f"loaded = [m for m in {_HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(','.join(loaded), file=sys.stderr)"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    return [m for m in completed.stderr.strip().split(",") if m]
+
+
+class TestLazyImports:
+    """起動時に SDK・設定・オーケストレーターを読み込まないことのテスト"""
+
+    @pytest.mark.parametrize(
+        "code", ["import magi_orchestrator", "import magi_orchestrator.cli"]
+    )
+    def test_import_does_not_load_sdk(self, code):
+        """パッケージ・CLI モジュールの import では重い依存を読み込まない"""
+        assert _loaded_modules(code) == []
+
+    def test_help_does_not_load_sdk(self):
+        """--help の表示では重い依存を読み込まない"""
+        code = (
+            "from magi_orchestrator.cli import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        assert _loaded_modules(code) == []
+
+    def test_public_names_resolve_on_first_access(self):
+        """公開クラスは最初の参照時に読み込まれる"""
+        import magi_orchestrator
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        assert magi_orchestrator.MagiOrchestrator is MagiOrchestrator
+        assert "MagiOrchestrator" in dir(magi_orchestrator)
+        with pytest.raises(AttributeError):
+            getattr(magi_orchestrator, "NoSuchName")
+
+
+class TestQueryArgument:
+    """質問の引数のテスト"""
+
+    @pytest.mark.parametrize(
+        "argv,query",
+        [
+            (["Q"], "Q"),
+            (["ask", "serve"], "serve"),
+            (["--", "batch"], "batch"),
+            (["-v", "serve"], "serve"),
+        ],
+    )
+    def test_subcommand_names_can_be_asked(self, monkeypatch, argv, query):
+        """サブコマンド名と同じ質問は ask か -- の後に指定できる"""
+        from unittest.mock import AsyncMock
+
+        from magi_orchestrator import cli
+
+        run_magi = AsyncMock()
+        monkeypatch.setattr(cli, "run_magi", run_magi)
+
+        cli.main(argv)
+
+        assert run_magi.await_args.args[0] == query
+
+
+@pytest.mark.asyncio
+class TestServe:
+    """serve サブコマンドのテスト"""
+
+    async def test_cache_manager_shares_sdk_client(self, monkeypatch):
+        """キャッシュマネージャーは生成リクエストと同じ SDK クライアントを使う"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from magi_orchestrator import cli, server
+        from magi_orchestrator.client import GeminiNativeClient
+
+        client = GeminiNativeClient(api_key="fake")
+        build = MagicMock()
+        http_server = MagicMock(
+            start=AsyncMock(), serve_forever=AsyncMock(), stop=AsyncMock()
+        )
+        monkeypatch.setattr(cli, "_load_settings", MagicMock)
+        monkeypatch.setattr(cli, "_create_client", lambda settings: client)
+        monkeypatch.setattr(cli, "_build_orchestrator", build)
+        monkeypatch.setattr(server, "MagiService", MagicMock())
+        monkeypatch.setattr(
+            server, "MagiHTTPServer", MagicMock(return_value=http_server)
+        )
+
+        await cli.run_server("127.0.0.1", 0, workers=1)
+
+        cache_manager = build.call_args.kwargs["cache_manager"]
+        assert cache_manager._client is client.genai_client is not None
@@ -0,0 +1,79 @@
+"""議論の収束判定のユニットテスト"""
+
+import pytest
+
+from magi.models import Vote
+
+
+class TestConvergenceSignals:
+    """暫定スタンスと類似度のテスト"""
+
+    def test_parse_stance_uses_last_line(self):
+        """最後に記載されたスタンスを使う"""
+        from magi_orchestrator.convergence import parse_stance
+
+        assert parse_stance("STANCE: DENY\n...\nstance: approve") == Vote.APPROVE
+        assert parse_stance("no stance") is None
+
+    def test_text_similarity(self):
+        """同一の発言は 1.0、無関係な発言は低い"""
+        from magi_orchestrator.convergence import text_similarity
+
+        assert text_similarity("同じ意見です", "同じ意見です") == 1.0
+        assert text_similarity("abcdef", "uvwxyz") == 0.0
+
+    def test_has_converged(self):
+        """スタンスの一致、またはスタンス不変かつ類似度が閾値以上で収束"""
+        from magi_orchestrator.convergence import has_converged
+
+        unanimous = {"a": "x\nSTANCE: APPROVE", "b": "y\nSTANCE: APPROVE"}
+        split = {"a": "same text\nSTANCE: APPROVE", "b": "other\nSTANCE: DENY"}
+        changed = {"a": "same text\nSTANCE: DENY", "b": "other\nSTANCE: APPROVE"}
+
+        assert has_converged(None, unanimous, 0.9)
+        assert not has_converged(None, split, 0.9)
+        assert has_converged(split, split, 0.9)
+        assert not has_converged(split, changed, 0.0)
+        assert not has_converged(None, {"a": "no stance"}, 0.0)
+
+
+@pytest.mark.asyncio
+class TestAdaptiveDebate:
+    """収束判定による議論の打ち切りのテスト"""
+
+    async def test_stops_when_stances_agree(self):
+        """スタンスが一致したラウンドで議論を打ち切る"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        backend = FakeBackend(vote_policy=lambda *_: "APPROVE")
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend),
+            debate_rounds=4,
+            convergence_threshold=0.9,
+        )
+
+        result = await orchestrator.consult("Q")
+
+        assert len(result.debate_results) == 1
+        assert sum(backend.calls.values()) == 9
+
+    async def test_contentious_query_uses_all_rounds(self):
+        """スタンスが割れ続ける場合は上限まで議論する"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        backend = FakeBackend(
+            vote_policy=lambda m, c, s: "APPROVE" if "MELCHIOR" in s else "DENY"
+        )
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend),
+            debate_rounds=3,
+            convergence_threshold=1.0,
+        )
+
+        result = await orchestrator.consult("Q")
+
+        assert len(result.debate_results) == 3
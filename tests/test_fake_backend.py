@@ -0,0 +1,65 @@
+"""FakeBackend のユニットテスト"""
+
+import pytest
+
+from magi.models import Decision
+
+
+@pytest.mark.asyncio
+class TestFakeBackend:
+    """FakeBackend を使ったオフライン合議のテスト"""
+
+    async def test_consult_offline_is_deterministic(self):
+        """同じプロンプトには同じ投票を返し、API Key なしで合議できる"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        backend = FakeBackend(seed=0)
+        client = GeminiNativeClient(api_key="fake", backend=backend)
+        orchestrator = MagiOrchestrator(client)
+
+        first = await orchestrator.consult("Q")
+        second = await orchestrator.consult("Q")
+
+        assert first.final_decision == second.final_decision
+        assert sum(backend.calls.values()) == 18
+
+    async def test_vote_policy_and_streaming_chunks(self):
+        """vote_policy で投票を固定でき、ストリーミングはチャンク分割される"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.events import AgentChunk, ConsultComplete
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        backend = FakeBackend(
+            response_chars=100, chunk_chars=10, vote_policy=lambda *_: "DENY"
+        )
+        client = GeminiNativeClient(api_key="fake", backend=backend)
+
+        events = [e async for e in MagiOrchestrator(client).consult_stream("Q")]
+
+        chunks = [e for e in events if isinstance(e, AgentChunk)]
+        assert all(len(e.text) <= 10 for e in chunks)
+        assert isinstance(events[-1], ConsultComplete)
+        assert events[-1].result.final_decision == Decision.DENIED
+
+    async def test_errors_are_retried(self):
+        """疑似エラーは一時的なエラーとしてリトライされる"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.retry import RetryPolicy
+
+        backend = FakeBackend(error_rate=1.0)
+        client = GeminiNativeClient(
+            api_key="fake",
+            backend=backend,
+            retry_policy=RetryPolicy(max_attempts=3, initial_delay=0),
+        )
+
+        results = await client.generate_concurrent(
+            [{"model": "m", "contents": "Q", "config": {}}]
+        )
+
+        assert results[0].startswith("[ERROR] APIError")
+        assert backend.calls["m"] == 3
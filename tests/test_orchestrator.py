@@ -71,6 +71,96 @@ CONDITIONS: テストカバレッジ80%以上, コードレビュー必須, 段
         assert result.vote == Vote.CONDITIONAL
 
 
+class TestStructuredVote:
+    """JSON の投票出力のテスト"""
+
+    def test_parse_json_vote(self):
+        """スキーマに合う JSON（コードフェンス付きも可）をパース"""
+        from magi_orchestrator.voting import parse_vote_json
+
+        raw = '```json\n{"vote": "CONDITIONAL", "reason": "条件付き", "conditions": ["テスト追加"]}\n```'
+
+        result = parse_vote_json(PersonaType.CASPER, raw)
+
+        assert result.vote == Vote.CONDITIONAL
+        assert result.reason == "条件付き"
+        assert result.conditions == ["テスト追加"]
+
+    def test_invalid_json_vote_is_rejected(self):
+        """列挙にない投票や必須キーの欠落は None"""
+        from magi_orchestrator.voting import parse_vote_json
+
+        assert (
+            parse_vote_json(PersonaType.CASPER, '{"vote": "MAYBE", "reason": "r"}')
+            is None
+        )
+        assert parse_vote_json(PersonaType.CASPER, '{"vote": "DENY"}') is None
+        assert parse_vote_json(PersonaType.CASPER, "VOTE: DENY") is None
+
+    def test_voting_requests_use_response_schema(self):
+        """投票リクエストは JSON モード・レスポンススキーマを指定する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        orchestrator = MagiOrchestrator(MagicMock())
+
+        for request in orchestrator._build_voting_requests("Q", "ctx"):
+            config = request["config"]
+            assert config["response_mime_type"] == "application/json"
+            assert config["response_schema"].properties["vote"].enum == [
+                "APPROVE",
+                "DENY",
+                "CONDITIONAL",
+            ]
+            # 思考トークンで JSON が切れないよう、既定では出力上限を設けない
+            assert "max_output_tokens" not in config
+        for request in orchestrator._build_thinking_requests("Q"):
+            assert "response_schema" not in request["config"]
+
+    @pytest.mark.asyncio
+    async def test_unparseable_vote_is_retried_once(self):
+        """パースできない投票だけを再実行し、再実行後も不正なら VotingError"""
+        from magi_orchestrator.exceptions import VotingError
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        ok = '{"vote": "APPROVE", "reason": "ok"}'
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[[ok, "判断できません", ok], [ok]]
+        )
+        orchestrator = MagiOrchestrator(client)
+
+        votes = await orchestrator._run_voting_phase("Q", {}, [])
+
+        assert [v.vote for v in votes.values()] == [Vote.APPROVE] * 3
+        retry = client.generate_concurrent.await_args_list[1].args[0]
+        assert len(retry) == 1 and retry[0]["agent"] == "balthasar"
+        assert "解析できませんでした" in retry[0]["contents"]
+
+        client.generate_concurrent = AsyncMock(
+            side_effect=[[ok, "判断できません", ok], ["まだ判断できません"]]
+        )
+        with pytest.raises(VotingError) as excinfo:
+            await orchestrator._run_voting_phase("Q", {}, [])
+        assert excinfo.value.persona_type == PersonaType.BALTHASAR
+
+    @pytest.mark.asyncio
+    async def test_truncated_vote_is_retried(self):
+        """出力上限で途中で切れた JSON の投票は再実行する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        ok = '{"vote": "DENY", "reason": "ok"}'
+        truncated = '{"vote": "APPROVE", "reas'
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(side_effect=[[ok, ok, truncated], [ok]])
+        orchestrator = MagiOrchestrator(client)
+
+        votes = await orchestrator._run_voting_phase("Q", {}, [])
+
+        assert [v.vote for v in votes.values()] == [Vote.DENY] * 3
+        retry = client.generate_concurrent.await_args_list[1].args[0]
+        assert len(retry) == 1 and retry[0]["agent"] == "casper"
+
+
 class TestVotingTally:
     """投票集計のテスト"""
 
@@ -184,6 +274,90 @@ class TestOrchestratorSettings:
             assert "1234567890" not in masked["api_key"]
             assert "..." in masked["api_key"]
 
+    def test_global_output_cap_overrides_phase_defaults(self, monkeypatch):
+        """全フェーズ共通の上限は組み込みのフェーズ既定値より優先される"""
+        from magi_orchestrator import generation
+        from magi_orchestrator.generation import GenerationProfile, build_phase_profiles
+        from magi_orchestrator.phases import Phase
+
+        monkeypatch.setitem(
+            generation.DEFAULT_PHASE_PROFILES,
+            Phase.VOTING,
+            GenerationProfile(max_output_tokens=256, temperature=0.3),
+        )
+
+        profiles = build_phase_profiles(128)
+        assert profiles[Phase.VOTING].max_output_tokens == 128
+        assert profiles[Phase.VOTING].temperature == 0.3
+
+        profiles = build_phase_profiles(128, {Phase.VOTING: {"max_output_tokens": 64}})
+        assert profiles[Phase.VOTING].max_output_tokens == 64
+
+    def test_generation_profiles(self):
+        """共通の上限とフェーズ別の生成プロファイルを読み込む"""
+        from pydantic import ValidationError
+
+        from magi_orchestrator.config import OrchestratorSettings
+        from magi_orchestrator.phases import Phase
+
+        env = {
+            "MAGI_GEMINI_API_KEY": "test-key",
+            "MAGI_GEMINI_MAX_OUTPUT_TOKENS": "1024",
+            "MAGI_GEMINI_GENERATION_PROFILES": (
+                '{"voting": {"max_output_tokens": 100, "thinking_budget": 0}}'
+            ),
+        }
+        with patch.dict("os.environ", env):
+            profiles = OrchestratorSettings().phase_profiles()
+
+        assert profiles[Phase.THINKING].max_output_tokens == 1024
+        assert profiles[Phase.VOTING].max_output_tokens == 100
+        assert profiles[Phase.VOTING].thinking_budget == 0
+        assert profiles[Phase.VOTING].temperature == 0.3
+
+        env["MAGI_GEMINI_GENERATION_PROFILES"] = '{"voting": {"max_tokens": 100}}'
+        with patch.dict("os.environ", env), pytest.raises(ValidationError):
+            OrchestratorSettings()
+
+    @pytest.mark.parametrize(
+        "limits",
+        [
+            '{"m": {"requests_per_minute": 0}}',
+            '{"m": {"requests_per_minute": -5}}',
+            '{"m": {"rpm": 60}}',
+        ],
+    )
+    def test_invalid_model_rate_limits_are_rejected(self, limits):
+        """モデル別の流量上限は正の整数のみ、未知のキーはエラー"""
+        from pydantic import ValidationError
+
+        from magi_orchestrator.config import OrchestratorSettings
+
+        env = {
+            "MAGI_GEMINI_API_KEY": "test-key",
+            "MAGI_GEMINI_MODEL_RATE_LIMITS": limits,
+        }
+        with patch.dict("os.environ", env), pytest.raises(ValidationError):
+            OrchestratorSettings()
+
+    def test_model_rate_limits_build_admission(self):
+        """モデル別の流量上限をアドミッション制御に渡す"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.config import OrchestratorSettings
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.rate_limit import ModelRateLimit
+
+        env = {
+            "MAGI_GEMINI_API_KEY": "test-key",
+            "MAGI_GEMINI_MODEL_RATE_LIMITS": '{"m": {"requests_per_minute": 60}}',
+        }
+        with patch.dict("os.environ", env):
+            settings = OrchestratorSettings()
+
+        client = GeminiNativeClient.from_settings(settings, backend=FakeBackend())
+        limit = client._admission._limit_for("m")
+        assert limit == ModelRateLimit(requests_per_minute=60)
+
 
 @pytest.mark.asyncio
 class TestGeminiNativeClient:
@@ -217,3 +391,246 @@ class TestGeminiNativeClient:
 
             assert len(results) == 2
             assert all(r == "Generated response" for r in results)
+
+    async def test_generate_concurrent_stream_with_mock(self):
+        """並列ストリーミング生成のモックテスト"""
+        from magi_orchestrator.client import GeminiNativeClient
+
+        def make_chunk(text):
+            chunk = MagicMock()
+            chunk.text = text
+            return chunk
+
+        async def fake_stream(model, contents, config):
+            async def gen():
+                for part in (contents, "-end"):
+                    yield make_chunk(part)
+
+            return gen()
+
+        with patch("magi_orchestrator.client.genai") as mock_genai:
+            mock_aclient = AsyncMock()
+            mock_aclient.models.generate_content_stream = fake_stream
+
+            mock_client_instance = MagicMock()
+            mock_client_instance.aio = mock_aclient
+            mock_genai.Client.return_value = mock_client_instance
+
+            client = GeminiNativeClient(api_key="test-key")
+
+            requests = [
+                {"model": "gemini-1.5-flash", "contents": "Q1", "config": {}},
+                {"model": "gemini-1.5-flash", "contents": "Q2", "config": {}},
+            ]
+
+            texts = {0: "", 1: ""}
+            async for index, text in client.generate_concurrent_stream(requests):
+                texts[index] += text
+
+            assert texts == {0: "Q1-end", 1: "Q2-end"}
+
+
+@pytest.mark.asyncio
+class TestEarlyExitVoting:
+    """投票の早期打ち切りのテスト"""
+
+    def _make_client(self, votes):
+        """完了順に投票を返し、消費されたインデックスを記録するモッククライアント"""
+        consumed = []
+
+        async def generate_as_completed(requests):
+            for index, raw in votes:
+                consumed.append(index)
+                yield index, raw
+
+        client = MagicMock()
+        client.generate_as_completed = generate_as_completed
+        return client, consumed
+
+    async def test_majority_settled_after_two_votes(self):
+        """過半数判定は2票一致で確定し、3票目を待たない"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client, consumed = self._make_client(
+            [
+                (2, "VOTE: APPROVE\nREASON: ok"),
+                (0, "VOTE: APPROVE\nREASON: ok"),
+                (1, "VOTE: DENY\nREASON: ng"),
+            ]
+        )
+        orchestrator = MagiOrchestrator(client, early_exit_voting=True)
+
+        votes = await orchestrator._run_voting_phase("Q", {}, [])
+
+        assert consumed == [2, 0]
+        assert list(votes) == [PersonaType.MELCHIOR, PersonaType.CASPER]
+        result = orchestrator._build_consensus_result({}, [], votes)
+        assert result.final_decision == Decision.APPROVED
+        assert result.exit_code == 0
+
+    async def test_split_votes_wait_for_all(self):
+        """判定が割れている間は全票を待つ"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client, consumed = self._make_client(
+            [
+                (0, "VOTE: APPROVE\nREASON: ok"),
+                (1, "VOTE: DENY\nREASON: ng"),
+                (2, "VOTE: DENY\nREASON: ng"),
+            ]
+        )
+        orchestrator = MagiOrchestrator(client, early_exit_voting=True)
+
+        votes = await orchestrator._run_voting_phase("Q", {}, [])
+
+        assert consumed == [0, 1, 2]
+        assert len(votes) == 3
+
+    async def test_unanimous_settled_by_single_deny(self):
+        """全員一致判定では1票の DENY で確定する"""
+        from magi.models import VoteOutput
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        orchestrator = MagiOrchestrator(MagicMock(), voting_threshold="unanimous")
+        votes = {
+            PersonaType.MELCHIOR: VoteOutput(
+                persona_type=PersonaType.MELCHIOR, vote=Vote.DENY, reason="ng"
+            )
+        }
+
+        assert orchestrator._settled_decision(votes, 2) == Decision.DENIED
+
+
+class TestResponseMemo:
+    """ResponseMemo のテスト"""
+
+    def test_byte_size_eviction(self):
+        """合計バイト数が上限を超えると古いエントリから破棄される"""
+        from magi_orchestrator.memo import ResponseMemo
+
+        memo = ResponseMemo(max_bytes=12)
+        memo.set("a", "あ")  # 3 bytes
+        memo.set("b", "x" * 8)
+        memo.set("c", "yy")
+
+        assert memo.get("a") is None
+        assert memo.get("b") == "x" * 8
+        assert memo.size_bytes == 10
+
+    def test_request_key_ignores_none_config(self):
+        """None の設定値はキーに影響しない"""
+        from magi_orchestrator.memo import make_request_key
+
+        a = make_request_key("m", "Q", {"temperature": 0.2, "cached_content": None})
+        b = make_request_key("m", "Q", {"temperature": 0.2})
+
+        assert a == b
+        assert a != make_request_key("m", "Q", {"temperature": 0.3})
+
+    @pytest.mark.asyncio
+    async def test_client_replays_memoized_requests(self):
+        """同一リクエストは API を再呼び出ししない（エラーはメモしない）"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.memo import ResponseMemo
+
+        with patch("magi_orchestrator.client.genai") as mock_genai:
+            mock_response = MagicMock()
+            mock_response.text = "Generated response"
+
+            mock_aclient = AsyncMock()
+            mock_aclient.models.generate_content = AsyncMock(
+                side_effect=[RuntimeError("boom"), mock_response]
+            )
+            mock_client_instance = MagicMock()
+            mock_client_instance.aio = mock_aclient
+            mock_genai.Client.return_value = mock_client_instance
+
+            memo = ResponseMemo()
+            client = GeminiNativeClient(api_key="test-key", response_memo=memo)
+            request = {"model": "gemini-1.5-flash", "contents": "Q", "config": {}}
+
+            first = await client.generate_concurrent([request])
+            second = await client.generate_concurrent([request])
+            third = await client.generate_concurrent([request])
+
+            assert first[0].startswith("[ERROR]")
+            assert second == third == ["Generated response"]
+            assert mock_aclient.models.generate_content.await_count == 2
+            assert memo.stats.hits == 1
+
+
+class TestRequestBuilder:
+    """全フェーズ共通のリクエスト構築のテスト"""
+
+    def test_every_phase_uses_persona_cache(self):
+        """投票を含む全フェーズがペルソナのキャッシュを参照する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        cache_manager = MagicMock()
+        cache_manager.get_cache_name.side_effect = lambda persona, model: (
+            f"caches/{persona}"
+        )
+        orchestrator = MagiOrchestrator(MagicMock(), cache_manager=cache_manager)
+
+        phases = [
+            orchestrator._build_thinking_requests("Q"),
+            orchestrator._build_debate_requests("Q", "ctx"),
+            orchestrator._build_voting_requests("Q", "ctx"),
+        ]
+
+        for requests in phases:
+            for agent, request in zip(orchestrator.agents, requests):
+                config = request["config"]
+                assert config["cached_content"] == f"caches/{agent.persona_type.value}"
+                # キャッシュにシステム命令が含まれるため送らない
+                assert "system_instruction" not in config
+        assert all(r["config"]["temperature"] == 0.3 for r in phases[2])
+
+    def test_without_cache_sends_system_instruction(self):
+        """キャッシュがない場合はシステム命令を送る"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        orchestrator = MagiOrchestrator(MagicMock())
+
+        for request, agent in zip(
+            orchestrator._build_voting_requests("Q", "ctx"), orchestrator.agents
+        ):
+            assert request["config"]["system_instruction"] == agent.system_instruction
+            assert "cached_content" not in request["config"]
+
+    def test_generation_profiles_are_layered(self):
+        """既定値 < オーケストレーター < エージェントの順にプロファイルを適用する"""
+        from dataclasses import replace
+
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.generation import GenerationProfile
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+
+        terse = replace(
+            ALL_AGENTS[0],
+            generation={Phase.VOTING: GenerationProfile(max_output_tokens=64)},
+        )
+        orchestrator = MagiOrchestrator(
+            MagicMock(),
+            agents=[terse, *ALL_AGENTS[1:]],
+            generation_profiles={
+                Phase.THINKING: GenerationProfile(
+                    max_output_tokens=2048, stop_sequences=["END"], thinking_budget=0
+                ),
+                Phase.VOTING: GenerationProfile(max_output_tokens=100),
+            },
+        )
+
+        thinking = orchestrator._build_thinking_requests("Q")[0]["config"]
+        assert thinking["max_output_tokens"] == 2048
+        assert thinking["stop_sequences"] == ["END"]
+        assert thinking["thinking_config"].thinking_budget == 0
+        assert thinking["temperature"] == terse.temperature
+
+        debate = orchestrator._build_debate_requests("Q", "ctx")[0]["config"]
+        assert "max_output_tokens" not in debate
+
+        voting = [r["config"] for r in orchestrator._build_voting_requests("Q", "ctx")]
+        assert [c["max_output_tokens"] for c in voting] == [64, 100, 100]
+        assert all(c["temperature"] == 0.3 for c in voting)
@@ -0,0 +1,73 @@
+"""アドミッション制御のユニットテスト"""
+
+import asyncio
+import pytest
+
+
+def test_estimate_tokens():
+    """ASCII は約4文字、非 ASCII は1文字で1トークン"""
+    from magi_orchestrator.rate_limit import estimate_tokens
+
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("設計") == 2
+    assert estimate_tokens("") == 1
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+    """AdmissionController のテスト"""
+
+    async def test_max_in_flight(self):
+        """同時実行数が上限を超えない"""
+        from magi_orchestrator.rate_limit import AdmissionController
+
+        admission = AdmissionController(max_in_flight=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with admission.admit("m"):
+                peak = max(peak, admission.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert admission.in_flight == 0
+
+    async def test_requests_per_minute_throttles(self):
+        """RPM を使い切ると補充まで待機し、到着順に許可される"""
+        from magi_orchestrator.rate_limit import AdmissionController, ModelRateLimit
+
+        # 6000 RPM = 100 req/s なので、容量超過分は約 10ms ずつ待たされる
+        admission = AdmissionController(
+            model_limits={"m": ModelRateLimit(requests_per_minute=6000)}
+        )
+        bucket, _ = admission._buckets_for("m")
+        bucket._tokens = 0
+        order = []
+
+        async def call(i):
+            async with admission.admit("m") as wait:
+                order.append(i)
+                return wait
+
+        waits = await asyncio.gather(*(call(i) for i in range(3)))
+
+        assert order == [0, 1, 2]
+        assert waits[2] >= waits[0] > 0
+
+    async def test_models_have_separate_buckets(self):
+        """モデルごとに独立したバケットを持つ"""
+        from magi_orchestrator.rate_limit import AdmissionController, ModelRateLimit
+
+        admission = AdmissionController(
+            default_limit=ModelRateLimit(requests_per_minute=1)
+        )
+        async with admission.admit("a") as wait_a:
+            pass
+        async with admission.admit("b") as wait_b:
+            pass
+
+        assert wait_a < 0.01
+        assert wait_b < 0.01
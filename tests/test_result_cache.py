@@ -0,0 +1,180 @@
+"""合議結果キャッシュのユニットテスト"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+
+from magi.models import (
+    ConsensusResult,
+    DebateOutput,
+    DebateRound,
+    Decision,
+    PersonaType,
+    ThinkingOutput,
+    Vote,
+    VoteOutput,
+)
+
+
+def _make_result() -> ConsensusResult:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return ConsensusResult(
+        thinking_results={
+            "melchior": ThinkingOutput(
+                persona_type=PersonaType.MELCHIOR, content="分析", timestamp=now
+            )
+        },
+        debate_results=[
+            DebateRound(
+                round_number=1,
+                outputs={
+                    PersonaType.MELCHIOR: DebateOutput(
+                        persona_type=PersonaType.MELCHIOR,
+                        round_number=1,
+                        responses={PersonaType.CASPER: "反論"},
+                        timestamp=now,
+                    )
+                },
+                timestamp=now,
+            )
+        ],
+        voting_results={
+            PersonaType.MELCHIOR: VoteOutput(
+                persona_type=PersonaType.MELCHIOR,
+                vote=Vote.CONDITIONAL,
+                reason="条件付き",
+                conditions=["テスト追加"],
+            )
+        },
+        final_decision=Decision.CONDITIONAL,
+        exit_code=2,
+        all_conditions=["テスト追加"],
+    )
+
+
+class TestConsultationKey:
+    """キャッシュキー生成のテスト"""
+
+    def test_whitespace_and_width_normalized(self):
+        """空白や全角英数の違いは同一キーになる"""
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.result_cache import make_consultation_key
+
+        a = make_consultation_key("  Is  ＡＩ safe?\n", ALL_AGENTS, "majority", 1)
+        b = make_consultation_key("Is AI safe?", ALL_AGENTS, "majority", 1)
+
+        assert a == b
+
+    def test_config_changes_key(self):
+        """閾値・ラウンド数・エージェント設定が異なれば別キーになる"""
+        from dataclasses import replace
+
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.generation import GenerationProfile
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.result_cache import make_consultation_key
+
+        base = make_consultation_key("Q", ALL_AGENTS, "majority", 1)
+        hotter = [replace(ALL_AGENTS[0], temperature=0.9), *ALL_AGENTS[1:]]
+
+        assert base != make_consultation_key("Q", ALL_AGENTS, "unanimous", 1)
+        assert base != make_consultation_key("Q", ALL_AGENTS, "majority", 2)
+        assert base != make_consultation_key("Q", hotter, "majority", 1)
+        assert base != make_consultation_key(
+            "Q",
+            ALL_AGENTS,
+            "majority",
+            1,
+            {Phase.VOTING: GenerationProfile(max_output_tokens=100)},
+        )
+        assert base != make_consultation_key(
+            "Q", ALL_AGENTS, "majority", 1, convergence_threshold=0.6
+        )
+        assert base != make_consultation_key(
+            "Q", ALL_AGENTS, "majority", 1, context_token_budget=1000
+        )
+        assert base != make_consultation_key(
+            "Q", ALL_AGENTS, "majority", 1, early_exit_voting=True
+        )
+
+
+class TestInMemoryConsultationCache:
+    """InMemoryConsultationCache のテスト"""
+
+    def test_lru_eviction_and_stats(self):
+        """最大件数を超えると最も古く使われたエントリが破棄される"""
+        from magi_orchestrator.result_cache import InMemoryConsultationCache
+
+        cache = InMemoryConsultationCache(max_entries=2)
+        result = _make_result()
+        cache.set("a", result)
+        cache.set("b", result)
+        assert cache.get("a") is result  # a を最近使用に
+        cache.set("c", result)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is result
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+
+    def test_ttl_expiry(self):
+        """TTL を過ぎたエントリはミスになる"""
+        from magi_orchestrator.result_cache import InMemoryConsultationCache
+
+        cache = InMemoryConsultationCache(ttl_seconds=10)
+        with patch("magi_orchestrator.result_cache.time.monotonic", return_value=0):
+            cache.set("a", _make_result())
+        with patch("magi_orchestrator.result_cache.time.monotonic", return_value=11):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestSQLiteConsultationCache:
+    """SQLiteConsultationCache のテスト"""
+
+    def test_roundtrip_across_instances(self, tmp_path):
+        """別インスタンスからも保存済みの結果を復元できる"""
+        from magi_orchestrator.result_cache import SQLiteConsultationCache
+
+        path = tmp_path / "cache.db"
+        SQLiteConsultationCache(path).set("key", _make_result())
+
+        restored = SQLiteConsultationCache(path).get("key")
+
+        assert restored is not None
+        assert restored.final_decision == Decision.CONDITIONAL
+        assert restored.thinking_results["melchior"].content == "分析"
+        assert restored.voting_results[PersonaType.MELCHIOR].conditions == [
+            "テスト追加"
+        ]
+        output = restored.debate_results[0].outputs[PersonaType.MELCHIOR]
+        assert output.responses[PersonaType.CASPER] == "反論"
+
+
+@pytest.mark.asyncio
+class TestOrchestratorResultCache:
+    """MagiOrchestrator とキャッシュの統合テスト"""
+
+    async def test_hit_skips_api_calls(self):
+        """2回目の問い合わせは API を呼び出さない"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.result_cache import InMemoryConsultationCache
+
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[
+                ["t1", "t2", "t3"],
+                ["d1", "d2", "d3"],
+                ["VOTE: APPROVE\nREASON: ok"] * 3,
+            ]
+        )
+        cache = InMemoryConsultationCache()
+        orchestrator = MagiOrchestrator(client, result_cache=cache)
+
+        first = await orchestrator.consult("Q")
+        second = await orchestrator.consult(" Q ")
+
+        assert second is first
+        assert client.generate_concurrent.await_count == 3
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
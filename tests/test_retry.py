@@ -0,0 +1,259 @@
+"""リトライとヘッジのユニットテスト"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+
+from google.genai import errors as genai_errors
+from magi.models import PersonaType
+
+
+def _api_error(code: int) -> genai_errors.APIError:
+    return genai_errors.APIError(code, {"error": {"code": code, "message": "x"}})
+
+
+def _make_client(generate_content, **kwargs):
+    from magi_orchestrator.client import GeminiNativeClient
+
+    with patch("magi_orchestrator.client.genai") as mock_genai:
+        mock_aclient = AsyncMock()
+        mock_aclient.models.generate_content = generate_content
+        mock_client_instance = MagicMock()
+        mock_client_instance.aio = mock_aclient
+        mock_genai.Client.return_value = mock_client_instance
+        return GeminiNativeClient(api_key="test-key", **kwargs)
+
+
+def _response(text):
+    response = MagicMock()
+    response.text = text
+    return response
+
+
+class TestTransientClassification:
+    """一時的エラー判定のテスト"""
+
+    def test_status_codes(self):
+        from magi_orchestrator.retry import is_transient_error
+
+        assert is_transient_error(_api_error(429))
+        assert is_transient_error(_api_error(503))
+        assert not is_transient_error(_api_error(400))
+        assert is_transient_error(TimeoutError())
+        assert not is_transient_error(ValueError())
+
+    def test_backoff_is_capped(self):
+        from magi_orchestrator.retry import RetryPolicy
+
+        policy = RetryPolicy(initial_delay=1, max_delay=5, jitter=False)
+
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+
+class TestRetryBudget:
+    """リトライ枠のテスト"""
+
+    def test_budget_accumulates_up_to_min_retries(self):
+        """リトライ枠は初期値を上限に積み立てる"""
+        from magi_orchestrator.retry import RetryBudget
+
+        budget = RetryBudget(ratio=0.5, min_retries=2)
+        for _ in range(10):
+            budget.record_request()
+        assert budget.available == 2
+
+        assert budget.try_spend() and budget.try_spend()
+        assert not budget.try_spend()
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_spend()
+
+
+@pytest.mark.asyncio
+class TestClientRetry:
+    """GeminiNativeClient のリトライのテスト"""
+
+    async def test_retries_transient_then_succeeds(self):
+        """一時的なエラーはリトライされる"""
+        from magi_orchestrator.retry import RetryPolicy
+
+        generate = AsyncMock(side_effect=[_api_error(503), _response("ok")])
+        client = _make_client(
+            generate, retry_policy=RetryPolicy(initial_delay=0, jitter=False)
+        )
+
+        results = await client.generate_concurrent(
+            [{"model": "m", "contents": "Q", "config": {}}]
+        )
+
+        assert results == ["ok"]
+        assert generate.await_count == 2
+
+    async def test_permanent_error_not_retried(self):
+        """恒久的なエラーはリトライしない"""
+        from magi_orchestrator.retry import RetryPolicy
+
+        generate = AsyncMock(side_effect=[_api_error(400), _response("ok")])
+        client = _make_client(generate, retry_policy=RetryPolicy(initial_delay=0))
+
+        results = await client.generate_concurrent(
+            [{"model": "m", "contents": "Q", "config": {}}]
+        )
+
+        assert results[0].startswith("[ERROR]")
+        assert generate.await_count == 1
+
+    async def test_budget_limits_retries(self):
+        """リトライ枠を使い切るとリトライしない"""
+        from magi_orchestrator.retry import RetryPolicy
+
+        generate = AsyncMock(side_effect=_api_error(503))
+        client = _make_client(
+            generate,
+            retry_policy=RetryPolicy(
+                max_attempts=5, initial_delay=0, budget_min_retries=2
+            ),
+        )
+
+        await client.generate_concurrent(
+            [{"model": "m", "contents": "Q", "config": {}}]
+        )
+
+        assert generate.await_count == 3
+
+    async def test_hedged_request_wins(self):
+        """先行リクエストが遅い場合はヘッジリクエストの応答を採用する"""
+        from magi_orchestrator.retry import HedgePolicy
+
+        calls = 0
+
+        async def generate(model, contents, config):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+                return _response("slow")
+            return _response("fast")
+
+        client = _make_client(generate, hedge_policy=HedgePolicy(initial_delay=0.01))
+
+        results = await asyncio.wait_for(
+            client.generate_concurrent([{"model": "m", "contents": "Q", "config": {}}]),
+            timeout=1,
+        )
+
+        assert results == ["fast"]
+        assert calls == 2
+
+    async def test_hedged_request_leaves_no_pending_tasks(self):
+        """ヘッジした呼び出しが戻った時点で敗者のタスクは終了している"""
+        from magi_orchestrator.retry import HedgePolicy
+
+        calls = 0
+        cancelled = asyncio.Event()
+
+        async def generate(model, contents, config):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                finally:
+                    cancelled.set()
+            return _response("fast")
+
+        client = _make_client(generate, hedge_policy=HedgePolicy(initial_delay=0.01))
+
+        response = await client._request_hedged("m", "Q", {})
+
+        assert response.text == "fast"
+        assert cancelled.is_set()
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+def _flaky_stream_backend(errors):
+    """最初の len(errors) 回はチャンクを返す前に失敗するストリーミングバックエンド"""
+    from magi_orchestrator.fake import FakeBackend
+
+    class FlakyBackend(FakeBackend):
+        def __init__(self):
+            super().__init__(response_chars=40, chunk_chars=8)
+            self.configs = []
+
+        async def generate_content_stream(self, model, contents, config):
+            self.configs.append(config)
+            if len(self.configs) <= len(errors):
+                raise errors[len(self.configs) - 1]
+            async for chunk in super().generate_content_stream(model, contents, config):
+                yield chunk
+
+    return FlakyBackend()
+
+
+@pytest.mark.asyncio
+class TestStreamRetry:
+    """ストリーミングのリトライ・キャッシュ回復のテスト"""
+
+    async def test_transient_error_before_first_chunk_is_retried(self):
+        """最初のチャンクまでの一時的なエラーはリトライされる"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.retry import RetryPolicy
+
+        backend = _flaky_stream_backend([_api_error(429), _api_error(503)])
+        client = GeminiNativeClient(
+            api_key="fake",
+            backend=backend,
+            retry_policy=RetryPolicy(initial_delay=0, jitter=False),
+        )
+
+        chunks = [
+            text
+            async for _, text in client.generate_concurrent_stream(
+                [{"model": "m", "contents": "Q", "config": {}}]
+            )
+        ]
+
+        assert len(backend.configs) == 3
+        assert len(chunks) == 5 and not chunks[0].startswith("[ERROR]")
+
+    async def test_missing_cache_is_recovered(self):
+        """失効したキャッシュの参照は再作成したキャッシュで再実行する"""
+        from magi_orchestrator.client import GeminiNativeClient
+
+        backend = _flaky_stream_backend([_api_error(404)])
+        client = GeminiNativeClient(api_key="fake", backend=backend)
+        recovery = AsyncMock(return_value="caches/new")
+        client.set_cache_recovery(recovery)
+
+        chunks = [
+            chunk
+            async for chunk in client.generate_content_stream(
+                "m", "Q", "sys", cached_content="caches/old"
+            )
+        ]
+
+        recovery.assert_awaited_once_with("caches/old")
+        assert backend.configs[1].cached_content == "caches/new"
+        assert "".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_voting_error_is_not_conditional():
+    """API エラーの投票は CONDITIONAL ではなく VotingError になる"""
+    from magi_orchestrator.exceptions import VotingError
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+
+    client = MagicMock()
+    client.generate_concurrent = AsyncMock(
+        return_value=[
+            "VOTE: APPROVE\nREASON: ok",
+            "[ERROR] APIError: 503 UNAVAILABLE",
+            "VOTE: APPROVE\nREASON: ok",
+        ]
+    )
+    orchestrator = MagiOrchestrator(client)
+
+    with pytest.raises(VotingError) as excinfo:
+        await orchestrator._run_voting_phase("Q", {}, [])
+
+    assert excinfo.value.persona_type == PersonaType.BALTHASAR
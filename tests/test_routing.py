@@ -0,0 +1,182 @@
+"""ModelRouter とモデルルーティングのテスト"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from magi.models import Vote
+
+CHEAP = "gemini-lite"
+STRONG = "gemini-pro"
+
+
+class TestModelRouter:
+    """モデル選択とエスカレーションのテスト"""
+
+    def test_route_precedence(self):
+        """長いコンテキスト > エージェント別 > フェーズ別 > agent.model の順に選ぶ"""
+        from magi.models import PersonaType
+
+        from magi_orchestrator.agents import BALTHASAR_CONFIG, MELCHIOR_CONFIG
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.routing import ModelRouter
+
+        router = ModelRouter(
+            phase_models={Phase.VOTING: CHEAP},
+            agent_models={PersonaType.MELCHIOR: {Phase.VOTING: "gemini-mid"}},
+            long_context_tokens=100,
+            long_context_model=STRONG,
+        )
+
+        assert router.route(MELCHIOR_CONFIG, Phase.THINKING, "Q") == (
+            MELCHIOR_CONFIG.model
+        )
+        assert router.route(MELCHIOR_CONFIG, Phase.VOTING, "Q") == "gemini-mid"
+        assert router.route(BALTHASAR_CONFIG, Phase.VOTING, "Q") == CHEAP
+        assert router.route(BALTHASAR_CONFIG, Phase.VOTING, "x" * 400) == STRONG
+        assert router.candidate_models(BALTHASAR_CONFIG) == [
+            BALTHASAR_CONFIG.model,
+            CHEAP,
+            STRONG,
+        ]
+
+    def test_escalate_moves_one_tier_up(self):
+        """1つ上の段を返し、最上段・段外のモデルは None"""
+        from magi_orchestrator.routing import ModelRouter
+
+        router = ModelRouter(tiers=[CHEAP, "gemini-mid", STRONG])
+
+        assert router.escalate(CHEAP) == "gemini-mid"
+        assert router.escalate("gemini-mid") == STRONG
+        assert router.escalate(STRONG) is None
+        assert router.escalate("other") is None
+
+    def test_settings_build_router(self):
+        """ルーティング設定がある場合のみ ModelRouter を作成する"""
+        from magi_orchestrator.config import OrchestratorSettings
+        from magi_orchestrator.phases import Phase
+
+        with patch.dict("os.environ", {"MAGI_GEMINI_API_KEY": "test-key"}):
+            assert OrchestratorSettings().model_router() is None
+
+        env = {
+            "MAGI_GEMINI_API_KEY": "test-key",
+            "MAGI_GEMINI_ROUTING_PHASE_MODELS": f'{{"voting": "{CHEAP}"}}',
+            "MAGI_GEMINI_ROUTING_TIERS": f'["{CHEAP}", "{STRONG}"]',
+        }
+        with patch.dict("os.environ", env):
+            router = OrchestratorSettings().model_router()
+
+        assert router.phase_models == {Phase.VOTING: CHEAP}
+        assert router.tiers == [CHEAP, STRONG]
+        assert router.escalate_on_split
+
+
+class TestOrchestratorRouting:
+    """オーケストレーターのルーティングのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_phases_use_routed_models(self):
+        """投票だけを軽量モデルで実行する"""
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.routing import ModelRouter
+
+        backend = FakeBackend(seed=0)
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend),
+            router=ModelRouter(phase_models={Phase.VOTING: CHEAP}),
+        )
+
+        await orchestrator.consult("Q")
+
+        assert backend.calls[CHEAP] == 3
+        assert backend.calls[ALL_AGENTS[0].model] == 6
+
+    def test_persona_cache_is_looked_up_for_routed_model(self):
+        """ペルソナのキャッシュはルーティング先のモデルのものを参照する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.routing import ModelRouter
+
+        cache_manager = MagicMock()
+        cache_manager.get_cache_name.side_effect = lambda persona, model: (
+            f"caches/{persona}/{model}"
+        )
+        orchestrator = MagiOrchestrator(
+            MagicMock(),
+            cache_manager=cache_manager,
+            router=ModelRouter(phase_models={Phase.VOTING: CHEAP}),
+        )
+
+        for request in orchestrator._build_voting_requests("Q", "ctx"):
+            assert request["model"] == CHEAP
+            assert request["config"]["cached_content"] == (
+                f"caches/{request['agent']}/{CHEAP}"
+            )
+        assert len(orchestrator.routed_agents()) == 6
+
+    @pytest.mark.asyncio
+    async def test_unparseable_vote_is_retried_on_next_tier(self):
+        """パースできない投票は上位のモデルで、全文のプロンプトで再実行する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.routing import ModelRouter
+
+        ok = '{"vote": "APPROVE", "reason": "ok"}'
+        client = MagicMock()
+        client.generate_concurrent = AsyncMock(
+            side_effect=[[ok, "判断できません", ok], [ok]]
+        )
+        orchestrator = MagiOrchestrator(
+            client,
+            router=ModelRouter(
+                phase_models={Phase.VOTING: CHEAP}, tiers=[CHEAP, STRONG]
+            ),
+        )
+
+        votes = await orchestrator._run_voting_phase("Q", {}, [])
+
+        assert [v.vote for v in votes.values()] == [Vote.APPROVE] * 3
+        retry = client.generate_concurrent.await_args_list[1].args[0]
+        assert retry[0]["model"] == STRONG
+        assert retry[0]["agent"] == "balthasar"
+        assert "【元の議題】" in retry[0]["contents"]
+        assert "解析できませんでした" in retry[0]["contents"]
+
+    @pytest.mark.asyncio
+    async def test_split_panel_revotes_on_next_tier(self):
+        """投票が割れた場合は上位のモデルで再投票する"""
+        from magi_orchestrator.agents import ALL_AGENTS
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+        from magi_orchestrator.routing import ModelRouter
+
+        split = {
+            agent.system_instruction: vote
+            for agent, vote in zip(ALL_AGENTS, ("APPROVE", "DENY", "CONDITIONAL"))
+        }
+
+        def vote_policy(model: str, contents: str, system_instruction: str) -> str:
+            return split[system_instruction] if model == CHEAP else "APPROVE"
+
+        backend = FakeBackend(vote_policy=vote_policy, seed=0)
+        router = ModelRouter(phase_models={Phase.VOTING: CHEAP}, tiers=[CHEAP, STRONG])
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend), router=router
+        )
+
+        result = await orchestrator.consult("Q")
+
+        assert backend.calls[STRONG] == 3
+        assert [v.vote for v in result.voting_results.values()] == [Vote.APPROVE] * 3
+
+        router.escalate_on_split = False
+        result = await orchestrator.consult("Q2")
+        assert backend.calls[STRONG] == 3
+        assert {v.vote for v in result.voting_results.values()} == set(Vote)
@@ -0,0 +1,108 @@
+"""常駐サービス（HTTP API・ジョブキュー）のテスト"""
+
+import asyncio
+import json
+
+import pytest
+
+
+async def _request(port: int, method: str, path: str, body=None):
+    """HTTP リクエストを送信し (ステータス, JSON) を返す"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = b"" if body is None else json.dumps(body).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def _make_server(latency=None, **service_kwargs):
+    from magi_orchestrator.client import GeminiNativeClient
+    from magi_orchestrator.fake import FakeBackend
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+    from magi_orchestrator.server import MagiHTTPServer, MagiService
+
+    backend = FakeBackend(latency=latency, seed=0)
+    orchestrator = MagiOrchestrator(GeminiNativeClient(api_key="fake", backend=backend))
+    service = MagiService(orchestrator, **service_kwargs)
+    return MagiHTTPServer(service, port=0), backend
+
+
+@pytest.mark.asyncio
+class TestMagiHTTPServer:
+    """HTTP API のテスト"""
+
+    async def test_consult_and_jobs_share_one_client(self):
+        """同期の合議とジョブキューが同じクライアントで処理される"""
+        server, backend = _make_server(workers=2)
+        await server.start()
+        try:
+            status, health = await _request(server.port, "GET", "/health")
+            assert status == 200 and health["workers"] == 2
+
+            status, result = await _request(
+                server.port, "POST", "/consult", {"query": "Q"}
+            )
+            assert status == 200
+            assert result["final_decision"] in ("approved", "denied", "conditional")
+
+            status, job = await _request(server.port, "POST", "/jobs", {"query": "Q2"})
+            assert status == 202 and job["status"] == "queued"
+            for _ in range(100):
+                status, job = await _request(server.port, "GET", f"/jobs/{job['id']}")
+                if job["status"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+            assert job["status"] == "done" and "result" in job
+            assert sum(backend.calls.values()) == 18
+        finally:
+            await server.stop()
+
+    async def test_errors(self):
+        """不正なリクエスト・未知のジョブ・満杯のキューはエラーを返す"""
+        from magi_orchestrator.fake import ConstantLatency
+
+        server, _ = _make_server(ConstantLatency(10.0), workers=1, max_queue=1)
+        await server.start()
+        try:
+            assert (await _request(server.port, "POST", "/consult", {}))[0] == 400
+            assert (await _request(server.port, "GET", "/consult"))[0] == 405
+            assert (await _request(server.port, "GET", "/jobs/unknown"))[0] == 404
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"POST /consult HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+            await writer.drain()
+            assert (await reader.read()).split()[1] == b"400"
+            writer.close()
+
+            # 1件目は実行中、2件目でキューが満杯になり、3件目は 503
+            server.service.submit("Q")
+            await asyncio.sleep(0)
+            server.service.submit("Q")
+            status, body = await _request(server.port, "POST", "/jobs", {"query": "Q"})
+            assert status == 503 and "full" in body["error"]
+        finally:
+            await server.stop()
+
+    async def test_warmup_caches_on_start(self):
+        """起動時にペルソナキャッシュを事前作成し、停止時に自動更新を止める"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from magi_orchestrator.cache import WarmupReport
+
+        cache_manager = MagicMock()
+        cache_manager.warmup = AsyncMock(return_value=WarmupReport())
+        cache_manager.stop_auto_refresh = AsyncMock()
+        server, _ = _make_server(cache_manager=cache_manager)
+
+        await server.start()
+        await server.stop()
+
+        cache_manager.warmup.assert_awaited_once()
+        cache_manager.start_auto_refresh.assert_called_once()
+        cache_manager.stop_auto_refresh.assert_awaited_once()
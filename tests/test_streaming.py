@@ -0,0 +1,88 @@
+"""consult_stream のユニットテスト"""
+
+from unittest.mock import MagicMock
+import pytest
+
+from magi.models import Decision, PersonaType
+
+
+def _make_stream_client(texts_by_phase):
+    """フェーズ順にテキストを分割して返すモッククライアントを作成"""
+    calls = iter(texts_by_phase)
+
+    async def generate_concurrent_stream(requests):
+        texts = next(calls)
+        for index, text in enumerate(texts):
+            for i in range(0, len(text), 4):
+                yield index, text[i : i + 4]
+
+    client = MagicMock()
+    client.generate_concurrent_stream = generate_concurrent_stream
+    return client
+
+
+@pytest.mark.asyncio
+class TestConsultStream:
+    """consult_stream のテスト"""
+
+    async def test_events_order_and_result(self):
+        """チャンク → フェーズ完了 → 合議完了 の順にイベントが発行される"""
+        from magi_orchestrator.events import AgentChunk, ConsultComplete, PhaseComplete
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.phases import Phase
+
+        client = _make_stream_client(
+            [
+                ["thinking-m", "thinking-b", "thinking-c"],
+                ["debate-m", "debate-b", "debate-c"],
+                [
+                    "VOTE: APPROVE\nREASON: ok",
+                    "VOTE: APPROVE\nREASON: ok",
+                    "VOTE: DENY\nREASON: ng",
+                ],
+            ]
+        )
+        orchestrator = MagiOrchestrator(client)
+
+        events = [event async for event in orchestrator.consult_stream("Q")]
+
+        assert isinstance(events[0], AgentChunk)
+        assert events[0].phase == Phase.THINKING
+        completes = [e.phase for e in events if isinstance(e, PhaseComplete)]
+        assert completes == [Phase.THINKING, Phase.DEBATE, Phase.VOTING]
+
+        final = events[-1]
+        assert isinstance(final, ConsultComplete)
+        assert final.result.final_decision == Decision.APPROVED
+        assert final.result.thinking_results["melchior"].content == "thinking-m"
+        assert final.result.voting_results[PersonaType.CASPER].reason == "ng"
+
+    async def test_trace_checkpoint_and_early_exit_do_not_apply(self, tmp_path):
+        """トレース・チェックポイント・投票の早期終了はストリーミングに適用しない"""
+        from magi_orchestrator.checkpoint import FileCheckpointStore
+        from magi_orchestrator.events import ConsultComplete
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = _make_stream_client(
+            [
+                ["thinking-m", "thinking-b", "thinking-c"],
+                ["debate-m", "debate-b", "debate-c"],
+                ["VOTE: APPROVE\nREASON: ok"] * 3,
+            ]
+        )
+        exporter = MagicMock()
+        store = FileCheckpointStore(tmp_path)
+        orchestrator = MagiOrchestrator(
+            client,
+            early_exit_voting=True,
+            checkpoint_store=store,
+            keep_checkpoints=True,
+            trace_exporters=[exporter],
+        )
+
+        events = [event async for event in orchestrator.consult_stream("Q")]
+
+        assert isinstance(events[-1], ConsultComplete)
+        assert len(events[-1].result.voting_results) == 3
+        exporter.export.assert_not_called()
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,100 @@
+"""トレース（計測）のユニットテスト"""
+
+import pytest
+
+
+@pytest.mark.asyncio
+class TestTracing:
+    """consult_with_trace とエクスポーターのテスト"""
+
+    async def test_trace_records_phases_calls_and_tokens(self):
+        """フェーズごとに呼び出しとトークン数が記録される"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        client = GeminiNativeClient(api_key="fake", backend=FakeBackend(seed=0))
+        orchestrator = MagiOrchestrator(client)
+
+        result, trace = await orchestrator.consult_with_trace("Q", "trace-1")
+
+        assert trace.consultation_id == "trace-1"
+        assert [p.phase for p in trace.phases] == ["thinking", "debate", "voting"]
+        assert trace.phases[1].round_number == 1
+        assert all(len(p.calls) == 3 for p in trace.phases)
+        assert {c.agent for c in trace.calls} == {"melchior", "balthasar", "casper"}
+        assert trace.prompt_tokens > 0
+        assert trace.output_tokens > 0
+        assert trace.decision == result.final_decision.value
+        assert trace.to_dict()["phases"][0]["phase"] == "thinking"
+
+    async def test_retries_and_result_cache_hit_are_recorded(self):
+        """リトライ回数と合議結果キャッシュのヒットが記録される"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.result_cache import InMemoryConsultationCache
+        from magi_orchestrator.retry import RetryPolicy
+
+        client = GeminiNativeClient(
+            api_key="fake",
+            backend=FakeBackend(error_rate=0.3, seed=1),
+            retry_policy=RetryPolicy(max_attempts=10, initial_delay=0),
+        )
+        orchestrator = MagiOrchestrator(
+            client, result_cache=InMemoryConsultationCache()
+        )
+
+        _, first = await orchestrator.consult_with_trace("Q")
+        _, second = await orchestrator.consult_with_trace("Q")
+
+        assert first.retries > 0
+        assert not first.result_cache_hit
+        assert second.result_cache_hit
+        assert second.phases == []
+
+    async def test_prometheus_exporter(self):
+        """Prometheus エクスポーターがカウンタを集計する"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.tracing import PrometheusExporter
+
+        metrics = PrometheusExporter()
+        client = GeminiNativeClient(api_key="fake", backend=FakeBackend(seed=0))
+        orchestrator = MagiOrchestrator(client, trace_exporters=[metrics])
+
+        result = await orchestrator.consult("Q")
+
+        labels = {"model": "gemini-3-flash-preview", "phase": "voting"}
+        assert metrics.value("api_calls_total", status="ok", **labels) == 3
+        assert metrics.value("phase_duration_seconds_count", phase="debate") == 1
+        assert (
+            metrics.value(
+                "consults_total",
+                status="ok",
+                decision=result.final_decision.value,
+            )
+            == 1
+        )
+        text = metrics.render()
+        assert "# TYPE magi_api_calls_total counter" in text
+        assert "# TYPE magi_phase_duration_seconds summary" in text
+
+    async def test_failing_exporter_does_not_break_consult(self):
+        """エクスポーターの例外は合議の結果に影響しない"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.tracing import TraceExporter
+
+        class Broken(TraceExporter):
+            def export(self, trace):
+                raise RuntimeError("boom")
+
+        client = GeminiNativeClient(api_key="fake", backend=FakeBackend(seed=0))
+        orchestrator = MagiOrchestrator(client, trace_exporters=[Broken()])
+
+        result = await orchestrator.consult("Q")
+
+        assert result is not None
@@ -0,0 +1,219 @@
+"""DebateTranscript のユニットテスト"""
+
+from datetime import datetime
+
+import pytest
+
+
+def _thinking(text: str):
+    from magi.models import ThinkingOutput
+
+    from magi_orchestrator.agents import ALL_AGENTS
+
+    return {
+        agent.persona_type: ThinkingOutput(
+            persona_type=agent.persona_type, content=text, timestamp=datetime.now()
+        )
+        for agent in ALL_AGENTS
+    }
+
+
+def _round(number: int, text: str):
+    from magi.models import DebateOutput, DebateRound
+
+    from magi_orchestrator.agents import ALL_AGENTS
+
+    now = datetime.now()
+    return DebateRound(
+        round_number=number,
+        outputs={
+            agent.persona_type: DebateOutput(
+                persona_type=agent.persona_type,
+                round_number=number,
+                responses={
+                    other.persona_type: f"{text}-{agent.persona_type.value}"
+                    for other in ALL_AGENTS
+                    if other is not agent
+                },
+                timestamp=now,
+            )
+            for agent in ALL_AGENTS
+        },
+        timestamp=now,
+    )
+
+
+class TestDebateTranscript:
+    """トランスクリプトの追記とトークン予算のテスト"""
+
+    def test_matches_full_rebuild_without_budget(self):
+        """予算なしでは追記の結果がオーケストレーターの全文再構築と一致する"""
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+        from magi_orchestrator.transcript import DebateTranscript
+
+        thinking = _thinking("考察")
+        rounds = [_round(n, f"発言{n}") for n in range(1, 4)]
+        transcript = DebateTranscript()
+        transcript.set_thinking(thinking)
+        for round_data in rounds:
+            transcript.add_round(round_data)
+
+        orchestrator = MagiOrchestrator(client=None)
+        assert transcript.render() == orchestrator._build_debate_context(
+            thinking, rounds
+        )
+        assert "【Debate Round 3】" in transcript.render()
+        assert transcript.round_count == 3
+
+    def test_budget_summarizes_then_omits_oldest_sections(self):
+        """予算超過時は直近のラウンドを残して古いセクションから要約・省略する"""
+        from magi_orchestrator.transcript import DebateTranscript
+
+        long = "x" * 2000
+        thinking = _thinking(long)
+        rounds = [_round(n, long) for n in range(1, 4)]
+        full = DebateTranscript.from_results(thinking, rounds)
+        full_tokens = full.token_count()
+
+        summarized = DebateTranscript.from_results(
+            thinking, rounds, max_tokens=full_tokens // 2
+        )
+        text = summarized.render()
+        assert summarized.token_count() <= full_tokens // 2
+        assert "…（以下省略）" in text
+        assert f"{long}-melchior" in text.split("【Debate Round 3】")[1]
+
+        omitted = DebateTranscript.from_results(thinking, rounds, max_tokens=1)
+        text = omitted.render()
+        assert text.count("（省略）") == 3
+        assert f"{long}-melchior" in text  # 直近のラウンドは常に全文
+
+    def test_sections_are_counted_once(self):
+        """各セクションのトークン数は表現ごとに1回だけ算出する"""
+        from magi_orchestrator.transcript import DebateTranscript
+
+        counted = []
+
+        def counter(text: str) -> int:
+            counted.append(text)
+            return len(text)
+
+        transcript = DebateTranscript(max_tokens=10**6, token_counter=counter)
+        transcript.set_thinking(_thinking("考察"))
+        for n in range(1, 4):
+            transcript.add_round(_round(n, "発言"))
+            transcript.render()
+
+        assert len(counted) == 4
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_applies_context_budget():
+    """オーケストレーターはトークン予算内のトランスクリプトで議論・投票する"""
+    from magi_orchestrator.client import GeminiNativeClient
+    from magi_orchestrator.fake import FakeBackend
+    from magi_orchestrator.orchestrator import MagiOrchestrator
+
+    class RecordingBackend(FakeBackend):
+        def __init__(self):
+            super().__init__(response_chars=4000, seed=0)
+            self.contents = []
+
+        async def generate_content(self, model, contents, config):
+            self.contents.append(contents)
+            return await super().generate_content(model, contents, config)
+
+    backend = RecordingBackend()
+    orchestrator = MagiOrchestrator(
+        GeminiNativeClient(api_key="fake", backend=backend),
+        debate_rounds=3,
+        context_token_budget=1000,
+    )
+
+    result = await orchestrator.consult("Q")
+
+    assert len(result.debate_results) == 3
+    voting_prompt = backend.contents[-1]
+    assert "（省略）" in voting_prompt
+    assert "【Debate Round 3】" in voting_prompt
+
+
+class TestDirectedResponses:
+    """宛先ごとの議論の発言のテスト"""
+
+    def test_parse_splits_by_addressee(self):
+        """TO <名前>: / SUMMARY: で分割し、要約は発言者のキーに格納する"""
+        from magi.models import PersonaType
+
+        from magi_orchestrator.transcript import parse_debate_response
+
+        text = (
+            "TO BALTHASAR:\n安全性に賛成\n"
+            "TO CASPER:\nコストに反対\n"
+            "SUMMARY:\n条件付きで賛成\nSTANCE: CONDITIONAL"
+        )
+        responses = parse_debate_response(
+            text,
+            PersonaType.MELCHIOR,
+            [PersonaType.BALTHASAR, PersonaType.CASPER],
+        )
+
+        assert responses == {
+            PersonaType.BALTHASAR: "安全性に賛成",
+            PersonaType.CASPER: "コストに反対",
+            PersonaType.MELCHIOR: "条件付きで賛成\nSTANCE: CONDITIONAL",
+        }
+
+    def test_unstructured_response_becomes_summary(self):
+        """形式に従っていない発言は全体を要約とする"""
+        from magi.models import PersonaType
+
+        from magi_orchestrator.transcript import parse_debate_response
+
+        responses = parse_debate_response(
+            "自由形式の発言", PersonaType.CASPER, [PersonaType.MELCHIOR]
+        )
+
+        assert responses == {PersonaType.CASPER: "自由形式の発言"}
+
+    @pytest.mark.asyncio
+    async def test_next_round_prompt_contains_only_addressed_statements(self):
+        """次ラウンドのプロンプトには自分宛ての発言と全員の要約だけを含める"""
+        from magi_orchestrator.client import GeminiNativeClient
+        from magi_orchestrator.fake import FakeBackend
+        from magi_orchestrator.orchestrator import MagiOrchestrator
+
+        class RecordingBackend(FakeBackend):
+            def __init__(self):
+                super().__init__(seed=0)
+                self.contents = []
+
+            async def generate_content(self, model, contents, config):
+                self.contents.append(contents)
+                return await super().generate_content(model, contents, config)
+
+        backend = RecordingBackend()
+        orchestrator = MagiOrchestrator(
+            GeminiNativeClient(api_key="fake", backend=backend), debate_rounds=2
+        )
+
+        result = await orchestrator.consult("Q")
+
+        first_round = result.debate_results[0]
+        for agent in orchestrator.agents:
+            output = first_round.outputs[agent.persona_type]
+            assert set(output.responses) == {
+                a.persona_type for a in orchestrator.agents
+            }
+            assert len(set(output.responses.values())) == 3
+
+        second_round_prompts = backend.contents[6:9]
+        for agent, prompt in zip(orchestrator.agents, second_round_prompts):
+            me = agent.persona_type
+            assert f"{me.value.upper()} 宛ての発言" in prompt
+            for speaker, output in first_round.outputs.items():
+                for target, text in output.responses.items():
+                    if target in (me, speaker):
+                        assert text in prompt
+                    else:
+                        assert text not in prompt